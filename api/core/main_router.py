@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from fastapi.encoders import jsonable_encoder
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from api.utils.linkedin_api.metrics import METRICS
 
 router = APIRouter()
 
@@ -8,3 +10,11 @@ router = APIRouter()
 @router.get("/healthcheck", status_code=200)
 def healthcheck():
     return JSONResponse(content=jsonable_encoder({"status": "Sammy is stoked to be alive!"}))
+
+
+@router.get("/metrics", status_code=200)
+def metrics(output_format: str = Query("prometheus", alias="format")):
+    """LinkedIn client request metrics of this worker, as Prometheus text or JSON"""
+    if output_format == "json":
+        return JSONResponse(content=jsonable_encoder(METRICS.snapshot()))
+    return PlainTextResponse(METRICS.render_prometheus())
@@ -9,6 +9,7 @@ import aiohttp
 
 
 from api.models.find import SearchCompaniesInput, SearchCompaniesInputs
+from api.utils import json_codec
 
 load_dotenv()
 
@@ -66,9 +67,9 @@ async def search_people(
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(json_serialize=json_codec.dumps) as session:
             async with session.post(url, headers=headers, json=data) as resp:
-                resp_data = await resp.json()
+                resp_data = await resp.json(loads=json_codec.loads)
     except Exception as e:
         logger.error(f"Error occurred while searching people: {e}")
         return []
@@ -171,9 +172,9 @@ async def search_companies(
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(json_serialize=json_codec.dumps) as session:
             async with session.post(url, headers=headers, json=data) as response:
-                resp_data = await response.json()
+                resp_data = await response.json(loads=json_codec.loads)
     except Exception as e:
         logger.error(f"Error occurred while searching companies: {e}")
         return None
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from api.models.find import SearchTemplate
 from api.utils.linkedin_api import Linkedin
 
@@ -65,6 +65,18 @@ def scrape_person_data(linkedin_scraper:Linkedin, urn: str):
     # GET a profile
     result = linkedin_scraper.get_profile(urn)
 
+    return person_from_profile(result)
+
+
+def scrape_people_data(linkedin_scraper: Linkedin, urls: List[str], concurrency: int = 4) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+    # GET the profiles concurrently, as fast as the rate policy allows
+    results, errors = linkedin_scraper.get_profiles(urls, concurrency=concurrency)
+
+    people = [person_from_profile(result) if result is not None else None for result in results]
+    return people, errors
+
+
+def person_from_profile(result: Dict) -> Dict:
     person = {
         "first_name": result.get("firstName"),
         "last_name": result.get("lastName"),
@@ -156,5 +168,6 @@ if __name__ == '__main__':
      'https://www.linkedin.com/in/ACoAAAOwDeUB6IszsFVUg9DOSfjwpJaCYxULIDI',
      'https://www.linkedin.com/in/ACoAAAcCUr8BI6i7mhit18M1ZMi0-wx_3G0SgiA']
 
-    person = scrape_person_data(scraper, urn[0].split('/')[-1])
-    pprint(person)
\ No newline at end of file
+    people, errors = scrape_people_data(scraper, urn)
+    pprint(people)
+    pprint(errors)
\ No newline at end of file
@@ -3,6 +3,7 @@ import os
 from typing import Dict
 from typing import Optional
 
+from api.utils import json_codec
 from api.utils.brave.exceptions import BraveError
 from api.utils.brave.types import WebSearchApiResponse
 
@@ -129,6 +130,7 @@ class BraveAPIClient:
             # Handle errors (e.g., log them, raise exceptions)
             raise BraveError(f"API Error: {response.status_code} - {response.text}")
 
+        data = json_codec.loads(response.content)
         if raw:
-            return response.json()
-        return WebSearchApiResponse.model_validate(response.json())
\ No newline at end of file
+            return data
+        return WebSearchApiResponse.model_validate(data)
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+JSON codec shared by the HTTP clients (LinkedIn, Brave, Apollo).
+
+Uses the fastest installed backend: orjson, then msgspec, then the standard library.
+Set the JSON_CODEC environment variable to "orjson", "msgspec" or "json" to pick one.
+Whatever the backend, `loads` raises a `ValueError` on malformed input, like `json.loads`.
+"""
+
+import json
+import os
+from typing import Any, Callable, List, NamedTuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class JsonCodec(NamedTuple):
+    name: str
+    loads: Callable[[Union[bytes, str]], Any]
+    dumps: Callable[[Any], str]
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec("json", json.loads, json.dumps)
+
+
+def _orjson_codec() -> JsonCodec:
+    # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+    return JsonCodec("orjson", orjson.loads, lambda obj: orjson.dumps(obj).decode())
+
+
+def _msgspec_codec() -> JsonCodec:
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def loads(data: Union[bytes, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return JsonCodec("msgspec", loads, lambda obj: encoder.encode(obj).decode())
+
+
+_BACKENDS = {
+    "orjson": (lambda: orjson is not None, _orjson_codec),
+    "msgspec": (lambda: msgspec is not None, _msgspec_codec),
+    "json": (lambda: True, _stdlib_codec),
+}
+
+
+def available_codecs() -> List[str]:
+    """Names of the installed backends, fastest first"""
+    return [name for name, (available, _) in _BACKENDS.items() if available()]
+
+
+def get_codec(name: str = "") -> JsonCodec:
+    """
+    Return the codec called `name`, or the fastest installed one if `name` is empty.
+
+    Raises ValueError if `name` is unknown or its package is not installed.
+    """
+    if name:
+        if name not in _BACKENDS or not _BACKENDS[name][0]():
+            raise ValueError(f"JSON codec {name!r} is not available")
+        return _BACKENDS[name][1]()
+
+    return _BACKENDS[available_codecs()[0]][1]()
+
+
+codec = get_codec(os.environ.get("JSON_CODEC", ""))
+loads = codec.loads
+dumps = codec.dumps
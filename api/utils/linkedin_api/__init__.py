@@ -3,5 +3,7 @@
 """
 
 from .linkedin import Linkedin
+from .async_linkedin import AsyncLinkedin
+from .pool import LinkedinPool
 
-__all__ = ["Linkedin"]
+__all__ = ["Linkedin", "AsyncLinkedin", "LinkedinPool"]
\ No newline at end of file
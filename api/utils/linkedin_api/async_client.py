@@ -0,0 +1,181 @@
+import logging
+from http.cookiejar import CookieJar
+from typing import Optional
+
+import httpx
+from requests.cookies import RequestsCookieJar
+
+from api.utils.linkedin_api.client import (
+    Client,
+    ChallengeException,
+    TransportConfig,
+    UnauthorizedException,
+    parse_client_metadata,
+)
+from api.utils.linkedin_api.cookie_repository import CookieRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncClient(object):
+    """
+    Class to act as an asyncio client for the Linkedin API.
+
+    Mirrors `Client`, but every network call goes through a single `httpx.AsyncClient`
+    so that it can be awaited from inside a running event loop. HTTP/2 can be enabled
+    through `TransportConfig.http2` (requires the `h2` package).
+    """
+
+    LINKEDIN_BASE_URL = Client.LINKEDIN_BASE_URL
+    API_BASE_URL = Client.API_BASE_URL
+    REQUEST_HEADERS = Client.REQUEST_HEADERS
+    AUTH_REQUEST_HEADERS = Client.AUTH_REQUEST_HEADERS
+
+    def __init__(
+        self,
+        *,
+        debug=False,
+        refresh_cookies=False,
+        proxies={},
+        cookies_dir: str = "",
+        transport: TransportConfig = TransportConfig(),
+    ):
+        limits = httpx.Limits(
+            max_connections=transport.pool_maxsize,
+            max_keepalive_connections=transport.pool_maxsize,
+            keepalive_expiry=transport.keepalive_expiry,
+        )
+        self.session = httpx.AsyncClient(
+            headers=AsyncClient.REQUEST_HEADERS,
+            limits=limits,
+            timeout=httpx.Timeout(
+                transport.read_timeout, connect=transport.connect_timeout
+            ),
+            http2=transport.http2,
+            mounts=self._proxy_mounts(proxies, limits, transport.http2),
+        )
+        self.proxies = proxies
+        self.logger = logger
+        self.metadata = {}
+        self._use_cookie_cache = not refresh_cookies
+        self._cookie_repository = CookieRepository(cookies_dir=cookies_dir)
+
+        logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
+
+    @staticmethod
+    def _proxy_mounts(
+        proxies: dict, limits: httpx.Limits, http2: bool
+    ) -> Optional[dict]:
+        """
+        Translate a `requests` style proxies dict into httpx transport mounts.
+        """
+        if not proxies:
+            return None
+        return {
+            f"{scheme}://": httpx.AsyncHTTPTransport(
+                proxy=proxy, limits=limits, http2=http2
+            )
+            for scheme, proxy in proxies.items()
+        }
+
+    async def _send_auth_request(
+        self, method: str, url: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Send an authentication request. See Client._auth_headers().
+
+        httpx merges the session's voyager headers into every request and cannot unset
+        them per request, so they are removed from the built request instead.
+        """
+        request = self.session.build_request(
+            method, url, headers=AsyncClient.AUTH_REQUEST_HEADERS, **kwargs
+        )
+        auth_keys = {key.lower() for key in AsyncClient.AUTH_REQUEST_HEADERS}
+        for key in [*AsyncClient.REQUEST_HEADERS, "csrf-token"]:
+            if key.lower() not in auth_keys:
+                request.headers.pop(key, None)
+        return await self.session.send(request)
+
+    async def _request_session_cookies(self) -> httpx.Cookies:
+        """
+        Return a new set of session cookies as given by Linkedin.
+        """
+        self.logger.debug("Requesting new cookies.")
+
+        res = await self._send_auth_request(
+            "GET", f"{AsyncClient.LINKEDIN_BASE_URL}/uas/authenticate"
+        )
+        return res.cookies
+
+    def _set_session_cookies(self, cookies: CookieJar | httpx.Cookies):
+        """
+        Set cookies of the current session.
+        """
+        self.session.cookies = httpx.Cookies(cookies)
+        self.session.headers["csrf-token"] = self.session.cookies.get(
+            "JSESSIONID", ""
+        ).strip('"')
+
+    @property
+    def cookies(self):
+        return self.session.cookies
+
+    async def authenticate(self, username: str, password: str):
+        if self._use_cookie_cache:
+            self.logger.debug("Attempting to use cached cookies")
+            cookies = self._cookie_repository.get(username)
+            if cookies:
+                self.logger.debug("Using cached cookies")
+                self._set_session_cookies(cookies)
+                await self._fetch_metadata()
+                return
+
+        await self._do_authentication_request(username, password)
+        await self._fetch_metadata()
+
+    async def _fetch_metadata(self):
+        """
+        Get metadata about the "instance" of the LinkedIn application for the signed in user.
+
+        Store this data in self.metadata
+        """
+        res = await self._send_auth_request("GET", f"{AsyncClient.LINKEDIN_BASE_URL}")
+
+        self.metadata.update(parse_client_metadata(res.text))
+
+    async def _do_authentication_request(self, username: str, password: str):
+        """
+        Authenticate with Linkedin.
+        """
+        self._set_session_cookies(await self._request_session_cookies())
+
+        payload = {
+            "session_key": username,
+            "session_password": password,
+            "JSESSIONID": self.session.cookies.get("JSESSIONID"),
+        }
+
+        res = await self._send_auth_request(
+            "POST", f"{AsyncClient.LINKEDIN_BASE_URL}/uas/authenticate", data=payload
+        )
+
+        data = res.json()
+
+        if data and data["login_result"] != "PASS":
+            raise ChallengeException(data["login_result"])
+
+        if res.status_code == 401:
+            raise UnauthorizedException()
+
+        if res.status_code != 200:
+            raise Exception()
+
+        self._set_session_cookies(res.cookies)
+
+        # The cookie repository stores `requests` cookie jars, shared with `Client`
+        cookies = RequestsCookieJar()
+        cookies.update(res.cookies.jar)
+        self._cookie_repository.save(cookies, username)
+
+    async def aclose(self):
+        await self.session.aclose()
@@ -0,0 +1,1359 @@
+"""
+Provides asyncio linkedin api-related code
+"""
+
+import asyncio
+import logging
+import random
+from collections import deque
+from itertools import islice
+from time import perf_counter
+from urllib.parse import urlencode
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Union,
+    Optional,
+    List,
+    Literal,
+    Tuple,
+)
+
+import httpx
+
+from api.utils import json_codec
+from api.utils.linkedin_api.async_client import AsyncClient
+from api.utils.linkedin_api.cache import CachedResponse, ResponseCache
+from api.utils.linkedin_api.checkpoint import CheckpointStore
+from api.utils.linkedin_api.client import TransportConfig
+from api.utils.linkedin_api.linkedin import (
+    ACCOUNT_ERRORS,
+    PROFILE_SECTION_ENDPOINTS,
+    Linkedin,
+    _check_profile_extras,
+    _check_profile_sections,
+)
+from api.utils.linkedin_api.ledger import SharedRateLedger
+from api.utils.linkedin_api.metrics import (
+    DECODE_SECONDS,
+    METRICS,
+    PARSE_SECONDS,
+    RequestMetrics,
+    endpoint_name,
+)
+from api.utils.linkedin_api.models import TOP_CARD, LazyProfile, Profile
+from api.utils.linkedin_api.pacing import RequestPacer, classify_endpoint
+from api.utils.linkedin_api.pagination import (
+    Page,
+    decode_cursor,
+    encode_cursor,
+    query_digest,
+)
+from api.utils.linkedin_api.resilience import (
+    SERVER_ERROR,
+    CircuitBreaker,
+    RetryPolicy,
+    classify_status,
+    parse_retry_after,
+    raise_for_failure,
+)
+from api.utils.linkedin_api.singleflight import AsyncSingleFlight
+from api.utils.linkedin_api.watermark import HighWaterMarkStore, newest_update
+from api.utils.linkedin_api.utils.normalized import EntityStore, NormalizedPayload
+from api.utils.linkedin_api.utils.helpers import (
+    get_profile_id,
+    get_universal_name,
+    get_list_posts_sorted_without_promoted,
+    parse_list_raw_posts,
+    parse_list_raw_urns,
+    build_search_params,
+    build_search_uri,
+    parse_search_clusters,
+    parse_search_total,
+    build_people_search_params,
+    parse_people_search_results,
+    build_company_search_params,
+    parse_company_search_results,
+    build_job_search_query,
+    parse_job_postings,
+    count_job_cards,
+    parse_contact_info,
+    parse_profile_skills,
+    parse_profile_view,
+    build_profile_experiences_uri,
+    parse_profile_experiences,
+)
+
+logger = logging.getLogger("API." + __name__)
+
+
+async def default_evade():
+    """
+    Asyncio counterpart of `linkedin.default_evade`.
+    Delays the request by a random (bounded) time without blocking the event loop
+    """
+    await asyncio.sleep(random.randint(2, 5))
+
+
+class AsyncLinkedin(object):
+    """
+    Class for accessing the LinkedIn API from asyncio code.
+
+    Mirrors the read methods of `Linkedin`; requests and pacing are awaited, so many
+    scrapes can be in flight on a single event loop. Use as an async context manager,
+    or call `authenticate()` and `aclose()` explicitly.
+
+    :param username: Username of LinkedIn account.
+    :type username: str
+    :param password: Password of LinkedIn account.
+    :type password: str
+    :param pacer: Request pacer shared by all requests of this instance. Defaults to a RequestPacer
+        backed by the host-wide SharedRateLedger of `username`, so all workers share one budget
+    :type pacer: RequestPacer, optional
+    :param transport: Connection pool size and timeouts of the underlying client
+    :type transport: TransportConfig, optional
+    :param response_cache: Cache for GET responses. True uses the default on-disk ResponseCache, False disables caching
+    :type response_cache: ResponseCache or bool, optional
+    :param retry_policy: Backoff of requests answered with 429 or a server error
+    :type retry_policy: RetryPolicy, optional
+    :param breaker: Circuit breaker of the account. Defaults to a CircuitBreaker of `username`
+    :type breaker: CircuitBreaker, optional
+    :param metrics: Where to record per endpoint timings, sizes and statuses. Defaults to the process wide `metrics.METRICS`
+    :type metrics: RequestMetrics, optional
+    """
+
+    _MAX_POST_COUNT = Linkedin._MAX_POST_COUNT
+    _MAX_UPDATE_COUNT = Linkedin._MAX_UPDATE_COUNT
+    _MAX_SEARCH_COUNT = Linkedin._MAX_SEARCH_COUNT
+    _SEARCH_PAGE_SIZE = Linkedin._SEARCH_PAGE_SIZE
+    _MAX_REPEATED_REQUESTS = Linkedin._MAX_REPEATED_REQUESTS
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        *,
+        authenticate=True,
+        refresh_cookies=False,
+        debug=False,
+        proxies={},
+        cookies=None,
+        cookies_dir: str = "",
+        pacer: Optional[RequestPacer] = None,
+        transport: TransportConfig = TransportConfig(),
+        response_cache: Union[ResponseCache, bool] = True,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[RequestMetrics] = None,
+        checkpoints: Union[CheckpointStore, bool] = False,
+        watermarks: Union[HighWaterMarkStore, bool] = False,
+        entities: Union[EntityStore, bool] = False,
+    ):
+        """Constructor method"""
+        self.pacer = pacer or RequestPacer(ledger=SharedRateLedger(), account=username)
+        self.client = AsyncClient(
+            refresh_cookies=refresh_cookies,
+            debug=debug,
+            proxies=proxies,
+            cookies_dir=cookies_dir,
+            transport=transport,
+        )
+
+        self.logger = logger
+        self.username = username
+        self.response_cache = (
+            ResponseCache() if response_cache is True else response_cache or None
+        )
+        self._in_flight = AsyncSingleFlight()
+        self.retry_policy = retry_policy
+        self.breaker = breaker or CircuitBreaker(account=username)
+        self.metrics = metrics or METRICS
+        self.checkpoints = (
+            CheckpointStore() if checkpoints is True else checkpoints or None
+        )
+        self.watermarks = (
+            HighWaterMarkStore() if watermarks is True else watermarks or None
+        )
+        self.entities = EntityStore() if entities is True else entities or None
+        self._password = password
+        self._authenticate_on_enter = authenticate and not cookies
+
+        if authenticate and cookies:
+            # If the cookies are expired, the API won't work anymore since
+            # `username` and `password` are not used at all in this case.
+            self.client._set_session_cookies(cookies)
+
+    async def __aenter__(self):
+        if self._authenticate_on_enter:
+            await self.authenticate()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def authenticate(self):
+        """Authenticate the underlying client with the configured credentials"""
+        await self.client.authenticate(self.username, self._password)
+        self._authenticate_on_enter = False
+
+    async def aclose(self):
+        """Close the underlying connection pool"""
+        await self.client.aclose()
+
+    async def _send(self, method: str, uri: str, url: str, evade=None, **kwargs):
+        """Send a request, retrying throttled and failed ones as `self.retry_policy` allows
+
+        Raises CircuitOpenException without sending anything while the circuit breaker
+        of the account is open, and ThrottledException, ChallengeException or
+        UnauthorizedException once a failure is not worth retrying. Server errors that
+        outlast the retries are returned as is.
+        """
+        endpoint = endpoint_name(uri)
+        attempt = 0
+        while True:
+            self.breaker.before_request()
+            started = perf_counter()
+            await self._evade(uri, evade)
+            sent = perf_counter()
+            try:
+                res = await self.client.session.request(method, url, **kwargs)
+            except httpx.TransportError:
+                self.breaker.record_failure(SERVER_ERROR)
+                raise
+
+            self.metrics.observe_response(
+                endpoint,
+                res.status_code,
+                sent - started,
+                perf_counter() - sent,
+                len(res.content),
+            )
+
+            failure = classify_status(res.status_code)
+            if failure is None:
+                self.breaker.record_success()
+                return res
+
+            self.breaker.record_failure(failure)
+            retry_after = parse_retry_after(res.headers.get("retry-after"))
+            delay = self.retry_policy.delay(failure, attempt, method, retry_after)
+            if delay is None:
+                raise_for_failure(failure, url, retry_after)
+                return res
+
+            self.logger.warning(
+                f"{method} {uri} answered {res.status_code}, retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _decode(self, res):
+        """Decode the JSON body of a response, timing it against its endpoint"""
+        with self.metrics.timer(endpoint_name(str(res.url)), DECODE_SECONDS):
+            return json_codec.loads(res.content)
+
+    def _parse(self, res, parser, *args):
+        """Call `parser(*args)`, timing it against the endpoint of `res`"""
+        with self.metrics.timer(endpoint_name(str(res.url)), PARSE_SECONDS):
+            return parser(*args)
+
+    async def _evade(self, uri: str, evade=None):
+        """Wait until the request to `uri` may be sent"""
+        if evade is not None:
+            await evade()
+        else:
+            await self.pacer.acquire_async(classify_endpoint(uri))
+
+    async def _fetch(
+        self, uri: str, evade=None, base_request=False, cache=True, **kwargs
+    ):
+        """GET request to Linkedin API
+
+        Paced by `self.pacer` unless an `evade` coroutine function is given. Served from
+        `self.response_cache` when the endpoint has a TTL, unless `cache` is False.
+        Concurrent identical requests share a single network call.
+        """
+        url = f"{self.client.API_BASE_URL if not base_request else self.client.LINKEDIN_BASE_URL}{uri}"
+        key = ResponseCache.request_key(self.username, url, kwargs)
+
+        return await self._in_flight.do(
+            key, lambda: self._fetch_once(uri, url, key, evade, cache, kwargs)
+        )
+
+    async def _fetch_once(
+        self, uri: str, url: str, key: str, evade, cache: bool, kwargs
+    ):
+        ttl = None
+        if cache and self.response_cache is not None:
+            ttl = self.response_cache.ttl(uri)
+        # The cache is SQLite and zlib, blocking work kept off the event loop
+        if ttl:
+            cached = await asyncio.to_thread(self.response_cache.get, key)
+            if cached:
+                return self._cached_response(cached, url)
+
+        res = await self._send("GET", uri, url, evade, **kwargs)
+
+        if ttl and res.status_code == 200:
+            await asyncio.to_thread(
+                self.response_cache.set,
+                key,
+                ttl,
+                res.status_code,
+                res.headers,
+                res.content,
+            )
+        return res
+
+    @staticmethod
+    def _cached_response(cached: CachedResponse, url: str) -> httpx.Response:
+        """Rebuild an `httpx.Response` from a cache entry"""
+        res = httpx.Response(
+            cached.status_code,
+            headers=cached.headers,
+            content=cached.content,
+            request=httpx.Request("GET", url),
+        )
+        res.from_cache = True
+        return res
+
+    async def _post(self, uri: str, evade=None, base_request=False, **kwargs):
+        """POST request to Linkedin API
+
+        Paced by `self.pacer` unless an `evade` coroutine function is given, and retried
+        as `_send` does.
+        """
+        url = f"{self.client.API_BASE_URL if not base_request else self.client.LINKEDIN_BASE_URL}{uri}"
+        return await self._send("POST", uri, url, evade, **kwargs)
+
+    async def _checkpointed(
+        self,
+        method: str,
+        query: Dict,
+        pages: Callable[[Optional[str]], AsyncIterator[Page]],
+    ) -> AsyncIterator[List]:
+        """Yield the elements of every page of a crawl, checkpointed to `self.checkpoints`. See Linkedin._checkpointed()"""
+        if self.checkpoints is None:
+            async for page in pages(None):
+                yield page.elements
+            return
+
+        fingerprint = self.checkpoints.fingerprint(method, query)
+        # The store runs SQLite transactions that can wait on other workers, off the loop
+        owner = await asyncio.to_thread(self.checkpoints.acquire, fingerprint)
+        if owner is None:
+            self.logger.warning(
+                f"{method} is already being crawled with this query, not checkpointing"
+            )
+            async for page in pages(None):
+                yield page.elements
+            return
+
+        try:
+            checkpoint = await asyncio.to_thread(self.checkpoints.load, fingerprint)
+            cursor = None
+            if checkpoint is not None:
+                self.logger.info(
+                    f"Resuming {method} after {len(checkpoint.pages)} committed pages"
+                )
+                for elements in checkpoint.pages:
+                    yield elements
+                cursor = checkpoint.cursor
+
+            if checkpoint is None or not checkpoint.complete:
+                async for page in pages(cursor):
+                    await asyncio.to_thread(
+                        self.checkpoints.commit,
+                        fingerprint,
+                        method,
+                        page.cursor,
+                        page.elements,
+                        owner,
+                    )
+                    yield page.elements
+            await asyncio.to_thread(self.checkpoints.discard, fingerprint)
+        finally:
+            await asyncio.to_thread(self.checkpoints.release, fingerprint, owner)
+
+    async def _iter_token_pages(
+        self,
+        kind: str,
+        target: str,
+        url: str,
+        url_params: Dict,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[Page]:
+        """Page through a feed paginated by `paginationToken`, resuming at `cursor`. See Linkedin._iter_token_pages()"""
+        url_params = dict(url_params)
+        fetched = 0
+        if cursor:
+            start, token = decode_cursor(cursor, kind, target)
+            url_params.update(
+                start=start, count=self._MAX_POST_COUNT, paginationToken=token
+            )
+            # pages are full up to the cursor, so `limit` keeps counting from the start
+            fetched = start
+
+        while limit is None or fetched < limit:
+            res = await self._fetch(url, params=url_params)
+            data = self._decode(res)
+            if not data:
+                return
+            if "status" in data and data["status"] != 200:
+                self.logger.info("request failed: {}".format(data["status"]))
+                return
+            # When the offset goes past the last element, the API keeps returning
+            # empty pages rather than an empty pagination token
+            if len(data["elements"]) == 0:
+                return
+
+            fetched += len(data["elements"])
+            token = data["metadata"]["paginationToken"]
+            url_params.update(
+                start=url_params["start"] + self._MAX_POST_COUNT,
+                count=self._MAX_POST_COUNT,
+                paginationToken=token,
+            )
+            if token == "":
+                yield Page(data["elements"], "")
+                return
+            yield Page(
+                data["elements"],
+                encode_cursor(kind, target, url_params["start"], token),
+            )
+
+    async def get_profile_posts(
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        post_count=10,
+    ) -> List:
+        """Get profile posts. See Linkedin.get_profile_posts()"""
+        posts = []
+        async for elements in self._checkpointed(
+            "profile_posts",
+            {"public_id": public_id, "urn_id": urn_id, "post_count": post_count},
+            lambda cursor: self.iter_profile_posts(
+                public_id=public_id, urn_id=urn_id, post_count=post_count, cursor=cursor
+            ),
+        ):
+            posts.extend(elements)
+        return posts
+
+    async def iter_profile_posts(
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        post_count: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[Page]:
+        """Get profile posts, page by page as they arrive. See Linkedin.iter_profile_posts()"""
+        url_params = {
+            "count": min(post_count or self._MAX_POST_COUNT, self._MAX_POST_COUNT),
+            "start": 0,
+            "q": "memberShareFeed",
+            "moduleKey": "member-shares:phone",
+            "includeLongTermHistory": True,
+        }
+        if urn_id:
+            profile_urn = f"urn:li:fsd_profile:{urn_id}"
+        else:
+            profile = await self.get_profile(public_id=public_id)
+            profile_urn = profile["profile_urn"].replace(
+                "fs_miniProfile", "fsd_profile"
+            )
+        url_params["profileUrn"] = profile_urn
+        url = f"/identity/profileUpdatesV2"
+        async for page in self._iter_token_pages(
+            "profile_posts", profile_urn, url, url_params, post_count, cursor
+        ):
+            yield page
+
+    async def get_post_comments(self, post_urn: str, comment_count=100) -> List:
+        """Get post comments. See Linkedin.get_post_comments()"""
+        comments = []
+        async for elements in self._checkpointed(
+            "post_comments",
+            {"post_urn": post_urn, "comment_count": comment_count},
+            lambda cursor: self.iter_post_comments(
+                post_urn, comment_count=comment_count, cursor=cursor
+            ),
+        ):
+            comments.extend(elements)
+        return comments
+
+    def iter_post_comments(
+        self,
+        post_urn: str,
+        comment_count: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[Page]:
+        """Get post comments, page by page as they arrive. See Linkedin.iter_post_comments()"""
+        url_params = {
+            "count": min(comment_count or self._MAX_POST_COUNT, self._MAX_POST_COUNT),
+            "start": 0,
+            "q": "comments",
+            "sortOrder": "RELEVANCE",
+        }
+        url = f"/feed/comments"
+        url_params["updateId"] = "activity:" + post_urn
+        return self._iter_token_pages(
+            "post_comments", post_urn, url, url_params, comment_count, cursor
+        )
+
+    async def search(self, params: Dict, limit=-1, offset=0, prefetch=0) -> List:
+        """Perform a LinkedIn search. See Linkedin.search()"""
+        return [
+            result
+            async for page in self._search_results(params, limit, offset, prefetch)
+            for result in page
+        ]
+
+    async def iter_search(
+        self, params: Dict, limit=-1, offset=0, prefetch=0
+    ) -> AsyncIterator[Dict]:
+        """Perform a LinkedIn search, yielding results as their page arrives. See Linkedin.iter_search()"""
+        async for page in self._iter_search_pages(
+            params, limit=limit, offset=offset, prefetch=prefetch
+        ):
+            for result in page.elements:
+                yield result
+
+    def _search_results(
+        self, params: Dict, limit=-1, offset=0, prefetch=0
+    ) -> AsyncIterator[List]:
+        """Yield the raw result pages of a search, checkpointed if `self.checkpoints` is set"""
+        return self._checkpointed(
+            "search",
+            {"params": params, "limit": limit, "offset": offset},
+            lambda cursor: self._iter_search_pages(
+                params, limit=limit, offset=offset, prefetch=prefetch, cursor=cursor
+            ),
+        )
+
+    async def _search_page(self, params: Dict, count: int, start: int):
+        """Fetch one page of a LinkedIn search, returning the response and its results"""
+        res = await self._fetch(
+            build_search_uri(build_search_params(params, count=count, start=start))
+        )
+        data = self._decode(res)
+        return data, self._parse(res, parse_search_clusters, data)
+
+    async def _iter_search_pages(
+        self, params: Dict, limit=-1, offset=0, prefetch=0, cursor=None
+    ) -> AsyncIterator[Page]:
+        """Yield the raw results of a LinkedIn search, one page at a time. See Linkedin._iter_search_pages()"""
+        count = AsyncLinkedin._MAX_SEARCH_COUNT
+        if limit is None:
+            limit = -1
+
+        target = query_digest(params)
+        fetched = (
+            decode_cursor(cursor, "search", target).start - offset if cursor else 0
+        )
+        while True:
+            # when we're close to the limit, only fetch what we need to
+            if limit > -1 and limit - fetched < count:
+                count = limit - fetched
+
+            data, new_elements = await self._search_page(
+                params, count, fetched + offset
+            )
+            if new_elements is None:
+                return
+
+            fetched += len(new_elements)
+            yield Page(new_elements, encode_cursor("search", target, offset + fetched))
+
+            # break the loop if we're done searching
+            if (
+                (-1 < limit <= fetched)  # if our results exceed set limit
+                or fetched / count >= AsyncLinkedin._MAX_REPEATED_REQUESTS
+            ) or len(new_elements) == 0:
+                break
+
+            total = parse_search_total(data) if prefetch else None
+            if total is not None:
+                end = total if limit < 0 else min(total, offset + limit)
+                # offsets go by the page size rather than the length of the first
+                # page, which is short when LinkedIn leaves results out of it
+                step = AsyncLinkedin._SEARCH_PAGE_SIZE
+                end = min(end, offset + step * AsyncLinkedin._MAX_REPEATED_REQUESTS)
+                async for page in self._prefetch_search_pages(
+                    params, target, new_elements, offset + fetched, end, step, prefetch
+                ):
+                    yield page
+                return
+
+            self.logger.debug(f"results grew to {fetched}")
+
+    async def _prefetch_search_pages(
+        self,
+        params: Dict,
+        target: str,
+        first: List,
+        start: int,
+        end: int,
+        step: int,
+        workers: int,
+    ) -> AsyncIterator[Page]:
+        """Yield the search pages from `start` to `end`, fetching `workers` at a time. See Linkedin._prefetch_search_pages()"""
+        seen = {element.get("entityUrn") for element in first}
+        starts = iter(range(start, end, step))
+
+        def submit(page_start: int):
+            task = asyncio.ensure_future(
+                self._search_page(params, min(step, end - page_start), page_start)
+            )
+            return page_start, task
+
+        pending = deque(submit(page_start) for page_start in islice(starts, workers))
+        try:
+            while pending:
+                page_start, task = pending.popleft()
+                _, elements = await task
+                for next_start in islice(starts, 1):
+                    pending.append(submit(next_start))
+                if not elements:
+                    break
+
+                page = []
+                for element in elements:
+                    urn = element.get("entityUrn")
+                    if urn is None or urn not in seen:
+                        seen.add(urn)
+                        page.append(element)
+                self.logger.debug(f"prefetched page of {len(page)} results")
+                yield Page(page, encode_cursor("search", target, page_start + step))
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def search_people(
+        self,
+        keywords: Optional[str] = None,
+        connection_of: Optional[str] = None,
+        network_depths: Optional[
+            List[Union[Literal["F"], Literal["S"], Literal["O"]]]
+        ] = None,
+        current_company: Optional[List[str]] = None,
+        past_companies: Optional[List[str]] = None,
+        nonprofit_interests: Optional[List[str]] = None,
+        profile_languages: Optional[List[str]] = None,
+        regions: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+        schools: Optional[List[str]] = None,
+        contact_interests: Optional[List[str]] = None,
+        service_categories: Optional[List[str]] = None,
+        include_private_profiles=False,
+        keyword_first_name: Optional[str] = None,
+        keyword_last_name: Optional[str] = None,
+        keyword_title: Optional[str] = None,
+        keyword_company: Optional[str] = None,
+        keyword_school: Optional[str] = None,
+        network_depth: Optional[
+            Union[Literal["F"], Literal["S"], Literal["O"]]
+        ] = None,  # DEPRECATED - use network_depths
+        title: Optional[str] = None,  # DEPRECATED - use keyword_title
+        **kwargs,
+    ) -> List[Dict]:
+        """Perform a LinkedIn search for people. See Linkedin.search_people()"""
+        params = build_people_search_params(
+            keywords=keywords,
+            connection_of=connection_of,
+            network_depths=network_depths,
+            current_company=current_company,
+            past_companies=past_companies,
+            nonprofit_interests=nonprofit_interests,
+            profile_languages=profile_languages,
+            regions=regions,
+            industries=industries,
+            schools=schools,
+            contact_interests=contact_interests,
+            service_categories=service_categories,
+            keyword_first_name=keyword_first_name,
+            keyword_last_name=keyword_last_name,
+            keyword_title=keyword_title,
+            keyword_company=keyword_company,
+            keyword_school=keyword_school,
+            network_depth=network_depth,
+            title=title,
+        )
+
+        return [
+            person
+            async for page in self._search_results(params, **kwargs)
+            for person in parse_people_search_results(page, include_private_profiles)
+        ]
+
+    def iter_search_people(
+        self,
+        keywords: Optional[str] = None,
+        *,
+        include_private_profiles=False,
+        **kwargs,
+    ) -> AsyncIterator[Dict]:
+        """Perform a LinkedIn search for people, yielding profiles as their page arrives. See Linkedin.iter_search_people()"""
+        options = {
+            name: kwargs.pop(name)
+            for name in ("limit", "offset", "prefetch")
+            if name in kwargs
+        }
+        params = build_people_search_params(keywords=keywords, **kwargs)
+        return self._iter_people(params, include_private_profiles, **options)
+
+    async def _iter_people(
+        self, params: Dict, include_private_profiles=False, **kwargs
+    ) -> AsyncIterator[Dict]:
+        async for page in self._iter_search_pages(params, **kwargs):
+            for person in parse_people_search_results(
+                page.elements, include_private_profiles
+            ):
+                yield person
+
+    async def search_companies(
+        self, keywords: Optional[List[str]] = None, **kwargs
+    ) -> List:
+        """Perform a LinkedIn search for companies. See Linkedin.search_companies()"""
+        params = build_company_search_params(keywords)
+        return [
+            company
+            async for page in self._search_results(params, **kwargs)
+            for company in parse_company_search_results(page)
+        ]
+
+    async def iter_search_companies(
+        self, keywords: Optional[List[str]] = None, **kwargs
+    ) -> AsyncIterator[Dict]:
+        """Perform a LinkedIn search for companies, yielding them as their page arrives. See Linkedin.iter_search_companies()"""
+        params = build_company_search_params(keywords)
+        async for page in self._iter_search_pages(params, **kwargs):
+            for company in parse_company_search_results(page.elements):
+                yield company
+
+    async def search_jobs(
+        self,
+        keywords: Optional[str] = None,
+        companies: Optional[List[str]] = None,
+        experience: Optional[List[str]] = None,
+        job_type: Optional[List[str]] = None,
+        job_title: Optional[List[str]] = None,
+        industries: Optional[List[str]] = None,
+        location_name: Optional[str] = None,
+        remote: Optional[List[str]] = None,
+        listed_at=24 * 60 * 60,
+        distance: Optional[int] = None,
+        limit=-1,
+        offset=0,
+        **kwargs,
+    ) -> List[Dict]:
+        """Perform a LinkedIn search for jobs. See Linkedin.search_jobs()"""
+        query_string = build_job_search_query(
+            keywords=keywords,
+            companies=companies,
+            experience=experience,
+            job_type=job_type,
+            job_title=job_title,
+            industries=industries,
+            location_name=location_name,
+            remote=remote,
+            listed_at=listed_at,
+            distance=distance,
+        )
+        pages = self._checkpointed(
+            "jobs",
+            {"query": query_string, "limit": limit, "offset": offset},
+            lambda cursor: self._iter_job_pages(
+                query_string, limit=limit, offset=offset, cursor=cursor
+            ),
+        )
+        return [job async for page in pages for job in page]
+
+    async def iter_search_jobs(
+        self, keywords: Optional[str] = None, *, limit=-1, offset=0, **kwargs
+    ) -> AsyncIterator[Dict]:
+        """Perform a LinkedIn search for jobs, yielding postings as their page arrives. See Linkedin.iter_search_jobs()"""
+        query_string = build_job_search_query(keywords=keywords, **kwargs)
+        async for page in self._iter_job_pages(
+            query_string, limit=limit, offset=offset
+        ):
+            for job in page.elements:
+                yield job
+
+    async def _iter_job_pages(
+        self, query_string: str, limit=-1, offset=0, cursor=None
+    ) -> AsyncIterator[Page]:
+        """Yield the job postings of a job search, one page at a time. See Linkedin._iter_job_pages()"""
+        count = AsyncLinkedin._MAX_SEARCH_COUNT
+        if limit is None:
+            limit = -1
+
+        target = query_digest(query_string)
+        fetched = decode_cursor(cursor, "jobs", target).start - offset if cursor else 0
+        # Postings yielded, counted against `limit`, and their URNs: a card can refer
+        # to a posting of an earlier page, which `self.entities` resolves again
+        yielded = fetched
+        seen = set()
+        while True:
+            # when we're close to the limit, only fetch what we need to
+            if limit > -1 and limit - yielded < count:
+                count = limit - yielded
+            default_params = {
+                "decorationId": "com.linkedin.voyager.dash.deco.jobs.search.JobSearchCardsCollection-174",
+                "count": count,
+                "q": "jobSearch",
+                "query": query_string,
+                "start": fetched + offset,
+            }
+
+            res = await self._fetch(
+                f"/voyagerJobsDashJobCards?{urlencode(default_params, safe='(),:')}",
+                headers={"accept": "application/vnd.linkedin.normalized+json+2.1"},
+            )
+            data = self._decode(res)
+
+            elements = data.get("included", [])
+            postings = self._parse(res, parse_job_postings, data, self.entities)
+            # break the loop if we're done searching or no results returned
+            if not postings:
+                break
+            # the next page starts past every card of this one, repeated or not
+            fetched += max(count_job_cards(data), len(postings))
+            new_data = [p for p in postings if p.get("entityUrn") not in seen]
+            seen.update(p["entityUrn"] for p in new_data if p.get("entityUrn"))
+            yielded += len(new_data)
+            if new_data:
+                yield Page(new_data, encode_cursor("jobs", target, offset + fetched))
+            if (
+                (-1 < limit <= yielded)  # if our results exceed set limit
+                or fetched / count >= AsyncLinkedin._MAX_REPEATED_REQUESTS
+            ) or len(elements) == 0:
+                break
+
+            self.logger.debug(f"results grew to {fetched}")
+
+    async def get_profile_contact_info(
+        self, public_id: Optional[str] = None, urn_id: Optional[str] = None
+    ) -> Dict:
+        """Fetch contact information for a given LinkedIn profile. See Linkedin.get_profile_contact_info()"""
+        res = await self._fetch(
+            f"/identity/profiles/{public_id or urn_id}/profileContactInfo"
+        )
+        data = self._decode(res)
+
+        return self._parse(res, parse_contact_info, data)
+
+    async def get_profile_skills(
+        self, public_id: Optional[str] = None, urn_id: Optional[str] = None
+    ) -> List:
+        """Fetch the skills listed on a given LinkedIn profile. See Linkedin.get_profile_skills()"""
+        params = {"count": 100, "start": 0}
+        res = await self._fetch(
+            f"/identity/profiles/{public_id or urn_id}/skills", params=params
+        )
+        data = self._decode(res)
+
+        return self._parse(res, parse_profile_skills, data)
+
+    async def get_profile(
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        cache: bool = True,
+        typed: bool = False,
+        lazy: bool = False,
+        sections: Optional[Collection[str]] = None,
+    ) -> Union[Dict, Optional[Profile], Optional[LazyProfile]]:
+        """Fetch data for a given LinkedIn profile. See Linkedin.get_profile()"""
+        if sections is not None:
+            if lazy:
+                raise ValueError("sections cannot be combined with lazy")
+            profile = await self._get_profile_sections(
+                public_id, urn_id, _check_profile_sections(sections), cache
+            )
+            if profile is None:
+                return None if typed else {}
+            return profile if typed else profile.to_dict()
+
+        res = await self._fetch(
+            f"/identity/profiles/{public_id or urn_id}/profileView", cache=cache
+        )
+
+        if lazy and res.status_code == 200:
+            return LazyProfile(res.content)
+
+        data = self._decode(res)
+        if lazy or data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data.get("message", data)))
+            return None if typed or lazy else {}
+
+        if typed:
+            return self._parse(res, Profile.from_profile_view, data)
+        return self._parse(res, parse_profile_view, data)
+
+    def _log_failed_request(self, res):
+        """Log a failed response. See Linkedin._log_failed_request()"""
+        self.logger.info(f"request failed: {res.status_code} {res.text[:200]!r}")
+
+    async def _get_profile_sections(
+        self,
+        public_id: Optional[str],
+        urn_id: Optional[str],
+        sections: FrozenSet[str],
+        cache: bool,
+    ) -> Optional[Profile]:
+        """Fetch `sections` of a profile through the smallest endpoint serving them all. See Linkedin._get_profile_sections()"""
+        uri = f"/identity/profiles/{public_id or urn_id}"
+        if len(sections) > 1:
+            res = await self._fetch(f"{uri}/profileView", cache=cache)
+            if res.status_code != 200:
+                self._log_failed_request(res)
+                return None
+            return self._parse(res, LazyProfile(res.content).to_profile, sections)
+
+        (section,) = sections
+        params = None if section == TOP_CARD else {"count": 100, "start": 0}
+        res = await self._fetch(
+            uri + PROFILE_SECTION_ENDPOINTS[section], params=params, cache=cache
+        )
+        if res.status_code != 200:
+            self._log_failed_request(res)
+            return None
+        data = self._decode(res)
+        if data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data.get("message", data)))
+            return None
+
+        if section == TOP_CARD:
+            return self._parse(res, Profile.from_sections, data, {})
+        return self._parse(
+            res,
+            Profile.from_sections,
+            None,
+            {section: data.get("elements", [])},
+            {"public_id": public_id, "urn_id": urn_id},
+        )
+
+    async def get_profiles(
+        self,
+        public_ids_or_urns: List[str],
+        concurrency: int = 4,
+        sections: Optional[Collection[str]] = None,
+        extras: Optional[List[str]] = None,
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Fetch data for many LinkedIn profiles, `concurrency` at a time. See Linkedin.get_profiles()"""
+        if sections is not None:
+            sections = _check_profile_sections(sections)
+        extras = _check_profile_extras(extras)
+        return await self._fetch_many(
+            "profile",
+            public_ids_or_urns,
+            get_profile_id,
+            lambda profile_id: self._get_profile_with_extras(
+                profile_id, sections, extras
+            ),
+            concurrency,
+        )
+
+    async def _fetch_many(
+        self,
+        kind: str,
+        keys: List[str],
+        normalize: Callable[[str], str],
+        fetch: Callable[[str], Awaitable[Dict]],
+        concurrency: int,
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Await `fetch` once per distinct normalized key, `concurrency` at a time. See Linkedin._fetch_many()"""
+        ids = {key: normalize(key) for key in keys}
+        results: Dict[str, Dict] = {}
+        failures: Dict[str, Exception] = {}
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(entity_id: str):
+            async with semaphore:
+                try:
+                    result = await fetch(entity_id)
+                    if not result:
+                        raise LookupError(
+                            f"{kind.capitalize()} {entity_id} could not be fetched"
+                        )
+                    results[entity_id] = result
+                except ACCOUNT_ERRORS:
+                    raise
+                except Exception as e:
+                    self.logger.info(f"could not fetch {kind} {entity_id}: {e!r}")
+                    failures[entity_id] = e
+
+        tasks = [
+            asyncio.ensure_future(fetch_one(entity_id))
+            for entity_id in dict.fromkeys(ids.values())
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        errors = {key: failures[ids[key]] for key in ids if ids[key] in failures}
+        return [results.get(ids[key]) for key in keys], errors
+
+    async def _get_profile_with_extras(
+        self, profile_id: str, sections: Optional[FrozenSet[str]], extras: List[str]
+    ) -> Dict:
+        profile = await self.get_profile(profile_id, sections=sections)
+        if not profile:
+            return profile
+
+        urn_id = profile.get("urn_id") or profile_id
+        for extra in extras:
+            if extra == "contact_info":
+                profile[extra] = await self.get_profile_contact_info(urn_id=urn_id)
+            elif extra == "skills":
+                profile[extra] = await self.get_profile_skills(urn_id=urn_id)
+            elif extra == "experiences":
+                profile[extra] = await self.get_profile_experiences(urn_id)
+        return profile
+
+    async def get_profile_connections(self, urn_id: str, **kwargs) -> List:
+        """Fetch connections for a given LinkedIn profile. See Linkedin.get_profile_connections()"""
+        return await self.search_people(connection_of=urn_id, **kwargs)
+
+    async def get_profile_experiences(self, urn_id: str) -> List:
+        """Fetch experiences for a given LinkedIn profile. See Linkedin.get_profile_experiences()"""
+        res = await self._fetch(
+            build_profile_experiences_uri(urn_id),
+            headers={"accept": "application/vnd.linkedin.normalized+json+2.1"},
+        )
+
+        data = self._decode(res)
+
+        return self._parse(res, parse_profile_experiences, data, self.entities)
+
+    async def _iter_offset_pages(
+        self,
+        kind: str,
+        target: str,
+        uri: str,
+        params: Dict,
+        max_results: Optional[int] = None,
+        cursor: Optional[str] = None,
+        incremental: bool = False,
+    ) -> AsyncIterator[Page]:
+        """Page through a `start`/`count` paginated endpoint, resuming at `cursor`. See Linkedin._iter_offset_pages()"""
+        start = decode_cursor(cursor, kind, target).start if cursor else 0
+        watermarks = self.watermarks if incremental else None
+        # The store runs SQLite transactions, kept off the event loop
+        mark = (
+            await asyncio.to_thread(watermarks.get, kind, target)
+            if watermarks
+            else None
+        )
+        from_top = start == 0
+        newest = None
+        # Whether the crawl saw every update down to the mark
+        complete = False
+        while max_results is None or start < max_results:
+            res = await self._fetch(uri, params={**params, "start": start})
+
+            data = self._decode(res)
+            elements = data["elements"]
+
+            if len(elements) == 0:
+                complete = True
+                break
+
+            if from_top:
+                newest = newest_update(elements, newest)
+            start += len(elements)
+            self.logger.debug(f"results grew: {start}")
+
+            if mark:
+                # Pinned updates already crawled come back on every run
+                fresh = [u for u in elements if not mark.covers(u)]
+                if mark.reached(elements):
+                    self.logger.debug(f"reached the high-water mark of {kind} {target}")
+                    complete = True
+                    yield Page(fresh, "")
+                    break
+                elements = fresh
+            yield Page(elements, encode_cursor(kind, target, start))
+
+        if watermarks and newest is not None and complete:
+            await asyncio.to_thread(watermarks.advance, kind, target, newest)
+
+    async def get_company_updates(
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        max_results: Optional[int] = None,
+    ) -> List:
+        """Fetch company updates (news activity) for a given LinkedIn company. See Linkedin.get_company_updates()"""
+        results = []
+        async for elements in self._checkpointed(
+            "company_updates",
+            {"target": public_id or urn_id, "max_results": max_results, "start": 0},
+            lambda cursor: self.iter_company_updates(
+                public_id=public_id,
+                urn_id=urn_id,
+                max_results=max_results,
+                cursor=cursor,
+            ),
+        ):
+            results.extend(elements)
+        return results
+
+    def iter_company_updates(
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        max_results: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> AsyncIterator[Page]:
+        """Fetch company updates for a given LinkedIn company, page by page. See Linkedin.iter_company_updates()"""
+        params = {
+            "companyUniversalName": public_id or urn_id,
+            "q": "companyFeedByUniversalName",
+            "moduleKey": "member-share",
+            "count": AsyncLinkedin._MAX_UPDATE_COUNT,
+        }
+
+        return self._iter_offset_pages(
+            "company_updates",
+            public_id or urn_id,
+            "/feed/updates",
+            params,
+            max_results=max_results,
+            cursor=cursor,
+            incremental=True,
+        )
+
+    async def get_profile_updates(self, public_id=None, urn_id=None, max_results=None):
+        """Fetch profile updates (newsfeed activity) for a given LinkedIn profile. See Linkedin.get_profile_updates()"""
+        results = []
+        async for elements in self._checkpointed(
+            "profile_updates",
+            {"target": public_id or urn_id, "max_results": max_results, "start": 0},
+            lambda cursor: self.iter_profile_updates(
+                public_id=public_id,
+                urn_id=urn_id,
+                max_results=max_results,
+                cursor=cursor,
+            ),
+        ):
+            results.extend(elements)
+        return results
+
+    def iter_profile_updates(
+        self, public_id=None, urn_id=None, max_results=None, cursor=None
+    ) -> AsyncIterator[Page]:
+        """Fetch profile updates for a given LinkedIn profile, page by page. See Linkedin.iter_profile_updates()"""
+        params = {
+            "profileId": public_id or urn_id,
+            "q": "memberShareFeed",
+            "moduleKey": "member-share",
+            "count": AsyncLinkedin._MAX_UPDATE_COUNT,
+        }
+
+        return self._iter_offset_pages(
+            "profile_updates",
+            public_id or urn_id,
+            "/feed/updates",
+            params,
+            max_results=max_results,
+            cursor=cursor,
+            incremental=True,
+        )
+
+    async def get_school(self, public_id, cache: bool = True):
+        """Fetch data about a given LinkedIn school. See Linkedin.get_school()"""
+        params = {
+            "decorationId": "com.linkedin.voyager.deco.organization.web.WebFullCompanyMain-12",
+            "q": "universalName",
+            "universalName": public_id,
+        }
+
+        res = await self._fetch(
+            f"/organization/companies?{urlencode(params)}", cache=cache
+        )
+
+        data = self._decode(res)
+
+        if data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data))
+            return {}
+
+        return data["elements"][0]
+
+    async def get_company(self, public_id, cache: bool = True):
+        """Fetch data about a given LinkedIn company. See Linkedin.get_company()"""
+        params = {
+            "decorationId": "com.linkedin.voyager.deco.organization.web.WebFullCompanyMain-12",
+            "q": "universalName",
+            "universalName": public_id,
+        }
+
+        res = await self._fetch(f"/organization/companies", params=params, cache=cache)
+
+        data = self._decode(res)
+
+        if data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data["message"]))
+            return {}
+
+        return data["elements"][0]
+
+    async def get_schools(
+        self, public_ids: List[str], concurrency: int = 4
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Fetch data about many LinkedIn schools, `concurrency` at a time. See Linkedin.get_schools()"""
+        return await self._fetch_many(
+            "school", public_ids, get_universal_name, self.get_school, concurrency
+        )
+
+    async def get_companies(
+        self, public_ids: List[str], concurrency: int = 4
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Fetch data about many LinkedIn companies, `concurrency` at a time. See Linkedin.get_companies()"""
+        return await self._fetch_many(
+            "company", public_ids, get_universal_name, self.get_company, concurrency
+        )
+
+    async def get_user_profile(self, use_cache=True) -> Dict:
+        """Get the current user profile. See Linkedin.get_user_profile()"""
+        me_profile = self.client.metadata.get("me", {})
+        if not self.client.metadata.get("me") or not use_cache:
+            res = await self._fetch(f"/me")
+            me_profile = self._decode(res)
+            # cache profile
+            self.client.metadata["me"] = me_profile
+
+        return me_profile
+
+    async def _get_list_feed_posts_and_list_feed_urns(
+        self, limit=-1, offset=0, exclude_promoted_posts=True
+    ):
+        """Get a list of URNs from feed sorted by 'Recent' and a list of yet
+        unsorted posts. See Linkedin._get_list_feed_posts_and_list_feed_urns()
+        """
+        l_posts = []
+        l_urns = []
+
+        # If count>100 API will return HTTP 400
+        count = AsyncLinkedin._MAX_UPDATE_COUNT
+        if limit == -1:
+            limit = AsyncLinkedin._MAX_UPDATE_COUNT
+
+        while True:
+            # when we're close to the limit, only fetch what we need to
+            if limit > -1 and limit - len(l_urns) < count:
+                count = limit - len(l_urns)
+            params = {
+                "count": str(count),
+                "q": "chronFeed",
+                "start": len(l_urns) + offset,
+            }
+            res = await self._fetch(
+                f"/feed/updatesV2",
+                params=params,
+                headers={"accept": "application/vnd.linkedin.normalized+json+2.1"},
+            )
+            payload = NormalizedPayload(self._decode(res), self.entities)
+            # Updates of this page sent with an earlier one come from self.entities
+            l_raw_posts = payload.with_references("elements")
+            l_raw_urns = payload.data.get("*elements", [])
+
+            l_new_posts = self._parse(
+                res, parse_list_raw_posts, l_raw_posts, self.client.LINKEDIN_BASE_URL
+            )
+            l_posts.extend(l_new_posts)
+
+            l_urns.extend(parse_list_raw_urns(l_raw_urns))
+
+            # break the loop if we're done searching
+            if (
+                (limit > -1 and len(l_urns) >= limit)  # if our results exceed set limit
+                or len(l_urns) / count >= AsyncLinkedin._MAX_REPEATED_REQUESTS
+            ) or len(l_raw_urns) == 0:
+                break
+
+            self.logger.debug(f"results grew to {len(l_urns)}")
+
+        return l_posts, l_urns
+
+    async def get_feed_posts(self, limit=-1, offset=0, exclude_promoted_posts=True):
+        """Get a list of URNs from feed sorted by 'Recent'. See Linkedin.get_feed_posts()"""
+        l_posts, l_urns = await self._get_list_feed_posts_and_list_feed_urns(
+            limit, offset, exclude_promoted_posts
+        )
+        return get_list_posts_sorted_without_promoted(l_urns, l_posts)
+
+    async def get_job(self, job_id: str) -> Dict:
+        """Fetch data about a given job. See Linkedin.get_job()"""
+        params = {
+            "decorationId": "com.linkedin.voyager.deco.jobs.web.shared.WebLightJobPosting-23",
+        }
+
+        res = await self._fetch(f"/jobs/jobPostings/{job_id}", params=params)
+
+        data = self._decode(res)
+
+        if data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data["message"]))
+            return {}
+
+        return data
+
+    async def get_post_reactions(self, urn_id, max_results=None):
+        """Fetch social reactions for a given LinkedIn post. See Linkedin.get_post_reactions()"""
+        results = []
+        async for elements in self._checkpointed(
+            "post_reactions",
+            {"target": urn_id, "max_results": max_results, "start": 0},
+            lambda cursor: self.iter_post_reactions(
+                urn_id, max_results=max_results, cursor=cursor
+            ),
+        ):
+            results.extend(elements)
+        return results
+
+    def iter_post_reactions(
+        self, urn_id, max_results=None, cursor=None
+    ) -> AsyncIterator[Page]:
+        """Fetch social reactions for a given LinkedIn post, page by page. See Linkedin.iter_post_reactions()"""
+        params = {
+            "decorationId": "com.linkedin.voyager.dash.deco.social.ReactionsByTypeWithProfileActions-13",
+            "count": 10,
+            "q": "reactionType",
+            "threadUrn": urn_id,
+        }
+
+        return self._iter_offset_pages(
+            "post_reactions",
+            urn_id,
+            "/voyagerSocialDashReactions",
+            params,
+            max_results=max_results,
+            cursor=cursor,
+        )
+
+    async def get_job_skills(self, job_id: str) -> Dict:
+        """Fetch skills associated with a given job. See Linkedin.get_job_skills()"""
+        params = {
+            "decorationId": "com.linkedin.voyager.dash.deco.assessments.FullJobSkillMatchInsight-17",
+        }
+        res = await self._fetch(
+            f"/voyagerAssessmentsDashJobSkillMatchInsight/urn%3Ali%3Afsd_jobSkillMatchInsight%3A{job_id}",
+            params=params,
+        )
+        data = self._decode(res)
+
+        if data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data.get("message")))
+            return {}
+
+        return data
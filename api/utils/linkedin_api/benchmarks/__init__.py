@@ -0,0 +1,5 @@
+"""
+Offline benchmarks for the linkedin_api hot paths.
+
+Run each module with `python -m api.utils.linkedin_api.benchmarks.<name>`.
+"""
@@ -0,0 +1,158 @@
+"""
+Paging through a long comment thread: copying accumulation against streaming.
+
+`get_post_comments` used to grow its result with `data["elements"] + page["elements"]`
+on every page, copying everything fetched so far each time. It now extends one list,
+and `iter_post_comments` streams the pages without keeping them. The benchmark replays
+a recorded thread through the old loop, `get_post_comments` and `iter_post_comments`,
+reporting the median time and the peak memory of each.
+
+Record a real thread once (credentials from LINKEDIN_USERNAME/LINKEDIN_PASSWORD):
+
+    python -m api.utils.linkedin_api.benchmarks.comments cassettes/thread.json.gz \
+        --record --post-urn 7100000000000000000
+
+or, without a cassette file, a synthetic thread of `--comments` comments is recorded
+in memory and replayed:
+
+    python -m api.utils.linkedin_api.benchmarks.comments --comments 2000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Callable, List
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from api.utils.linkedin_api.benchmarks.payloads import comments_page
+from api.utils.linkedin_api.benchmarks.replay import _unpaced
+from api.utils.linkedin_api.cassette import RECORD, REPLAY, use_cassette
+from api.utils.linkedin_api.linkedin import Linkedin
+
+SYNTHETIC_POST_URN = "7000000000000000000"
+
+
+class _SyntheticThread(BaseAdapter):
+    """Answers `/feed/comments` requests with pages of a thread of `total` comments"""
+
+    def __init__(self, total: int):
+        super().__init__()
+        self.total = total
+
+    def send(self, request, **kwargs):
+        query = parse_qs(urlsplit(request.url).query)
+        start, count = int(query["start"][0]), int(query["count"][0])
+        res = requests.Response()
+        res.status_code = 200
+        res.headers["content-type"] = "application/json"
+        res._content = json.dumps(
+            comments_page(count, start, total=self.total)
+        ).encode()
+        res.url = request.url
+        res.request = request
+        return res
+
+    def close(self):
+        pass
+
+
+def legacy_get_post_comments(linkedin: Linkedin, post_urn: str, comment_count: int):
+    """The paging loop of `get_post_comments` before it streamed, for comparison"""
+    url_params = {
+        "count": min(comment_count, linkedin._MAX_POST_COUNT),
+        "start": 0,
+        "q": "comments",
+        "sortOrder": "RELEVANCE",
+        "updateId": "activity:" + post_urn,
+    }
+    data = linkedin._decode(linkedin._fetch("/feed/comments", params=url_params))
+    while data and data["metadata"]["paginationToken"] != "":
+        if len(data["elements"]) >= comment_count:
+            break
+        url_params["start"] = url_params["start"] + linkedin._MAX_POST_COUNT
+        url_params["count"] = linkedin._MAX_POST_COUNT
+        url_params["paginationToken"] = data["metadata"]["paginationToken"]
+        page = linkedin._decode(linkedin._fetch("/feed/comments", params=url_params))
+        data["metadata"] = page["metadata"]
+        if data["elements"] and len(page["elements"]) == 0:
+            break
+        data["elements"] = data["elements"] + page["elements"]
+    return data["elements"]
+
+
+def _measure(fn: Callable[[], int], rewind: Callable[[], None], runs: int):
+    timings: List[float] = []
+    for _ in range(runs):
+        rewind()
+        started = time.perf_counter()
+        n = fn()
+        timings.append(time.perf_counter() - started)
+
+    rewind()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return n, statistics.median(timings), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("cassette", nargs="?")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--post-urn", default=SYNTHETIC_POST_URN)
+    parser.add_argument("--comments", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.record:
+        linkedin = Linkedin(
+            os.environ["LINKEDIN_USERNAME"],
+            os.environ["LINKEDIN_PASSWORD"],
+            response_cache=False,
+        )
+        adapter = use_cassette(linkedin.client, args.cassette, mode=RECORD)
+        comments = linkedin.get_post_comments(args.post_urn, args.comments)
+        adapter.cassette.save()
+        print(f"Recorded {len(comments)} comments to {args.cassette}")
+        return
+
+    linkedin = Linkedin(
+        "", "", authenticate=False, pacer=_unpaced(), response_cache=False
+    )
+    if args.cassette:
+        adapter = use_cassette(linkedin.client, args.cassette, mode=REPLAY)
+    else:
+        linkedin.client.session.mount("https://", _SyntheticThread(args.comments))
+        adapter = use_cassette(linkedin.client, "", mode=RECORD)
+        linkedin.get_post_comments(args.post_urn, args.comments)
+        adapter.mode = REPLAY
+
+    variants = {
+        "old loop (copying)": lambda: len(
+            legacy_get_post_comments(linkedin, args.post_urn, args.comments)
+        ),
+        "get_post_comments": lambda: len(
+            linkedin.get_post_comments(args.post_urn, args.comments)
+        ),
+        "iter_post_comments": lambda: sum(
+            len(page.elements)
+            for page in linkedin.iter_post_comments(args.post_urn, args.comments)
+        ),
+    }
+    for name, fn in variants.items():
+        n, median, peak = _measure(fn, adapter.cassette.rewind, args.runs)
+        print(
+            f"{name:>20}: {n:6d} comments  median {median * 1000:8.1f} ms"
+            f"  peak {peak / 2**20:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
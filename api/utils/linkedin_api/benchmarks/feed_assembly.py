@@ -0,0 +1,117 @@
+"""
+Assembling the feed: quadratic scan against the URN index.
+
+`get_feed_posts` turns the shuffled `included` entities of `/feed/updatesV2` into
+posts, then orders them by the `*elements` URNs, dropping promoted ones. The ordering
+used to scan the posts for every URN and rebuild the list on each hit; it now indexes
+the posts by URN once and joins in a single pass. The benchmark runs the old and new
+assembly on synthetic feeds and checks they return the same posts.
+
+    python -m api.utils.linkedin_api.benchmarks.feed_assembly --posts 1000 10000
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from api.utils.linkedin_api.benchmarks.payloads import feed_updates_payload
+from api.utils.linkedin_api.client import Client
+from api.utils.linkedin_api.utils.helpers import (
+    append_update_post_field_to_posts_list,
+    get_list_posts_sorted_without_promoted,
+    get_update_author_name,
+    get_update_author_profile,
+    get_update_content,
+    get_update_old,
+    get_update_url,
+    parse_list_raw_posts,
+    parse_list_raw_urns,
+)
+
+
+def legacy_parse_list_raw_posts(l_raw_posts: List[Dict], base_url: str) -> List[Dict]:
+    """`parse_list_raw_posts` before it was single pass, for comparison"""
+    l_posts = []
+    for i in l_raw_posts:
+        author_name = get_update_author_name(i)
+        if author_name:
+            l_posts = append_update_post_field_to_posts_list(
+                i, l_posts, "author_name", author_name
+            )
+        author_profile = get_update_author_profile(i, base_url)
+        if author_profile:
+            l_posts = append_update_post_field_to_posts_list(
+                i, l_posts, "author_profile", author_profile
+            )
+        old = get_update_old(i)
+        if old:
+            l_posts = append_update_post_field_to_posts_list(i, l_posts, "old", old)
+        content = get_update_content(i, base_url)
+        if content:
+            l_posts = append_update_post_field_to_posts_list(
+                i, l_posts, "content", content
+            )
+        url = get_update_url(i, base_url)
+        if url:
+            l_posts = append_update_post_field_to_posts_list(i, l_posts, "url", url)
+    return l_posts
+
+
+def legacy_sort_without_promoted(l_urns: List[str], l_posts: List[Dict]) -> List[Dict]:
+    """`get_list_posts_sorted_without_promoted` before the URN index, for comparison"""
+    l_sorted = []
+    l_posts[:] = [d for d in l_posts if d and "Promoted" not in d.get("old", "")]
+    for urn in l_urns:
+        for post in l_posts:
+            if urn in post["url"]:
+                l_sorted.append(post)
+                l_posts[:] = [d for d in l_posts if urn not in d.get("url", "")]
+                break
+    return l_sorted
+
+
+def _median_ms(fn: Callable[[], object], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--promoted-every", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    base_url = Client.LINKEDIN_BASE_URL
+    for n_posts in args.posts:
+        payload = feed_updates_payload(n_posts, args.promoted_every)
+        l_raw_posts = payload["included"]
+        l_urns = parse_list_raw_urns(payload["data"]["*elements"])
+
+        def legacy():
+            posts = legacy_parse_list_raw_posts(l_raw_posts, base_url)
+            return legacy_sort_without_promoted(l_urns, posts)
+
+        def indexed():
+            posts = parse_list_raw_posts(l_raw_posts, base_url)
+            return get_list_posts_sorted_without_promoted(l_urns, posts)
+
+        feed = indexed()
+        assert feed == legacy(), "assemblies disagree"
+
+        legacy_ms = _median_ms(legacy, args.runs)
+        indexed_ms = _median_ms(indexed, args.runs)
+        print(f"{n_posts} updates, {len(feed)} posts once promoted are dropped")
+        print(f"  {'old scan':>12}: {legacy_ms:10.1f} ms")
+        print(
+            f"  {'URN index':>12}: {indexed_ms:10.1f} ms  ({legacy_ms / indexed_ms:.0f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Decoding cost of voyager responses per JSON backend.
+
+`get_post_comments` used to call `res.json()` up to six times per page and the feed
+up to twice, each time a full stdlib parse. The benchmark times one decode of each
+payload with every installed backend of `api.utils.json_codec`, next to the old
+"stdlib, N times" pattern. Pass recorded response bodies as arguments, otherwise
+synthetic feed and comment pages are used.
+
+    python -m api.utils.linkedin_api.benchmarks.json_decode --runs 50 recorded/*.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Callable, Dict
+
+from api.utils.json_codec import available_codecs, get_codec
+from api.utils.linkedin_api.benchmarks.payloads import (
+    comments_page,
+    feed_updates_payload,
+)
+
+
+def _median_ms(fn: Callable[[], object], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def _payloads(paths) -> Dict[str, bytes]:
+    if paths:
+        payloads = {}
+        for path in paths:
+            with open(path, "rb") as f:
+                payloads[os.path.basename(path)] = f.read()
+        return payloads
+    return {
+        "feed (500 updates)": json.dumps(feed_updates_payload(500)).encode(),
+        "comments (100)": json.dumps(comments_page(100)).encode(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="*", help="Recorded response bodies")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--repeat", type=int, default=6, help="Decodes per body of the old code path"
+    )
+    args = parser.parse_args()
+
+    codecs = [get_codec(name) for name in available_codecs()]
+
+    for label, body in _payloads(args.paths).items():
+        print(f"{label}: {len(body) / 1024:.0f} KiB")
+        legacy = _median_ms(
+            lambda: [json.loads(body) for _ in range(args.repeat)], args.runs
+        )
+        print(f"  {'json x' + str(args.repeat):>10}: {legacy:8.2f} ms")
+        for codec in codecs:
+            elapsed = _median_ms(lambda: codec.loads(body), args.runs)
+            print(f"  {codec.name:>10}: {elapsed:8.2f} ms  ({legacy / elapsed:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
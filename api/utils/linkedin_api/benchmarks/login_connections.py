@@ -0,0 +1,116 @@
+"""
+Time to first API request of a cold login, with and without connection reuse.
+
+A login makes three requests (session cookies, credentials, metadata) before the
+first voyager call. The legacy path used module level `requests.get/post` for those,
+opening a fresh connection (TCP + TLS) each time; `Client` now sends everything over
+its pooled session. By default the benchmark runs against a local keep-alive server
+that charges `--handshake-ms` per new connection to stand in for TCP + TLS setup.
+Pass `--base-url https://www.linkedin.com` to measure the real thing.
+
+    python -m api.utils.linkedin_api.benchmarks.login_connections --runs 20
+"""
+
+import argparse
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from api.utils.linkedin_api.client import TimeoutHTTPAdapter, TransportConfig
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    handshake_seconds = 0.0
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes, avoid Nagle/delayed ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # Once per connection, like a TCP + TLS handshake
+        time.sleep(self.handshake_seconds)
+
+    def _reply(self):
+        length = int(self.headers.get("content-length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = b'{"login_result": "PASS"}'
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(body)))
+        self.send_header("set-cookie", 'JSESSIONID="ajax:0"; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_local_server(handshake_ms: float) -> str:
+    _KeepAliveHandler.handshake_seconds = handshake_ms / 1000.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def legacy_login(base_url: str) -> float:
+    """Module level requests for the auth phase, then the first call on a new session"""
+    started = time.perf_counter()
+    session = requests.session()
+    cookies = requests.get(f"{base_url}/uas/authenticate").cookies
+    requests.post(f"{base_url}/uas/authenticate", data={"a": 1}, cookies=cookies)
+    requests.get(base_url, cookies=cookies)
+    session.get(f"{base_url}/voyager/api/me")
+    elapsed = time.perf_counter() - started
+    session.close()
+    return elapsed
+
+
+def pooled_login(base_url: str) -> float:
+    """Every request of the login over one pooled session, as `Client` does"""
+    transport = TransportConfig()
+    started = time.perf_counter()
+    session = requests.session()
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=transport.pool_connections,
+        pool_maxsize=transport.pool_maxsize,
+        timeout=(transport.connect_timeout, transport.read_timeout),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.get(f"{base_url}/uas/authenticate")
+    session.post(f"{base_url}/uas/authenticate", data={"a": 1})
+    session.get(base_url)
+    session.get(f"{base_url}/voyager/api/me")
+    elapsed = time.perf_counter() - started
+    session.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--handshake-ms", type=float, default=60.0)
+    parser.add_argument("--base-url", default=None)
+    args = parser.parse_args()
+
+    base_url = args.base_url or _start_local_server(args.handshake_ms)
+
+    for name, login in (("legacy", legacy_login), ("pooled", pooled_login)):
+        timings = [login(base_url) for _ in range(args.runs)]
+        print(
+            f"{name:>7}: median {statistics.median(timings) * 1000:8.1f} ms"
+            f"  min {min(timings) * 1000:8.1f} ms  ({args.runs} runs)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+Synthetic voyager payloads for the benchmarks.
+
+Shaped like the normalized (`application/vnd.linkedin.normalized+json+2.1`) responses
+the client parses: a `data` section referencing entities by URN and a flat `included`
+list holding the entities themselves. Content is random but deterministic per seed.
+"""
+
+import random
+import string
+from typing import Dict, List, Optional
+
+
+def _words(rng: random.Random, n: int) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10)))
+        for _ in range(n)
+    )
+
+
+def _mini_profile(rng: random.Random, member_id: int) -> Dict:
+    return {
+        "$type": "com.linkedin.voyager.identity.shared.MiniProfile",
+        "entityUrn": f"urn:li:fs_miniProfile:ACoAA{member_id:010d}",
+        "objectUrn": f"urn:li:member:{member_id}",
+        "publicIdentifier": f"member-{member_id}",
+        "firstName": _words(rng, 1).title(),
+        "lastName": _words(rng, 1).title(),
+        "occupation": _words(rng, 6),
+        "trackingId": "".join(rng.choices(string.ascii_letters, k=22)),
+    }
+
+
+def feed_updates_payload(
+    n_posts: int = 200, promoted_every: int = 10, seed: int = 0
+) -> Dict:
+    """
+    A `/feed/updatesV2` page with `n_posts` updates, one in `promoted_every` promoted.
+
+    `included` lists the updates in shuffled order, next to the mini profiles of
+    their authors, like the real endpoint does.
+    """
+    rng = random.Random(seed)
+    urns: List[str] = []
+    included: List[Dict] = []
+    authors = [_mini_profile(rng, 100000 + i) for i in range(max(1, n_posts // 4))]
+
+    for i in range(n_posts):
+        activity = f"urn:li:activity:{7000000000000000000 + i}"
+        author = rng.choice(authors)
+        promoted = promoted_every and i % promoted_every == promoted_every - 1
+        urns.append(f"urn:li:fs_updateV2:({activity},MAIN_FEED,EMPTY,DEFAULT,false)")
+        included.append(
+            {
+                "$type": "com.linkedin.voyager.feed.render.UpdateV2",
+                "entityUrn": urns[-1],
+                "actor": {
+                    "urn": author["objectUrn"],
+                    "name": {"text": f"{author['firstName']} {author['lastName']}"},
+                    "subDescription": {
+                        "text": "Promoted" if promoted else f"{rng.randint(1, 11)} mo"
+                    },
+                    "*miniProfile": author["entityUrn"],
+                },
+                "commentary": {"text": {"text": _words(rng, rng.randint(20, 120))}},
+                "updateMetadata": {
+                    "urn": activity,
+                    "trackingData": {"requestId": str(i)},
+                },
+                "*socialDetail": f"urn:li:fs_socialDetail:{activity}",
+            }
+        )
+        included.append(
+            {
+                "$type": "com.linkedin.voyager.feed.SocialDetail",
+                "entityUrn": f"urn:li:fs_socialDetail:{activity}",
+                "totalSocialActivityCounts": {
+                    "numComments": rng.randint(0, 500),
+                    "numLikes": rng.randint(0, 5000),
+                },
+            }
+        )
+
+    included.extend(authors)
+    rng.shuffle(included)
+    return {
+        "data": {
+            "*elements": urns,
+            "paging": {"start": 0, "count": n_posts, "total": n_posts},
+            "metadata": {"paginationToken": "".join(rng.choices(string.digits, k=12))},
+        },
+        "included": included,
+    }
+
+
+def comments_page(
+    n_comments: int = 100, start: int = 0, seed: int = 0, total: Optional[int] = None
+) -> Dict:
+    """
+    A `/feed/comments` page with `n_comments` comments starting at index `start`.
+
+    With `total`, the page stops at the end of a thread of that many comments and the
+    last page has an empty pagination token.
+    """
+    rng = random.Random(seed + start)
+    end = start + n_comments if total is None else min(start + n_comments, total)
+    elements = []
+    for i in range(start, end):
+        author = _mini_profile(rng, 200000 + i)
+        elements.append(
+            {
+                "urn": f"urn:li:comment:(activity:7000000000000000000,{8000000000 + i})",
+                "commenter": {
+                    "com.linkedin.voyager.feed.MemberActor": {"miniProfile": author}
+                },
+                "comment": {"values": [{"value": _words(rng, rng.randint(5, 60))}]},
+                "createdTime": 1700000000000 + i * 1000,
+                "socialDetail": {
+                    "totalSocialActivityCounts": {"numLikes": rng.randint(0, 200)}
+                },
+            }
+        )
+    last = total is not None and end >= total
+    return {
+        "metadata": {"paginationToken": "" if last else f"token-{end}"},
+        "elements": elements,
+        "paging": {"start": start, "count": n_comments, "links": []},
+    }
+
+
+def _vector_image(rng: random.Random, sizes=(100, 200, 400, 800)) -> Dict:
+    return {
+        "com.linkedin.common.VectorImage": {
+            "rootUrl": "https://media.licdn.com/dms/image/"
+            + "".join(rng.choices(string.ascii_letters, k=16))
+            + "/",
+            "artifacts": [
+                {
+                    "width": size,
+                    "height": size,
+                    "expiresAt": 1800000000000,
+                    "fileIdentifyingUrlPathSegment": f"{size}_{size}/0/"
+                    + "".join(rng.choices(string.ascii_letters, k=40)),
+                }
+                for size in sizes
+            ],
+        }
+    }
+
+
+def _time_period(rng: random.Random, ongoing: bool = False) -> Dict:
+    start = {"month": rng.randint(1, 12), "year": rng.randint(2000, 2020)}
+    if ongoing:
+        return {"startDate": start}
+    end = {"month": rng.randint(1, 12), "year": start["year"] + rng.randint(1, 4)}
+    return {"startDate": start, "endDate": end}
+
+
+def _view(elements: List[Dict], urn: str) -> Dict:
+    return {
+        "entityUrn": urn,
+        "profileId": urn.split(":")[-1],
+        "elements": elements,
+        "paging": {"start": 0, "count": 10, "total": len(elements), "links": []},
+    }
+
+
+def profile_view_payload(
+    n_positions: int = 8,
+    n_education: int = 3,
+    n_skills: int = 40,
+    n_certifications: int = 4,
+    seed: int = 0,
+) -> Dict:
+    """
+    A `/identity/profiles/{id}/profileView` response with the given section sizes.
+
+    Carries the raw fields `parse_profile_view` keeps or deletes, like the real
+    endpoint: locales, picture artifacts, mini companies with logos, entity URNs.
+    """
+    rng = random.Random(seed)
+    member_id = 300000 + seed
+    profile_id = f"ACoAA{member_id:010d}"
+    mini = _mini_profile(rng, member_id)
+    mini["entityUrn"] = f"urn:li:fs_miniProfile:{profile_id}"
+    mini["picture"] = _vector_image(rng)
+    mini["backgroundImage"] = _vector_image(rng, (800, 1400))
+
+    def urn(kind: str, i: int = 0) -> str:
+        return f"urn:li:fs_{kind}:({profile_id},{1000000 + i})"
+
+    positions = []
+    for i in range(n_positions):
+        company_id = rng.randint(1000, 99999)
+        positions.append(
+            {
+                "entityUrn": urn("position", i),
+                "title": _words(rng, 3).title(),
+                "companyName": _words(rng, 2).title(),
+                "companyUrn": f"urn:li:fs_miniCompany:{company_id}",
+                "locationName": _words(rng, 2).title(),
+                "geoLocationName": _words(rng, 3).title(),
+                "geoUrn": f"urn:li:fs_geo:{rng.randint(100000, 999999)}",
+                "description": _words(rng, rng.randint(20, 120)),
+                "timePeriod": _time_period(rng, ongoing=i == 0),
+                "company": {
+                    "employeeCountRange": {"start": 51, "end": 200},
+                    "industries": [_words(rng, 2).title()],
+                    "miniCompany": {
+                        "objectUrn": f"urn:li:company:{company_id}",
+                        "entityUrn": f"urn:li:fs_miniCompany:{company_id}",
+                        "name": _words(rng, 2).title(),
+                        "showcase": False,
+                        "active": True,
+                        "logo": _vector_image(rng),
+                        "universalName": _words(rng, 1),
+                        "dashCompanyUrn": f"urn:li:fsd_company:{company_id}",
+                        "trackingId": "".join(rng.choices(string.ascii_letters, k=22)),
+                    },
+                },
+            }
+        )
+
+    education = [
+        {
+            "entityUrn": urn("education", i),
+            "schoolName": _words(rng, 3).title(),
+            "schoolUrn": f"urn:li:fs_miniSchool:{rng.randint(1000, 99999)}",
+            "degreeName": _words(rng, 2).title(),
+            "fieldOfStudy": _words(rng, 2).title(),
+            "timePeriod": _time_period(rng),
+            "school": {
+                "objectUrn": f"urn:li:school:{rng.randint(1000, 99999)}",
+                "entityUrn": f"urn:li:fs_miniSchool:{rng.randint(1000, 99999)}",
+                "active": True,
+                "schoolName": _words(rng, 3).title(),
+                "trackingId": "".join(rng.choices(string.ascii_letters, k=22)),
+                "logo": _vector_image(rng),
+            },
+        }
+        for i in range(n_education)
+    ]
+
+    certifications = [
+        {
+            "entityUrn": urn("certification", i),
+            "name": _words(rng, 4).title(),
+            "authority": _words(rng, 2).title(),
+            "licenseNumber": "".join(rng.choices(string.digits, k=10)),
+            "url": "https://example.com/" + _words(rng, 1),
+            "timePeriod": _time_period(rng),
+            "company": {"name": _words(rng, 2).title(), "logo": _vector_image(rng)},
+        }
+        for i in range(n_certifications)
+    ]
+
+    profile = {
+        "entityUrn": f"urn:li:fs_profile:{profile_id}",
+        "firstName": mini["firstName"],
+        "lastName": mini["lastName"],
+        "headline": mini["occupation"],
+        "summary": _words(rng, rng.randint(30, 200)),
+        "industryName": _words(rng, 2).title(),
+        "industryUrn": f"urn:li:fs_industry:{rng.randint(1, 150)}",
+        "locationName": _words(rng, 2).title(),
+        "geoLocationName": _words(rng, 3).title(),
+        "geoCountryName": _words(rng, 1).title(),
+        "geoCountryUrn": f"urn:li:fs_geo:{rng.randint(100000, 999999)}",
+        "location": {"basicLocation": {"countryCode": "gb", "postalCode": "EC1"}},
+        "student": False,
+        "elt": False,
+        "miniProfile": mini,
+        "defaultLocale": {"country": "US", "language": "en"},
+        "supportedLocales": [{"country": "US", "language": "en"}],
+        "versionTag": str(rng.randint(10**9, 10**10)),
+        "showEducationOnProfileTopCard": True,
+    }
+
+    return {
+        "profile": profile,
+        "positionView": _view(positions, urn("positionView")),
+        "positionGroupView": _view([], urn("positionGroupView")),
+        "educationView": _view(education, urn("educationView")),
+        "languageView": _view(
+            [{"entityUrn": urn("language", 0), "name": "English"}],
+            urn("languageView"),
+        ),
+        "publicationView": _view([], urn("publicationView")),
+        "certificationView": _view(certifications, urn("certificationView")),
+        "volunteerExperienceView": _view([], urn("volunteerExperienceView")),
+        "honorView": _view([], urn("honorView")),
+        "projectView": _view([], urn("projectView")),
+        "skillView": _view(
+            [
+                {"entityUrn": urn("skill", i), "name": _words(rng, 2).title()}
+                for i in range(n_skills)
+            ],
+            urn("skillView"),
+        ),
+        "patentView": _view([], urn("patentView")),
+        "courseView": _view([], urn("courseView")),
+        "organizationView": _view([], urn("organizationView")),
+        "testScoreView": _view([], urn("testScoreView")),
+        "primaryLocale": {"country": "US", "language": "en"},
+    }
+
+
+def _experience_component(
+    rng: random.Random, title: str, subtitle: str, caption: str, sub: Dict
+) -> Dict:
+    return {
+        "components": {
+            "entityComponent": {
+                "titleV2": {"text": {"text": title}},
+                "subtitle": {"text": subtitle},
+                "metadata": {"text": _words(rng, 2).title()},
+                "caption": {"text": caption},
+                "subComponents": {"components": [{"components": sub}]},
+            }
+        }
+    }
+
+
+def _description(rng: random.Random) -> Dict:
+    text = {"textComponent": {"text": {"text": _words(rng, 30)}}}
+    return {"fixedListComponent": {"components": [{"components": text}]}}
+
+
+def profile_experiences_payload(
+    n_groups: int = 10,
+    roles_per_group: int = 4,
+    n_positions: int = 10,
+    n_other: int = 200,
+    seed: int = 0,
+) -> Dict:
+    """
+    A normalized experience section response, as `parse_profile_experiences` reads it.
+
+    The section lists `n_positions` single positions and `n_groups` companies with
+    `roles_per_group` roles each, every group's roles in a paged list entity of its
+    own. `included` starts with the section and holds, shuffled, the group lists next
+    to `n_other` unrelated entities (companies, images) like the real endpoint does.
+    """
+    rng = random.Random(seed)
+    profile_id = f"ACoAA{500000 + seed:010d}"
+
+    def dates() -> str:
+        start = rng.randint(2000, 2020)
+        return (
+            f"Jan {start} - Dec {start + rng.randint(1, 4)} · {rng.randint(1, 4)} yrs"
+        )
+
+    elements: List[Dict] = []
+    included: List[Dict] = []
+    for i in range(n_groups):
+        group_urn = f"urn:li:fsd_profilePositionGroup:({profile_id},{1000000 + i})"
+        list_urn = (
+            f"urn:li:fsd_profilePagedListComponent:({profile_id},"
+            f"EXPERIENCE_VIEW_DETAILS,{group_urn},NONE,en_US)"
+        )
+        elements.append(
+            _experience_component(
+                rng,
+                _words(rng, 2).title(),
+                f"Full-time · {rng.randint(2, 12)} yrs",
+                _words(rng, 2).title(),
+                {"*pagedListComponent": list_urn},
+            )
+        )
+        roles = [
+            _experience_component(
+                rng, _words(rng, 3).title(), "Full-time", dates(), _description(rng)
+            )
+            for _ in range(roles_per_group)
+        ]
+        included.append({"entityUrn": list_urn, "components": {"elements": roles}})
+    for _ in range(n_positions):
+        elements.insert(
+            rng.randint(0, len(elements)),
+            _experience_component(
+                rng,
+                _words(rng, 3).title(),
+                f"{_words(rng, 2).title()} · Full-time",
+                dates(),
+                _description(rng),
+            ),
+        )
+    for i in range(n_other):
+        included.append(
+            {
+                "$type": "com.linkedin.voyager.dash.organization.Company",
+                "entityUrn": f"urn:li:fsd_company:{2000000 + i}",
+                "name": _words(rng, 2).title(),
+                "logo": _vector_image(rng),
+            }
+        )
+    rng.shuffle(included)
+
+    section_urn = (
+        f"urn:li:fsd_profilePagedListComponent:({profile_id},"
+        f"EXPERIENCE_VIEW_DETAILS,urn:li:fsd_profile:{profile_id},NONE,en_US)"
+    )
+    included.insert(0, {"entityUrn": section_urn, "components": {"elements": elements}})
+    return {"data": {"*elements": [section_urn]}, "included": included}
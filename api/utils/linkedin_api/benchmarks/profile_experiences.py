@@ -0,0 +1,132 @@
+"""
+Resolving position groups: scan of `included` against the URN index.
+
+`get_profile_experiences` reads the normalized experience section, where a company
+with several roles points to the paged list of its roles by URN. The parser used to
+scan all of `included` for every group, with an uncompiled pattern; it now indexes
+the entities once through `NormalizedPayload`. The benchmark times the old and new
+parsers on heavy profiles, recorded in cassettes of the replay benchmark when given,
+synthetic otherwise, and checks they return the same experiences.
+
+    python -m api.utils.linkedin_api.benchmarks.profile_experiences --groups 10 50
+    python -m api.utils.linkedin_api.benchmarks.profile_experiences --cassette cassettes/run.json.gz
+"""
+
+import argparse
+import re
+import statistics
+import time
+from typing import Callable, Dict, List, Optional
+from urllib.parse import unquote
+
+from api.utils import json_codec
+from api.utils.linkedin_api.benchmarks.payloads import profile_experiences_payload
+from api.utils.linkedin_api.cassette import Cassette
+from api.utils.linkedin_api.utils.helpers import (
+    _parse_experience_item,
+    parse_profile_experiences,
+)
+
+
+def _legacy_grouped_item_id(item: Dict) -> Optional[str]:
+    sub_components = item["components"]["entityComponent"]["subComponents"]
+    sub_components_components = (
+        sub_components["components"][0]["components"] if sub_components else None
+    )
+    paged_list_component_id = (
+        sub_components_components.get("*pagedListComponent", "")
+        if sub_components_components
+        else None
+    )
+    if (
+        paged_list_component_id
+        and "fsd_profilePositionGroup" in paged_list_component_id
+    ):
+        pattern = r"urn:li:fsd_profilePositionGroup:\([A-z0-9]+,[A-z0-9]+\)"
+        match = re.search(pattern, paged_list_component_id)
+        return match.group(0) if match else None
+
+
+def legacy_parse_profile_experiences(data: Dict) -> List[Dict]:
+    """`parse_profile_experiences` before the URN index, for comparison"""
+    items = []
+    for item in data["included"][0]["components"]["elements"]:
+        grouped_item_id = _legacy_grouped_item_id(item)
+        if grouped_item_id:
+            component = item["components"]["entityComponent"]
+            company = component["titleV2"]["text"]["text"]
+            location = component["caption"]["text"] if component["caption"] else None
+            group = [
+                i for i in data["included"] if grouped_item_id in i.get("entityUrn", "")
+            ]
+            if not group:
+                continue
+            for group_item in group[0]["components"]["elements"]:
+                parsed_data = _parse_experience_item(group_item, is_group_item=True)
+                parsed_data["companyName"] = company
+                parsed_data["locationName"] = location
+                items.append(parsed_data)
+            continue
+        items.append(_parse_experience_item(item))
+    return items
+
+
+def recorded_payloads(path: str) -> List[Dict]:
+    """The experience sections recorded in a cassette, heaviest first"""
+    payloads = [
+        json_codec.loads(response.content)
+        for request, response in Cassette(path).items()
+        if "sectionType:experience" in unquote(request) and response.status_code == 200
+    ]
+    return sorted(payloads, key=lambda data: -len(data.get("included", [])))
+
+
+def _median_us(fn: Callable[[], object], runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cassette", action="append", default=[])
+    parser.add_argument("--groups", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--roles-per-group", type=int, default=4)
+    parser.add_argument("--other", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.cassette:
+        payloads = [data for path in args.cassette for data in recorded_payloads(path)]
+    else:
+        payloads = [
+            profile_experiences_payload(
+                n_groups=n_groups,
+                roles_per_group=args.roles_per_group,
+                n_other=args.other,
+            )
+            for n_groups in args.groups
+        ]
+
+    for data in payloads:
+        experiences = parse_profile_experiences(data)
+        assert experiences == legacy_parse_profile_experiences(data), "parsers disagree"
+
+        legacy_us = _median_us(
+            lambda: legacy_parse_profile_experiences(data), args.runs
+        )
+        indexed_us = _median_us(lambda: parse_profile_experiences(data), args.runs)
+        print(
+            f"{len(data['included'])} included entities, {len(experiences)} experiences"
+        )
+        print(f"  {'old scan':>12}: {legacy_us:10.0f} us")
+        print(
+            f"  {'URN index':>12}: {indexed_us:10.0f} us  ({legacy_us / indexed_us:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
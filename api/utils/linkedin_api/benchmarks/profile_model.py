@@ -0,0 +1,95 @@
+"""
+Holding many profiles: the get_profile dict against the typed Profile record.
+
+`get_profile()` massages the profileView payload into a dict keeping every raw voyager
+field, while `get_profile(typed=True)` decodes it into `models.Profile` and
+`get_profile(lazy=True)` into a `models.LazyProfile` decoding sections on first read.
+The benchmark decodes the same response bodies each way, reporting the median decode
+time per profile and the memory retained by `--profiles` profiles held at once. The
+lazy variants read the headline and location only, and every section.
+
+    python -m api.utils.linkedin_api.benchmarks.profile_model --profiles 5000
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import time
+import tracemalloc
+from typing import Callable, List
+
+from api.utils import json_codec
+from api.utils.linkedin_api.benchmarks.payloads import profile_view_payload
+from api.utils.linkedin_api.models import LazyProfile, Profile
+from api.utils.linkedin_api.utils.helpers import parse_profile_view
+
+
+def _lazy_top_card(body: bytes) -> LazyProfile:
+    profile = LazyProfile(body)
+    profile.headline, profile.location_name
+    return profile
+
+
+def _retained(decode: Callable[[bytes], object], bodies: List[bytes]) -> int:
+    """Bytes still allocated once every body is decoded and kept"""
+    gc.collect()
+    tracemalloc.start()
+    # Each profile gets its own copy of the body, as each response has, so that what
+    # holds on to the body pays for it
+    kept = [decode(bytes(bytearray(body))) for body in bodies]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return current
+
+
+def _median_us(decode: Callable[[bytes], object], bodies: List[bytes], runs: int):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for body in bodies:
+            decode(body)
+        timings.append((time.perf_counter() - started) / len(bodies))
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profiles", type=int, default=5000)
+    parser.add_argument("--distinct", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    distinct = [
+        json.dumps(profile_view_payload(seed=seed)).encode()
+        for seed in range(args.distinct)
+    ]
+    bodies = [distinct[i % len(distinct)] for i in range(args.profiles)]
+    print(
+        f"{args.profiles} profiles, {args.distinct} distinct bodies of "
+        f"{sum(map(len, distinct)) / len(distinct) / 1024:.0f} KiB"
+    )
+
+    variants = {
+        "dict": lambda body: parse_profile_view(json_codec.loads(body)),
+        "Profile": lambda body: Profile.from_profile_view(json_codec.loads(body)),
+        "Profile.to_dict": lambda body: Profile.from_profile_view(
+            json_codec.loads(body)
+        ).to_dict(),
+        "LazyProfile top": _lazy_top_card,
+        "LazyProfile all": lambda body: LazyProfile(body).to_profile(),
+    }
+    for name, decode in variants.items():
+        elapsed = _median_us(decode, distinct, args.runs)
+        retained = _retained(decode, bodies)
+        print(
+            f"  {name:>16}: decode {elapsed:7.0f} us/profile"
+            f"  retained {retained / 2**20:8.1f} MiB"
+            f"  ({retained / args.profiles / 1024:5.1f} KiB/profile)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Offline timing of the scraper's read paths against a recorded cassette.
+
+Record once with a real account (credentials from LINKEDIN_USERNAME/LINKEDIN_PASSWORD):
+
+    python -m api.utils.linkedin_api.benchmarks.replay cassettes/run.json.gz --record \
+        --keywords "data engineer" --public-id williamhgates
+
+then replay as often as needed, without network, optionally with latency and faults:
+
+    python -m api.utils.linkedin_api.benchmarks.replay cassettes/run.json.gz \
+        --latency-ms 80 --fault 429=0.05 --fault 999=0.01
+
+The scenario covers people search, profile, experiences, feed, job search and job
+details. Replays run with an unlimited pacer and no response cache, so the timings are
+the client's own (transport, pagination and parsing) plus the simulated latency.
+Injected faults are retried at once rather than after the backoff of the retry policy,
+and the retries and failed calls of every method are reported next to its timings.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from api.utils.linkedin_api.cassette import (
+    RECORD,
+    REPLAY,
+    ReplayConditions,
+    use_cassette,
+)
+from api.utils.linkedin_api.linkedin import Linkedin
+from api.utils.linkedin_api.pacing import Budget, RequestPacer
+from api.utils.linkedin_api.resilience import CircuitBreaker, RetryPolicy
+from api.utils.linkedin_api.utils.helpers import get_id_from_urn
+
+
+def _unpaced() -> RequestPacer:
+    return RequestPacer(
+        budgets={
+            name: Budget(per_minute=10**9, burst=10**9)
+            for name in RequestPacer.DEFAULT_BUDGETS
+        },
+        jitter=(0, 0),
+    )
+
+
+class ImmediateRetries(object):
+    """Retry policy of replays: the decisions of `policy`, without its waits
+
+    Backoff sleeps would dominate the timings of a replay with faults, so retries go
+    out at once and are counted in `retries` instead.
+    """
+
+    def __init__(self, policy: RetryPolicy = RetryPolicy()):
+        self.policy = policy
+        self.retries = 0
+
+    def delay(self, failure: str, attempt: int, method: str, retry_after=None):
+        if self.policy.delay(failure, attempt, method, retry_after) is None:
+            return None
+        self.retries += 1
+        return 0.0
+
+
+def scenario(linkedin: Linkedin, args) -> dict:
+    """Run every covered method once
+
+    Returns the seconds each method took, None if it failed, and the number of
+    retries it made, by method name.
+    """
+    results = {}
+
+    def timed(name, fn):
+        # A fault only fails the method it hit: a breaker opened by an injected
+        # challenge would otherwise fail every method after it
+        linkedin.breaker = CircuitBreaker(account=linkedin.username)
+        retries = linkedin.retry_policy.retries
+        started = time.perf_counter()
+        try:
+            result = fn()
+            elapsed = time.perf_counter() - started
+        except Exception as e:
+            linkedin.logger.info(f"{name} failed: {e!r}")
+            result, elapsed = None, None
+        results[name] = (elapsed, linkedin.retry_policy.retries - retries)
+        return result
+
+    timed(
+        "search_people",
+        lambda: linkedin.search_people(keywords=args.keywords, limit=args.limit),
+    )
+    profile = timed(
+        "get_profile", lambda: linkedin.get_profile(public_id=args.public_id)
+    )
+    if profile and profile.get("profile_id"):
+        timed(
+            "get_profile_experiences",
+            lambda: linkedin.get_profile_experiences(urn_id=profile["profile_id"]),
+        )
+    timed("get_feed_posts", lambda: linkedin.get_feed_posts(limit=args.limit))
+    jobs = timed(
+        "search_jobs",
+        lambda: linkedin.search_jobs(keywords=args.keywords, limit=args.limit),
+    )
+    if jobs:
+        job_id = get_id_from_urn(jobs[0]["entityUrn"])
+        timed("get_job", lambda: linkedin.get_job(job_id))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("cassette")
+    parser.add_argument("--record", action="store_true")
+    parser.add_argument("--keywords", default="software engineer")
+    parser.add_argument("--public-id", default="williamhgates")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--fault", action="append", default=[], help="STATUS=PROBABILITY, e.g. 429=0.05"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.record:
+        linkedin = Linkedin(
+            os.environ["LINKEDIN_USERNAME"],
+            os.environ["LINKEDIN_PASSWORD"],
+            response_cache=False,
+        )
+        adapter = use_cassette(linkedin.client, args.cassette, mode=RECORD)
+        scenario(linkedin, args)
+        adapter.cassette.save()
+        print(f"Recorded {len(adapter.cassette)} responses to {args.cassette}")
+        return
+
+    conditions = ReplayConditions(
+        latency=args.latency_ms / 1000.0,
+        faults={int(s): float(p) for s, p in (f.split("=") for f in args.fault)},
+        seed=args.seed,
+    )
+    linkedin = Linkedin(
+        "",
+        "",
+        authenticate=False,
+        pacer=_unpaced(),
+        response_cache=False,
+        retry_policy=ImmediateRetries(),
+    )
+    adapter = use_cassette(
+        linkedin.client, args.cassette, mode=REPLAY, conditions=conditions
+    )
+
+    runs = []
+    for _ in range(args.runs):
+        adapter.cassette.rewind()
+        runs.append(scenario(linkedin, args))
+
+    for name in dict.fromkeys(name for run in runs for name in run):
+        results = [run[name] for run in runs if name in run]
+        timings = [elapsed for elapsed, _ in results if elapsed is not None]
+        errors = len(results) - len(timings)
+        retries = sum(retries for _, retries in results)
+        summary = (
+            f"median {statistics.median(timings) * 1000:8.1f} ms"
+            f"  min {min(timings) * 1000:8.1f} ms"
+            if timings
+            else f"{'no successful run':>33}"
+        )
+        print(f"{name:>24}: {summary}  retries {retries:3d}  errors {errors:3d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Read-through cache of voyager GET responses.
+
+Profiles, companies and schools are fetched again and again for the same public IDs,
+and every fetch costs a paced round-trip. Responses are kept in a SQLite database,
+zlib compressed, with a TTL per endpoint family and least-recently-used eviction once
+the cache grows past `max_bytes`. Feeds, messaging and anything about the signed in
+user are never cached.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import zlib
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import requests
+
+import api.utils.linkedin_api.settings as settings
+from api.utils.linkedin_api.utils.sqlite import SqliteStore
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Checked in order, first match wins; a TTL of None means "never cache".
+DEFAULT_TTLS: Tuple[Tuple[str, Optional[int]], ...] = (
+    ("/feed/", None),
+    ("/identity/profileUpdatesV2", None),
+    ("/voyagerSocialDash", None),
+    ("/messaging/", None),
+    ("/relationships/", None),
+    ("/growth/", None),
+    ("/identity/wvmpCards", None),
+    ("voyagerSearchDashClusters", HOUR),
+    ("/voyagerJobsDashJobCards", HOUR),
+    ("/identity/profiles/", DAY),
+    ("voyagerIdentityDashProfileComponents", DAY),
+    ("/organization/", DAY),
+    ("/jobs/", 6 * HOUR),
+    ("/voyagerAssessmentsDash", 6 * HOUR),
+)
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+
+def as_requests_response(cached: CachedResponse, url: str) -> requests.Response:
+    """Rebuild a `requests.Response` from a cache entry"""
+    res = requests.Response()
+    res.status_code = cached.status_code
+    res.headers.update(cached.headers)
+    res._content = cached.content
+    res.encoding = "utf-8"
+    res.url = url
+    res.from_cache = True
+    return res
+
+
+class ResponseCache(SqliteStore):
+    """
+    Compressed, size bounded response cache.
+
+    :param path: Path of the SQLite database, defaults to settings.RESPONSE_CACHE_PATH
+    :type path: str, optional
+    :param max_bytes: Compressed size above which least recently used entries are evicted
+    :type max_bytes: int, optional
+    :param ttls: (URI marker, TTL in seconds) rules, first match wins. Defaults to DEFAULT_TTLS
+    :type ttls: tuple, optional
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            status_code INTEGER NOT NULL,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+    """
+
+    # Only the headers callers of `_fetch` look at
+    _KEPT_HEADERS = ("content-type", "content-encoding")
+
+    def __init__(
+        self,
+        path: str = settings.RESPONSE_CACHE_PATH,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttls: Tuple[Tuple[str, Optional[int]], ...] = DEFAULT_TTLS,
+    ):
+        super().__init__(path or settings.RESPONSE_CACHE_PATH)
+        self.max_bytes = max_bytes
+        self.ttls = ttls
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self._counters_lock = threading.Lock()
+
+    def _count(self, counter: str, n: int = 1):
+        with self._counters_lock:
+            self._counters[counter] += n
+
+    def ttl(self, uri: str) -> Optional[int]:
+        """Return the TTL in seconds of a URI, or None if it must not be cached"""
+        for marker, ttl in self.ttls:
+            if marker in uri:
+                return ttl
+        return None
+
+    @staticmethod
+    def key(account: str, url: str, params=None, accept: str = "") -> str:
+        """Cache key of a GET request for an account"""
+        if isinstance(params, dict):
+            params = sorted((k, str(v)) for k, v in params.items())
+        raw = json.dumps([account, url, params, accept or ""], default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def request_key(account: str, url: str, kwargs: Dict) -> str:
+        """Key of a `_fetch` request, from its URL, params and accept header"""
+        return ResponseCache.key(
+            account,
+            url,
+            kwargs.get("params"),
+            (kwargs.get("headers") or {}).get("accept", ""),
+        )
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        now = time.time()
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT status_code, headers, body FROM responses WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+        if not row:
+            self._count("misses")
+            return None
+
+        self._count("hits")
+        status_code, headers, body = row
+        return CachedResponse(status_code, json.loads(headers), zlib.decompress(body))
+
+    def set(self, key: str, ttl: int, status_code: int, headers, content: bytes):
+        headers = {
+            name: headers[name] for name in self._KEPT_HEADERS if name in headers
+        }
+        body = zlib.compress(content)
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    status_code,
+                    json.dumps(headers),
+                    body,
+                    len(body),
+                    now + ttl,
+                    now,
+                ),
+            )
+            self._evict(conn, now)
+        self._count("stores")
+
+    def _evict(self, conn, now: float):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        evicted = conn.execute(
+            "DELETE FROM responses WHERE expires_at <= ?", (now,)
+        ).rowcount
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            rows = conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"
+            )
+            keys = []
+            for key, size in rows:
+                keys.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+            evicted += len(keys)
+        if evicted:
+            self._count("evictions", evicted)
+
+    def clear(self):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/store/eviction counters of this process, plus entries and size on disk"""
+        with self.connection() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        with self._counters_lock:
+            return {**self._counters, "entries": entries, "bytes": size}
@@ -0,0 +1,370 @@
+"""
+Record/replay of voyager traffic.
+
+A cassette is a gzip compressed JSON file of (request, response) pairs. In record mode
+requests go to LinkedIn as usual and every response is appended to the cassette; in
+replay mode responses come from the cassette alone, optionally after some latency and
+with 429/999 answers injected at random, so the client can be benchmarked and tested
+without network access or an account.
+
+    linkedin = Linkedin("", "", authenticate=False, response_cache=False)
+    adapter = use_cassette(linkedin.client, "search.json.gz", mode=RECORD)
+    ...
+    adapter.cassette.save()
+
+Requests are matched on method and URL, with query parameters sorted. When the same
+request was recorded several times, the responses are replayed in recording order and
+the last one is repeated.
+"""
+
+import asyncio
+import base64
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+
+RECORD = "record"
+REPLAY = "replay"
+
+# Everything else (cookies above all) is left out of the cassette
+_KEPT_HEADERS = ("content-type", "retry-after")
+
+
+class CassetteMissError(requests.exceptions.ConnectionError):
+    """Raised in replay mode for a request the cassette has no response for"""
+
+    pass
+
+
+class RecordedResponse(NamedTuple):
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+
+
+def _normalize_url(url: str) -> str:
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ""))
+
+
+def _match_key(method: str, url: str) -> str:
+    return f"{method.upper()} {_normalize_url(url)}"
+
+
+def _encode_body(content: bytes) -> Tuple[str, str]:
+    try:
+        return content.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return base64.b64encode(content).decode("ascii"), "base64"
+
+
+def _decode_body(body: str, encoding: str) -> bytes:
+    if encoding == "base64":
+        return base64.b64decode(body)
+    return body.encode("utf-8")
+
+
+class Cassette(object):
+    """
+    Recorded interactions of one session, loaded from / saved to `path`.
+
+    :param path: Path of the gzip compressed cassette file
+    :type path: str
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._interactions: Dict[str, List[RecordedResponse]] = defaultdict(list)
+        self._played: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return sum(len(responses) for responses in self._interactions.values())
+
+    def items(self) -> Iterator[Tuple[str, RecordedResponse]]:
+        """Recorded (request, response) pairs, requests keyed as `METHOD url`"""
+        with self._lock:
+            interactions = [
+                (key, response)
+                for key, responses in self._interactions.items()
+                for response in responses
+            ]
+        return iter(interactions)
+
+    def load(self):
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        with self._lock:
+            self._interactions.clear()
+            self._played.clear()
+            for item in data["interactions"]:
+                self._interactions[item["request"]].append(
+                    RecordedResponse(
+                        item["status_code"],
+                        item["headers"],
+                        _decode_body(item["body"], item["encoding"]),
+                    )
+                )
+
+    def save(self, path: Optional[str] = None):
+        interactions = []
+        with self._lock:
+            for key, responses in self._interactions.items():
+                for response in responses:
+                    body, encoding = _encode_body(response.content)
+                    interactions.append(
+                        {
+                            "request": key,
+                            "status_code": response.status_code,
+                            "headers": response.headers,
+                            "body": body,
+                            "encoding": encoding,
+                        }
+                    )
+
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": interactions}, f)
+
+    def record(self, method: str, url: str, status_code: int, headers, content: bytes):
+        headers = {name: headers[name] for name in _KEPT_HEADERS if name in headers}
+        with self._lock:
+            self._interactions[_match_key(method, url)].append(
+                RecordedResponse(status_code, headers, content)
+            )
+
+    def play(self, method: str, url: str) -> RecordedResponse:
+        key = _match_key(method, url)
+        with self._lock:
+            responses = self._interactions.get(key)
+            if not responses:
+                raise CassetteMissError(f"No recorded response for {key}")
+            index = min(self._played[key], len(responses) - 1)
+            self._played[key] += 1
+            return responses[index]
+
+    def rewind(self):
+        with self._lock:
+            self._played.clear()
+
+
+class ReplayConditions(object):
+    """
+    Network conditions applied to replayed responses.
+
+    :param latency: Seconds to wait per request, or a (min, max) range to draw from
+    :type latency: float or tuple, optional
+    :param faults: Probability of answering a request with a given status code instead, e.g. {429: 0.05, 999: 0.01}
+    :type faults: dict, optional
+    :param retry_after: Retry-After header of injected 429 responses, in seconds
+    :type retry_after: int, optional
+    :param seed: Seed of the random draws, for reproducible runs
+    :type seed: int, optional
+    """
+
+    def __init__(
+        self,
+        latency: Union[float, Tuple[float, float]] = 0.0,
+        faults: Optional[Dict[int, float]] = None,
+        retry_after: int = 1,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.faults = faults or {}
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+        return self.latency
+
+    def fault(self) -> Optional[RecordedResponse]:
+        """Return an injected error response, or None to serve the recorded one"""
+        if not self.faults:
+            return None
+        with self._lock:
+            draw = self._random.random()
+        for status_code, probability in self.faults.items():
+            if draw < probability:
+                headers = {"content-type": "application/json"}
+                if status_code == 429:
+                    headers["retry-after"] = str(self.retry_after)
+                # Shaped like voyager error bodies, so decoding them does not fail
+                body = json.dumps({"status": status_code, "message": "injected fault"})
+                return RecordedResponse(status_code, headers, body.encode("utf-8"))
+            draw -= probability
+        return None
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    `requests` transport adapter recording to or replaying from a cassette.
+
+    :param cassette: Cassette to record to or replay from
+    :type cassette: Cassette
+    :param mode: RECORD or REPLAY
+    :type mode: str
+    :param wrapped: Adapter sending the requests in record mode
+    :type wrapped: requests.adapters.BaseAdapter, optional
+    :param conditions: Latency and faults of replayed responses
+    :type conditions: ReplayConditions, optional
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = REPLAY,
+        wrapped: Optional[BaseAdapter] = None,
+        conditions: Optional[ReplayConditions] = None,
+    ):
+        super().__init__()
+        if mode == RECORD and wrapped is None:
+            raise ValueError("Recording needs the adapter that sends the requests")
+        self.cassette = cassette
+        self.mode = mode
+        self.wrapped = wrapped
+        self.conditions = conditions or ReplayConditions()
+
+    def send(self, request, **kwargs):
+        if self.mode == RECORD:
+            res = self.wrapped.send(request, **kwargs)
+            self.cassette.record(
+                request.method, request.url, res.status_code, res.headers, res.content
+            )
+            return res
+
+        delay = self.conditions.delay()
+        if delay:
+            time.sleep(delay)
+        recorded = self.conditions.fault() or self.cassette.play(
+            request.method, request.url
+        )
+
+        res = requests.Response()
+        res.status_code = recorded.status_code
+        res.headers.update(recorded.headers)
+        res._content = recorded.content
+        res.encoding = "utf-8"
+        res.url = request.url
+        res.request = request
+        res.connection = self
+        return res
+
+    def close(self):
+        if self.wrapped is not None:
+            self.wrapped.close()
+
+
+class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+    """`httpx` counterpart of `CassetteAdapter`, for `AsyncClient.session`"""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        mode: str = REPLAY,
+        wrapped: Optional[httpx.AsyncBaseTransport] = None,
+        conditions: Optional[ReplayConditions] = None,
+    ):
+        if mode == RECORD and wrapped is None:
+            raise ValueError("Recording needs the transport that sends the requests")
+        self.cassette = cassette
+        self.mode = mode
+        self.wrapped = wrapped
+        self.conditions = conditions or ReplayConditions()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if self.mode == RECORD:
+            res = await self.wrapped.handle_async_request(request)
+            content = await res.aread()
+            self.cassette.record(
+                request.method, url, res.status_code, res.headers, content
+            )
+            # the body was decoded on read, do not let the caller decode it again
+            headers = [
+                (name, value)
+                for name, value in res.headers.multi_items()
+                if name.lower() not in ("content-encoding", "content-length")
+            ]
+            return httpx.Response(
+                res.status_code, headers=headers, content=content, request=request
+            )
+
+        delay = self.conditions.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        recorded = self.conditions.fault() or self.cassette.play(request.method, url)
+        return httpx.Response(
+            recorded.status_code,
+            headers=recorded.headers,
+            content=recorded.content,
+            request=request,
+        )
+
+    async def aclose(self):
+        if self.wrapped is not None:
+            await self.wrapped.aclose()
+
+
+def use_cassette(
+    client,
+    path: str,
+    mode: str = REPLAY,
+    conditions: Optional[ReplayConditions] = None,
+):
+    """
+    Route every request of a `Client` or `AsyncClient` through a cassette.
+
+    :param client: Client (or AsyncClient) whose session to plug the cassette into
+    :param path: Path of the cassette file, loaded if it exists
+    :type path: str
+    :param mode: RECORD or REPLAY
+    :type mode: str, optional
+    :param conditions: Latency and faults of replayed responses
+    :type conditions: ReplayConditions, optional
+
+    :return: The mounted adapter (or transport); its `cassette` must be saved after recording
+    :rtype: CassetteAdapter or AsyncCassetteTransport
+    """
+    if mode not in (RECORD, REPLAY):
+        raise ValueError(f"Unknown cassette mode {mode!r}")
+    cassette = Cassette(path)
+    session = client.session
+
+    if isinstance(session, httpx.AsyncClient):
+        transport = AsyncCassetteTransport(
+            cassette, mode, wrapped=session._transport, conditions=conditions
+        )
+        # httpx only takes transports in its constructor; proxy mounts would bypass it
+        session._transport = transport
+        session._mounts = {}
+        return transport
+
+    adapter = CassetteAdapter(
+        cassette,
+        mode,
+        wrapped=session.get_adapter(client.LINKEDIN_BASE_URL),
+        conditions=conditions,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return adapter
@@ -0,0 +1,232 @@
+"""
+Durable checkpoints of paginated crawls.
+
+A 1,000 result search takes tens of minutes under pacing, and a worker recycle or a
+crash used to throw all of it away. With a `CheckpointStore`, the paginated methods
+of the clients commit every page as it arrives, together with the cursor of the next
+one, under a fingerprint of the method and its query. Running the same query again
+replays the committed pages and carries on from the cursor; the checkpoint is dropped
+once the crawl completes.
+
+A checkpoint has a single writer. A crawl leases its fingerprint before touching it,
+and a concurrent crawl of the same query, which would overwrite its cursor, runs
+without checkpointing instead. Leases end with the crawl, with the process holding
+them, or `lease_seconds` after their last commit.
+"""
+
+import os
+import time
+import uuid
+import zlib
+from typing import Any, List, NamedTuple, Optional
+
+import api.utils.linkedin_api.settings as settings
+from api.utils import json_codec
+from api.utils.linkedin_api.pagination import query_digest
+from api.utils.linkedin_api.utils.sqlite import SqliteStore
+
+
+class Checkpoint(NamedTuple):
+    """Pages committed so far by an interrupted crawl, and where it resumes"""
+
+    method: str
+    cursor: str
+    pages: List[List]
+    updated_at: float
+
+    @property
+    def complete(self) -> bool:
+        """Whether the last page was reached (no cursor to resume from)"""
+        return self.cursor == ""
+
+
+class CheckpointStore(SqliteStore):
+    """
+    SQLite store of crawl checkpoints, shared by the processes of one host.
+
+    :param path: Path of the SQLite database, defaults to settings.CHECKPOINT_PATH
+    :type path: str, optional
+    :param max_age: Seconds after its last page past which a checkpoint is stale and started over
+    :type max_age: int, optional
+    :param lease_seconds: Seconds after its last commit past which the lease of a crawl lapses
+    :type lease_seconds: int, optional
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            fingerprint TEXT PRIMARY KEY,
+            method TEXT NOT NULL,
+            cursor TEXT NOT NULL,
+            pages INTEGER NOT NULL,
+            updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS checkpoint_pages (
+            fingerprint TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            elements BLOB NOT NULL,
+            PRIMARY KEY (fingerprint, page)
+        );
+        CREATE TABLE IF NOT EXISTS checkpoint_leases (
+            fingerprint TEXT PRIMARY KEY,
+            owner TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str = settings.CHECKPOINT_PATH,
+        max_age: int = 7 * 24 * 60 * 60,
+        lease_seconds: int = 10 * 60,
+    ):
+        super().__init__(path or settings.CHECKPOINT_PATH)
+        self.max_age = max_age
+        self.lease_seconds = lease_seconds
+
+    @staticmethod
+    def fingerprint(method: str, query: Any) -> str:
+        """Fingerprint of a crawl, from the method name and its JSON-able query"""
+        return query_digest([method, query])
+
+    @staticmethod
+    def _owner_alive(owner: str) -> bool:
+        """Whether the process named by an owner token (`pid:nonce`) still runs"""
+        try:
+            os.kill(int(owner.split(":", 1)[0]), 0)
+        except ProcessLookupError:
+            return False
+        except (ValueError, OSError):
+            pass
+        return True
+
+    def acquire(self, fingerprint: str) -> Optional[str]:
+        """Lease the checkpoint of a crawl, returning the owner token to commit with
+
+        Returns None if another crawl of the same query holds the lease.
+        """
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute(
+                "SELECT owner, expires_at FROM checkpoint_leases WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+            if row and row[1] > now and self._owner_alive(row[0]):
+                return None
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_leases VALUES (?, ?, ?)",
+                (fingerprint, owner, now + self.lease_seconds),
+            )
+        return owner
+
+    def release(self, fingerprint: str, owner: str):
+        """End the lease taken by `acquire`, if `owner` still holds it"""
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM checkpoint_leases WHERE fingerprint = ? AND owner = ?",
+                (fingerprint, owner),
+            )
+
+    def load(self, fingerprint: str) -> Optional[Checkpoint]:
+        """Return the checkpoint of a crawl, or None if there is none or it is stale"""
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT method, cursor, updated_at FROM checkpoints WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+            if not row:
+                return None
+            method, cursor, updated_at = row
+            if updated_at + self.max_age <= time.time():
+                self.discard(fingerprint)
+                return None
+            rows = conn.execute(
+                "SELECT elements FROM checkpoint_pages WHERE fingerprint = ? ORDER BY page",
+                (fingerprint,),
+            ).fetchall()
+        pages = [json_codec.loads(zlib.decompress(elements)) for (elements,) in rows]
+        return Checkpoint(method, cursor, pages, updated_at)
+
+    def commit(
+        self,
+        fingerprint: str,
+        method: str,
+        cursor: str,
+        elements: List,
+        owner: Optional[str] = None,
+    ) -> bool:
+        """Append a page to the checkpoint of a crawl and move its cursor past it
+
+        With the `owner` token of `acquire`, the page is only committed while the
+        lease is still held, which it extends. Returns whether the page was committed.
+        """
+        blob = zlib.compress(json_codec.dumps(elements).encode("utf-8"))
+        with self.transaction() as conn:
+            if owner is not None:
+                renewed = conn.execute(
+                    "UPDATE checkpoint_leases SET expires_at = ? WHERE fingerprint = ? AND owner = ?",
+                    (time.time() + self.lease_seconds, fingerprint, owner),
+                ).rowcount
+                if not renewed:
+                    return False
+            row = conn.execute(
+                "SELECT pages FROM checkpoints WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            page = row[0] if row else 0
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoint_pages VALUES (?, ?, ?)",
+                (fingerprint, page, blob),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?)",
+                (fingerprint, method, cursor, page + 1, time.time()),
+            )
+        return True
+
+    def discard(self, fingerprint: str):
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM checkpoints WHERE fingerprint = ?", (fingerprint,)
+            )
+            conn.execute(
+                "DELETE FROM checkpoint_pages WHERE fingerprint = ?", (fingerprint,)
+            )
+
+    def prune(self) -> int:
+        """Drop stale checkpoints, returning how many there were"""
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM checkpoint_leases WHERE expires_at <= ?", (time.time(),)
+            )
+            stale = [
+                fingerprint
+                for (fingerprint,) in conn.execute(
+                    "SELECT fingerprint FROM checkpoints WHERE updated_at <= ?",
+                    (time.time() - self.max_age,),
+                )
+            ]
+            for fingerprint in stale:
+                conn.execute(
+                    "DELETE FROM checkpoints WHERE fingerprint = ?", (fingerprint,)
+                )
+                conn.execute(
+                    "DELETE FROM checkpoint_pages WHERE fingerprint = ?", (fingerprint,)
+                )
+        return len(stale)
+
+    def pending(self) -> List[dict]:
+        """Method, committed pages and age of every checkpoint, for status reports"""
+        now = time.time()
+        with self.connection() as conn:
+            rows = conn.execute(
+                "SELECT fingerprint, method, pages, updated_at FROM checkpoints ORDER BY updated_at"
+            ).fetchall()
+        return [
+            {
+                "fingerprint": fingerprint,
+                "method": method,
+                "pages": pages,
+                "age": now - updated_at,
+            }
+            for fingerprint, method, pages, updated_at in rows
+        ]
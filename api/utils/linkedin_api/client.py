@@ -2,7 +2,9 @@ import requests
 import logging
 from api.utils.linkedin_api.cookie_repository import CookieRepository
 from bs4 import BeautifulSoup, Tag
+from requests.adapters import HTTPAdapter
 from requests.cookies import RequestsCookieJar
+from typing import NamedTuple
 import json
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,78 @@ class UnauthorizedException(Exception):
     pass
 
 
+class ThrottledException(Exception):
+    """Raised when LinkedIn keeps answering 429 after the retries"""
+
+    def __init__(self, url: str = "", retry_after: float = None):
+        super().__init__(url, retry_after)
+        self.url = url
+        self.retry_after = retry_after
+
+
+class CircuitOpenException(Exception):
+    """Raised without sending the request while the circuit breaker of an account is open"""
+
+    def __init__(self, account: str = "", retry_at: float = 0.0):
+        super().__init__(account, retry_at)
+        self.account = account
+        self.retry_at = retry_at
+
+
+class TransportConfig(NamedTuple):
+    """
+    Connection pool settings shared by every request of a client.
+
+    `keepalive_expiry` and `http2` only apply to `AsyncClient`; `requests` keeps idle
+    connections open until the server closes them and has no HTTP/2 support.
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 20
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter applying a default (connect, read) timeout to requests that set none.
+    """
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or self.timeout, **kwargs)
+
+
+def parse_client_metadata(html: str) -> dict:
+    """
+    Parse the application instance metadata out of the LinkedIn homepage HTML.
+    """
+    metadata = {}
+    soup = BeautifulSoup(html, "lxml")
+
+    clientApplicationInstanceRaw = soup.find(
+        "meta", attrs={"name": "applicationInstance"}
+    )
+    if clientApplicationInstanceRaw and isinstance(clientApplicationInstanceRaw, Tag):
+        clientApplicationInstanceRaw = clientApplicationInstanceRaw.attrs.get(
+            "content", {}
+        )
+        clientApplicationInstance = json.loads(clientApplicationInstanceRaw)
+        metadata["clientApplicationInstance"] = clientApplicationInstance
+
+    clientPageInstanceIdRaw = soup.find("meta", attrs={"name": "clientPageInstanceId"})
+    if clientPageInstanceIdRaw and isinstance(clientPageInstanceIdRaw, Tag):
+        clientPageInstanceId = clientPageInstanceIdRaw.attrs.get("content", {})
+        metadata["clientPageInstanceId"] = clientPageInstanceId
+
+    return metadata
+
+
 class Client(object):
     """
     Class to act as a client for the Linkedin API.
@@ -49,9 +123,22 @@ class Client(object):
     }
 
     def __init__(
-        self, *, debug=False, refresh_cookies=False, proxies={}, cookies_dir: str = ""
+        self,
+        *,
+        debug=False,
+        refresh_cookies=False,
+        proxies={},
+        cookies_dir: str = "",
+        transport: TransportConfig = TransportConfig(),
     ):
         self.session = requests.session()
+        adapter = TimeoutHTTPAdapter(
+            pool_connections=transport.pool_connections,
+            pool_maxsize=transport.pool_maxsize,
+            timeout=(transport.connect_timeout, transport.read_timeout),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         self.session.proxies.update(proxies)
         self.session.headers.update(Client.REQUEST_HEADERS)
         self.proxies = proxies
@@ -62,16 +149,42 @@ class Client(object):
 
         logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
 
+    def worker_session(self) -> requests.Session:
+        """
+        Return a new session sending like `self.session`, for use by a worker thread.
+
+        `requests.Session` is not thread-safe. The copy has its own headers, cookies
+        and proxies, and shares the mounted adapters, whose connection pools are.
+        """
+        session = requests.session()
+        session.headers = self.session.headers.copy()
+        session.cookies = self.session.cookies.copy()
+        session.proxies = dict(self.session.proxies)
+        for prefix, adapter in self.session.adapters.items():
+            session.mount(prefix, adapter)
+        return session
+
+    def _auth_headers(self) -> dict:
+        """
+        Return the headers of authentication requests.
+
+        These go through `self.session` to reuse its connections, but must not carry the
+        session's voyager headers, so those are unset (`requests` drops None headers).
+        """
+        headers = {key: None for key in Client.REQUEST_HEADERS}
+        headers["csrf-token"] = None
+        headers.update(Client.AUTH_REQUEST_HEADERS)
+        return headers
+
     def _request_session_cookies(self):
         """
         Return a new set of session cookies as given by Linkedin.
         """
         self.logger.debug("Requesting new cookies.")
 
-        res = requests.get(
+        res = self.session.get(
             f"{Client.LINKEDIN_BASE_URL}/uas/authenticate",
-            headers=Client.AUTH_REQUEST_HEADERS,
-            proxies=self.proxies,
+            headers=self._auth_headers(),
         )
         return res.cookies
 
@@ -107,33 +220,12 @@ class Client(object):
 
         Store this data in self.metadata
         """
-        res = requests.get(
+        res = self.session.get(
             f"{Client.LINKEDIN_BASE_URL}",
-            cookies=self.session.cookies,
-            headers=Client.AUTH_REQUEST_HEADERS,
-            proxies=self.proxies,
+            headers=self._auth_headers(),
         )
 
-        soup = BeautifulSoup(res.text, "lxml")
-
-        clientApplicationInstanceRaw = soup.find(
-            "meta", attrs={"name": "applicationInstance"}
-        )
-        if clientApplicationInstanceRaw and isinstance(
-            clientApplicationInstanceRaw, Tag
-        ):
-            clientApplicationInstanceRaw = clientApplicationInstanceRaw.attrs.get(
-                "content", {}
-            )
-            clientApplicationInstance = json.loads(clientApplicationInstanceRaw)
-            self.metadata["clientApplicationInstance"] = clientApplicationInstance
-
-        clientPageInstanceIdRaw = soup.find(
-            "meta", attrs={"name": "clientPageInstanceId"}
-        )
-        if clientPageInstanceIdRaw and isinstance(clientPageInstanceIdRaw, Tag):
-            clientPageInstanceId = clientPageInstanceIdRaw.attrs.get("content", {})
-            self.metadata["clientPageInstanceId"] = clientPageInstanceId
+        self.metadata.update(parse_client_metadata(res.text))
 
     def _do_authentication_request(self, username: str, password: str):
         """
@@ -149,12 +241,10 @@ class Client(object):
             "JSESSIONID": self.session.cookies["JSESSIONID"],
         }
 
-        res = requests.post(
+        res = self.session.post(
             f"{Client.LINKEDIN_BASE_URL}/uas/authenticate",
             data=payload,
-            cookies=self.session.cookies,
-            headers=Client.AUTH_REQUEST_HEADERS,
-            proxies=self.proxies,
+            headers=self._auth_headers(),
         )
 
         data = res.json()
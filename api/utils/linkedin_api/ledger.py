@@ -0,0 +1,96 @@
+"""
+Rate budget ledger shared by every process on a host.
+
+Gunicorn runs one `Linkedin` instance per worker; with in-memory buckets N workers
+would spend N times the budget of an account. The ledger keeps the token buckets in
+a SQLite database in WAL mode, keyed by account and endpoint class, so all workers
+draw from the same budget.
+"""
+
+import time
+
+import api.utils.linkedin_api.settings as settings
+from api.utils.linkedin_api.pacing import Budget
+from api.utils.linkedin_api.utils.sqlite import SqliteStore
+
+
+class SharedRateLedger(SqliteStore):
+    """
+    SQLite backed token buckets, keyed by account and endpoint class.
+
+    :param path: Path of the SQLite database, defaults to settings.RATE_LEDGER_PATH
+    :type path: str, optional
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS buckets (
+            account TEXT NOT NULL,
+            endpoint_class TEXT NOT NULL,
+            tokens REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (account, endpoint_class)
+        );
+    """
+
+    def __init__(self, path: str = settings.RATE_LEDGER_PATH):
+        super().__init__(path or settings.RATE_LEDGER_PATH)
+
+    def _update(self, account: str, endpoint_class: str, budget: Budget, tokens: float):
+        """Refill the bucket, take `tokens` from it and return the new balance"""
+        rate = budget.per_minute / 60.0
+        with self.transaction() as conn:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE account = ? AND endpoint_class = ?",
+                (account, endpoint_class),
+            ).fetchone()
+            balance, updated_at = row if row else (float(budget.burst), now)
+            elapsed = max(0.0, now - updated_at)
+            balance = min(budget.burst, balance + elapsed * rate) - tokens
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (account, endpoint_class, tokens, updated_at) VALUES (?, ?, ?, ?)",
+                (account, endpoint_class, balance, now),
+            )
+        return balance
+
+    def reserve(
+        self, account: str, endpoint_class: str, budget: Budget, tokens: float = 1
+    ) -> float:
+        """Take `tokens` from the shared bucket and return the delay until they are available"""
+        balance = self._update(account, endpoint_class, budget, tokens)
+        if balance >= 0:
+            return 0.0
+        return -balance / (budget.per_minute / 60.0)
+
+    def available(self, account: str, endpoint_class: str, budget: Budget) -> float:
+        """Tokens currently available in the shared bucket"""
+        return self._update(account, endpoint_class, budget, 0)
+
+    def bucket(self, account: str, endpoint_class: str, budget: Budget):
+        """Return the shared token bucket of an account and endpoint class"""
+        return SharedTokenBucket(self, account, endpoint_class, budget)
+
+
+class SharedTokenBucket(object):
+    """
+    Token bucket of one account and endpoint class, stored in a `SharedRateLedger`.
+
+    Drop-in replacement for `pacing.TokenBucket`.
+    """
+
+    def __init__(
+        self, ledger: SharedRateLedger, account: str, endpoint_class: str, budget: Budget
+    ):
+        self.ledger = ledger
+        self.account = account
+        self.endpoint_class = endpoint_class
+        self.budget = budget
+
+    def reserve(self, tokens: float = 1) -> float:
+        return self.ledger.reserve(
+            self.account, self.endpoint_class, self.budget, tokens
+        )
+
+    @property
+    def available(self) -> float:
+        return self.ledger.available(self.account, self.endpoint_class, self.budget)
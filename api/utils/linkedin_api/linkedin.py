@@ -5,27 +5,148 @@ Provides linkedin api-related code
 import json
 import logging
 import random
+import threading
 import uuid
-import re
-from operator import itemgetter
-from time import sleep
-from urllib.parse import urlencode, quote
-from typing import Dict, Union, Optional, List, Literal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from time import perf_counter, sleep
+from urllib.parse import urlencode
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    FrozenSet,
+    Iterator,
+    Union,
+    Optional,
+    List,
+    Literal,
+    Tuple,
+)
 from logging import getLogger
 
-from api.utils.linkedin_api.client import Client
+import requests
+
+from api.utils import json_codec
+from api.utils.linkedin_api.cache import ResponseCache, as_requests_response
+from api.utils.linkedin_api.checkpoint import CheckpointStore
+from api.utils.linkedin_api.client import (
+    ChallengeException,
+    CircuitOpenException,
+    Client,
+    ThrottledException,
+    TransportConfig,
+    UnauthorizedException,
+)
+from api.utils.linkedin_api.ledger import SharedRateLedger
+from api.utils.linkedin_api.metrics import (
+    DECODE_SECONDS,
+    METRICS,
+    PARSE_SECONDS,
+    RequestMetrics,
+    endpoint_name,
+)
+from api.utils.linkedin_api.models import (
+    PROFILE_SECTION_NAMES,
+    TOP_CARD,
+    LazyProfile,
+    Profile,
+)
+from api.utils.linkedin_api.pacing import RequestPacer, classify_endpoint
+from api.utils.linkedin_api.pagination import (
+    Page,
+    decode_cursor,
+    encode_cursor,
+    query_digest,
+)
+from api.utils.linkedin_api.resilience import (
+    SERVER_ERROR,
+    CircuitBreaker,
+    RetryPolicy,
+    classify_status,
+    parse_retry_after,
+    raise_for_failure,
+)
+from api.utils.linkedin_api.singleflight import SingleFlight
+from api.utils.linkedin_api.watermark import HighWaterMarkStore, newest_update
+from api.utils.linkedin_api.utils.normalized import EntityStore, NormalizedPayload
 from api.utils.linkedin_api.utils.helpers import (
     get_id_from_urn,
-    get_urn_from_raw_update,
+    get_profile_id,
+    get_universal_name,
     get_list_posts_sorted_without_promoted,
     parse_list_raw_posts,
     parse_list_raw_urns,
     generate_trackingId,
     generate_trackingId_as_charString,
+    build_search_params,
+    build_search_uri,
+    parse_search_clusters,
+    parse_search_total,
+    build_people_search_params,
+    parse_people_search_results,
+    build_company_search_params,
+    parse_company_search_results,
+    build_job_search_query,
+    parse_job_postings,
+    count_job_cards,
+    parse_contact_info,
+    parse_profile_skills,
+    parse_profile_view,
+    build_profile_experiences_uri,
+    parse_profile_experiences,
 )
 
 logger = logging.getLogger("API." + __name__)
 
+# Failures of the account rather than of one lookup: bulk methods stop on these
+ACCOUNT_ERRORS = (
+    ChallengeException,
+    UnauthorizedException,
+    ThrottledException,
+    CircuitOpenException,
+)
+
+# Lookups get_profiles() can add to every profile, by the key they are stored under
+PROFILE_EXTRAS = ("contact_info", "skills", "experiences")
+
+# Path under /identity/profiles/{id} serving each profile section on its own
+PROFILE_SECTION_ENDPOINTS = {
+    TOP_CARD: "",
+    "experience": "/positions",
+    "education": "/educations",
+    "skills": "/skills",
+    "certifications": "/certifications",
+    "languages": "/languages",
+    "publications": "/publications",
+    "volunteer": "/volunteerExperiences",
+    "honors": "/honors",
+    "projects": "/projects",
+}
+
+
+def _check_profile_extras(extras: Optional[List[str]]) -> List[str]:
+    unknown = set(extras or ()) - set(PROFILE_EXTRAS)
+    if unknown:
+        raise ValueError(
+            f"Unknown profile extras {sorted(unknown)}, expected some of {PROFILE_EXTRAS}"
+        )
+    return list(dict.fromkeys(extras or ()))
+
+
+def _check_profile_sections(sections: Collection[str]) -> FrozenSet[str]:
+    unknown = set(sections) - set(PROFILE_SECTION_NAMES)
+    if not sections:
+        raise ValueError(
+            f"No profile sections, expected some of {PROFILE_SECTION_NAMES}"
+        )
+    if unknown:
+        raise ValueError(
+            f"Unknown profile sections {sorted(unknown)}, expected some of {PROFILE_SECTION_NAMES}"
+        )
+    return frozenset(sections)
+
 
 def default_evade():
     """
@@ -43,11 +164,31 @@ class Linkedin(object):
     :type username: str
     :param password: Password of LinkedIn account.
     :type password: str
+    :param pacer: Request pacer shared by all requests of this instance. Defaults to a RequestPacer
+        backed by the host-wide SharedRateLedger of `username`, so all workers share one budget
+    :type pacer: RequestPacer, optional
+    :param transport: Connection pool size and timeouts of the underlying client
+    :type transport: TransportConfig, optional
+    :param response_cache: Cache for GET responses. True uses the default on-disk ResponseCache, False disables caching
+    :type response_cache: ResponseCache or bool, optional
+    :param retry_policy: Backoff of requests answered with 429 or a server error
+    :type retry_policy: RetryPolicy, optional
+    :param breaker: Circuit breaker of the account. Defaults to a CircuitBreaker of `username`
+    :type breaker: CircuitBreaker, optional
+    :param metrics: Where to record per endpoint timings, sizes and statuses. Defaults to the process wide `metrics.METRICS`
+    :type metrics: RequestMetrics, optional
+    :param checkpoints: Store committing the pages of paginated methods, so an interrupted crawl resumes where it stopped. True uses the default on-disk CheckpointStore, False (the default) disables checkpoints
+    :type checkpoints: CheckpointStore or bool, optional
+    :param watermarks: Store of the newest update of every crawled company and profile feed, so update iterators stop at the first update seen by the last complete crawl. True uses the default on-disk HighWaterMarkStore, False (the default) always crawls up to `max_results`
+    :type watermarks: HighWaterMarkStore or bool, optional
+    :param entities: Store of the entities of normalized responses by URN across calls, so that references to entities sent with an earlier response (a company, a job posting, a feed update) still resolve. True uses an EntityStore of its own, False (the default) resolves references within each response only
+    :type entities: EntityStore or bool, optional
     """
 
     _MAX_POST_COUNT = 100  # max seems to be 100 posts per page
     _MAX_UPDATE_COUNT = 100  # max seems to be 100
     _MAX_SEARCH_COUNT = 49  # max seems to be 49, and min seems to be 2
+    _SEARCH_PAGE_SIZE = 10  # the graphql search has no count: pages are 10 results
     _MAX_REPEATED_REQUESTS = (
         200  # VERY conservative max requests count to avoid rate-limit
     )
@@ -63,16 +204,44 @@ class Linkedin(object):
         proxies={},
         cookies=None,
         cookies_dir: str = "",
+        pacer: Optional[RequestPacer] = None,
+        transport: TransportConfig = TransportConfig(),
+        response_cache: Union[ResponseCache, bool] = True,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        breaker: Optional[CircuitBreaker] = None,
+        metrics: Optional[RequestMetrics] = None,
+        checkpoints: Union[CheckpointStore, bool] = False,
+        watermarks: Union[HighWaterMarkStore, bool] = False,
+        entities: Union[EntityStore, bool] = False,
     ):
         """Constructor method"""
+        self.pacer = pacer or RequestPacer(ledger=SharedRateLedger(), account=username)
         self.client = Client(
             refresh_cookies=refresh_cookies,
             debug=debug,
             proxies=proxies,
             cookies_dir=cookies_dir,
+            transport=transport,
         )
 
         self.logger = logger
+        self.username = username
+        self.response_cache = (
+            ResponseCache() if response_cache is True else response_cache or None
+        )
+        self._in_flight = SingleFlight()
+        self.retry_policy = retry_policy
+        self.breaker = breaker or CircuitBreaker(account=username)
+        self.metrics = metrics or METRICS
+        self.checkpoints = (
+            CheckpointStore() if checkpoints is True else checkpoints or None
+        )
+        self.watermarks = (
+            HighWaterMarkStore() if watermarks is True else watermarks or None
+        )
+        self.entities = EntityStore() if entities is True else entities or None
+        # Per thread override of `self.client.session`, see _worker_executor()
+        self._local = threading.local()
 
         if authenticate:
             if cookies:
@@ -82,12 +251,107 @@ class Linkedin(object):
             else:
                 self.client.authenticate(username, password)
 
-    def _fetch(self, uri: str, evade=default_evade, base_request=False, **kwargs):
-        """GET request to Linkedin API"""
-        evade()
+    def _fetch(self, uri: str, evade=None, base_request=False, cache=True, **kwargs):
+        """GET request to Linkedin API
 
+        Paced by `self.pacer` unless an `evade` callable is given. Served from
+        `self.response_cache` when the endpoint has a TTL, unless `cache` is False.
+        Concurrent identical requests share a single network call.
+        """
         url = f"{self.client.API_BASE_URL if not base_request else self.client.LINKEDIN_BASE_URL}{uri}"
-        return self.client.session.get(url, **kwargs)
+        key = ResponseCache.request_key(self.username, url, kwargs)
+
+        return self._in_flight.do(
+            key, lambda: self._fetch_once(uri, url, key, evade, cache, kwargs)
+        )
+
+    def _fetch_once(self, uri: str, url: str, key: str, evade, cache: bool, kwargs):
+        ttl = None
+        if cache and self.response_cache is not None:
+            ttl = self.response_cache.ttl(uri)
+        if ttl:
+            cached = self.response_cache.get(key)
+            if cached:
+                return as_requests_response(cached, url)
+
+        res = self._send("GET", uri, url, evade, **kwargs)
+
+        if ttl and res.status_code == 200:
+            self.response_cache.set(key, ttl, res.status_code, res.headers, res.content)
+        return res
+
+    def _send(self, method: str, uri: str, url: str, evade=None, **kwargs):
+        """Send a request, retrying throttled and failed ones as `self.retry_policy` allows
+
+        Raises CircuitOpenException without sending anything while the circuit breaker
+        of the account is open, and ThrottledException, ChallengeException or
+        UnauthorizedException once a failure is not worth retrying. Server errors that
+        outlast the retries are returned as is.
+        """
+        endpoint = endpoint_name(uri)
+        attempt = 0
+        while True:
+            self.breaker.before_request()
+            started = perf_counter()
+            self._evade(uri, evade)
+            sent = perf_counter()
+            try:
+                session = getattr(self._local, "session", None) or self.client.session
+                res = session.request(method, url, **kwargs)
+            except requests.RequestException:
+                self.breaker.record_failure(SERVER_ERROR)
+                raise
+
+            self.metrics.observe_response(
+                endpoint,
+                res.status_code,
+                sent - started,
+                perf_counter() - sent,
+                len(res.content),
+            )
+
+            failure = classify_status(res.status_code)
+            if failure is None:
+                self.breaker.record_success()
+                return res
+
+            self.breaker.record_failure(failure)
+            retry_after = parse_retry_after(res.headers.get("retry-after"))
+            delay = self.retry_policy.delay(failure, attempt, method, retry_after)
+            if delay is None:
+                raise_for_failure(failure, url, retry_after)
+                return res
+
+            self.logger.warning(
+                f"{method} {uri} answered {res.status_code}, retrying in {delay:.1f}s"
+            )
+            sleep(delay)
+            attempt += 1
+
+    def _worker_executor(self, workers: int) -> ThreadPoolExecutor:
+        """A thread pool whose threads each send through a session of their own"""
+
+        def use_worker_session():
+            self._local.session = self.client.worker_session()
+
+        return ThreadPoolExecutor(max_workers=workers, initializer=use_worker_session)
+
+    def _decode(self, res):
+        """Decode the JSON body of a response, timing it against its endpoint"""
+        with self.metrics.timer(endpoint_name(str(res.url)), DECODE_SECONDS):
+            return json_codec.loads(res.content)
+
+    def _parse(self, res, parser, *args):
+        """Call `parser(*args)`, timing it against the endpoint of `res`"""
+        with self.metrics.timer(endpoint_name(str(res.url)), PARSE_SECONDS):
+            return parser(*args)
+
+    def _evade(self, uri: str, evade=None):
+        """Wait until the request to `uri` may be sent"""
+        if evade is not None:
+            evade()
+        else:
+            self.pacer.acquire(classify_endpoint(uri))
 
     def _cookies(self):
         """Return client cookies"""
@@ -97,12 +361,68 @@ class Linkedin(object):
         """Return client cookies"""
         return self.client.REQUEST_HEADERS
 
-    def _post(self, uri: str, evade=default_evade, base_request=False, **kwargs):
-        """POST request to Linkedin API"""
-        evade()
+    def _post(self, uri: str, evade=None, base_request=False, **kwargs):
+        """POST request to Linkedin API
 
+        Paced by `self.pacer` unless an `evade` callable is given, and retried as `_send` does.
+        """
         url = f"{self.client.API_BASE_URL if not base_request else self.client.LINKEDIN_BASE_URL}{uri}"
-        return self.client.session.post(url, **kwargs)
+        return self._send("POST", uri, url, evade, **kwargs)
+
+    def _iter_token_pages(
+        self,
+        kind: str,
+        target: str,
+        url: str,
+        url_params: Dict,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Page]:
+        """Page through a feed paginated by `paginationToken`, resuming at `cursor`
+
+        `url_params` are those of the first page; the following pages ask for
+        `_MAX_POST_COUNT` elements at the next offset, with the token of the previous
+        response. Stops after the last page, at an empty page, once `limit` elements
+        (counted from the start of the feed) were returned, or when a page comes back
+        with an error status.
+        """
+        url_params = dict(url_params)
+        fetched = 0
+        if cursor:
+            start, token = decode_cursor(cursor, kind, target)
+            url_params.update(
+                start=start, count=self._MAX_POST_COUNT, paginationToken=token
+            )
+            # pages are full up to the cursor, so `limit` keeps counting from the start
+            fetched = start
+
+        while limit is None or fetched < limit:
+            res = self._fetch(url, params=url_params)
+            data = self._decode(res)
+            if not data:
+                return
+            if "status" in data and data["status"] != 200:
+                self.logger.info("request failed: {}".format(data["status"]))
+                return
+            # When the offset goes past the last element, the API keeps returning
+            # empty pages rather than an empty pagination token
+            if len(data["elements"]) == 0:
+                return
+
+            fetched += len(data["elements"])
+            token = data["metadata"]["paginationToken"]
+            url_params.update(
+                start=url_params["start"] + self._MAX_POST_COUNT,
+                count=self._MAX_POST_COUNT,
+                paginationToken=token,
+            )
+            if token == "":
+                yield Page(data["elements"], "")
+                return
+            yield Page(
+                data["elements"],
+                encode_cursor(kind, target, url_params["start"], token),
+            )
 
     def get_profile_posts(
         self,
@@ -122,8 +442,40 @@ class Linkedin(object):
         :return: List of posts
         :rtype: list
         """
+        posts = []
+        for elements in self._checkpointed(
+            "profile_posts",
+            {"public_id": public_id, "urn_id": urn_id, "post_count": post_count},
+            lambda cursor: self.iter_profile_posts(
+                public_id=public_id, urn_id=urn_id, post_count=post_count, cursor=cursor
+            ),
+        ):
+            posts.extend(elements)
+        return posts
+
+    def iter_profile_posts(
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        post_count: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Page]:
+        """
+        iter_profile_posts: Get profile posts, page by page as they arrive
+
+        :param public_id: LinkedIn public ID for a profile
+        :type public_id: str, optional
+        :param urn_id: LinkedIn URN ID for a profile
+        :type urn_id: str, optional
+        :param post_count: Stop once this many posts were returned, defaults to all of them
+        :type post_count: int, optional
+        :param cursor: Cursor of the last page handled by an earlier crawl, to resume after it
+        :type cursor: str, optional
+        :return: Generator of pages of posts, each with the cursor of the next page ("" after the last one)
+        :rtype: generator
+        """
         url_params = {
-            "count": min(post_count, self._MAX_POST_COUNT),
+            "count": min(post_count or self._MAX_POST_COUNT, self._MAX_POST_COUNT),
             "start": 0,
             "q": "memberShareFeed",
             "moduleKey": "member-shares:phone",
@@ -138,22 +490,9 @@ class Linkedin(object):
             )
         url_params["profileUrn"] = profile_urn
         url = f"/identity/profileUpdatesV2"
-        res = self._fetch(url, params=url_params)
-        data = res.json()
-        if data and "status" in data and data["status"] != 200:
-            self.logger.info("request failed: {}".format(data["message"]))
-            return [{}]
-        while data and data["metadata"]["paginationToken"] != "":
-            if len(data["elements"]) >= post_count:
-                break
-            pagination_token = data["metadata"]["paginationToken"]
-            url_params["start"] = url_params["start"] + self._MAX_POST_COUNT
-            url_params["paginationToken"] = pagination_token
-            res = self._fetch(url, params=url_params)
-            data["metadata"] = res.json()["metadata"]
-            data["elements"] = data["elements"] + res.json()["elements"]
-            data["paging"] = res.json()["paging"]
-        return data["elements"]
+        yield from self._iter_token_pages(
+            "profile_posts", profile_urn, url, url_params, post_count, cursor
+        )
 
     def get_post_comments(self, post_urn: str, comment_count=100) -> List:
         """
@@ -166,42 +505,48 @@ class Linkedin(object):
         :return: List of post comments
         :rtype: list
         """
+        comments = []
+        for elements in self._checkpointed(
+            "post_comments",
+            {"post_urn": post_urn, "comment_count": comment_count},
+            lambda cursor: self.iter_post_comments(
+                post_urn, comment_count=comment_count, cursor=cursor
+            ),
+        ):
+            comments.extend(elements)
+        return comments
+
+    def iter_post_comments(
+        self,
+        post_urn: str,
+        comment_count: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Page]:
+        """
+        iter_post_comments: Get post comments, page by page as they arrive
+
+        :param post_urn: Post URN
+        :type post_urn: str
+        :param comment_count: Stop once this many comments were returned, defaults to all of them
+        :type comment_count: int, optional
+        :param cursor: Cursor of the last page handled by an earlier crawl, to resume after it
+        :type cursor: str, optional
+        :return: Generator of pages of comments, each with the cursor of the next page ("" after the last one)
+        :rtype: generator
+        """
         url_params = {
-            "count": min(comment_count, self._MAX_POST_COUNT),
+            "count": min(comment_count or self._MAX_POST_COUNT, self._MAX_POST_COUNT),
             "start": 0,
             "q": "comments",
             "sortOrder": "RELEVANCE",
         }
         url = f"/feed/comments"
         url_params["updateId"] = "activity:" + post_urn
-        res = self._fetch(url, params=url_params)
-        data = res.json()
-        if data and "status" in data and data["status"] != 200:
-            self.logger.info("request failed: {}".format(data["status"]))
-            return [{}]
-        while data and data["metadata"]["paginationToken"] != "":
-            if len(data["elements"]) >= comment_count:
-                break
-            pagination_token = data["metadata"]["paginationToken"]
-            url_params["start"] = url_params["start"] + self._MAX_POST_COUNT
-            url_params["count"] = self._MAX_POST_COUNT
-            url_params["paginationToken"] = pagination_token
-            res = self._fetch(url, params=url_params)
-            if res.json() and "status" in res.json() and res.json()["status"] != 200:
-                self.logger.info("request failed: {}".format(data["status"]))
-                return [{}]
-            data["metadata"] = res.json()["metadata"]
-            """ When the number of comments exceed total available 
-            comments, the api starts returning an empty list of elements"""
-            if res.json()["elements"] and len(res.json()["elements"]) == 0:
-                break
-            if data["elements"] and len(res.json()["elements"]) == 0:
-                break
-            data["elements"] = data["elements"] + res.json()["elements"]
-            data["paging"] = res.json()["paging"]
-        return data["elements"]
+        return self._iter_token_pages(
+            "post_comments", post_urn, url, url_params, comment_count, cursor
+        )
 
-    def search(self, params: Dict, limit=-1, offset=0) -> List:
+    def search(self, params: Dict, limit=-1, offset=0, prefetch=0) -> List:
         """Perform a LinkedIn search.
 
         :param params: Search parameters (see code)
@@ -210,98 +555,154 @@ class Linkedin(object):
         :type limit: int, optional
         :param offset: Index to start searching from
         :type offset: int, optional
+        :param prefetch: Number of pages to fetch concurrently once the first page gives the total, defaults to 0 (one page at a time)
+        :type prefetch: int, optional
 
 
         :return: List of search results
         :rtype: list
         """
+        return [
+            result
+            for page in self._search_results(params, limit, offset, prefetch)
+            for result in page
+        ]
+
+    def iter_search(
+        self, params: Dict, limit=-1, offset=0, prefetch=0
+    ) -> Iterator[Dict]:
+        """Perform a LinkedIn search, yielding results as their page arrives.
+
+        Only the current page is held in memory, and no further page is fetched once
+        the caller stops iterating. See `search` for the parameters.
+
+        :return: Generator of search results
+        :rtype: generator
+        """
+        for page in self._iter_search_pages(
+            params, limit=limit, offset=offset, prefetch=prefetch
+        ):
+            yield from page.elements
+
+    def _search_results(
+        self, params: Dict, limit=-1, offset=0, prefetch=0
+    ) -> Iterator[List]:
+        """Yield the raw result pages of a search, checkpointed if `self.checkpoints` is set"""
+        return self._checkpointed(
+            "search",
+            {"params": params, "limit": limit, "offset": offset},
+            lambda cursor: self._iter_search_pages(
+                params, limit=limit, offset=offset, prefetch=prefetch, cursor=cursor
+            ),
+        )
+
+    def _search_page(self, params: Dict, count: int, start: int):
+        """Fetch one page of a LinkedIn search, returning the response and its results"""
+        res = self._fetch(
+            build_search_uri(build_search_params(params, count=count, start=start))
+        )
+        data = self._decode(res)
+        return data, self._parse(res, parse_search_clusters, data)
+
+    def _iter_search_pages(
+        self, params: Dict, limit=-1, offset=0, prefetch=0, cursor=None
+    ) -> Iterator[Page]:
+        """Yield the raw results of a LinkedIn search, one page at a time
+
+        Each page comes with the cursor of the next offset, from which the search
+        resumes when passed back as `cursor`. With `prefetch`, the offsets of the remaining pages are worked out from the
+        `paging.total` of the first page, and up to `prefetch` of them are fetched at
+        once. Every request still goes through the pacer, so the account's search
+        budget bounds how many actually run in parallel.
+        """
         count = Linkedin._MAX_SEARCH_COUNT
         if limit is None:
             limit = -1
 
-        results = []
+        target = query_digest(params)
+        fetched = (
+            decode_cursor(cursor, "search", target).start - offset if cursor else 0
+        )
         while True:
             # when we're close to the limit, only fetch what we need to
-            if limit > -1 and limit - len(results) < count:
-                count = limit - len(results)
-            default_params = {
-                "count": str(count),
-                "filters": "List()",
-                "origin": "GLOBAL_SEARCH_HEADER",
-                "q": "all",
-                "start": len(results) + offset,
-                "queryContext": "List(spellCorrectionEnabled->true,relatedSearchesEnabled->true,kcardTypes->PROFILE|COMPANY)",
-                "includeWebMetadata": "true",
-            }
-            default_params.update(params)
-
-            keywords = (
-                f"keywords:{default_params['keywords']},"
-                if "keywords" in default_params
-                else ""
-            )
-
-            res = self._fetch(
-                f"/graphql?variables=(start:{default_params['start']},origin:{default_params['origin']},"
-                f"query:("
-                f"{keywords}"
-                f"flagshipSearchIntent:SEARCH_SRP,"
-                f"queryParameters:{default_params['filters']},"
-                f"includeFiltersInResponse:false))&queryId=voyagerSearchDashClusters"
-                f".b0928897b71bd00a5a7291755dcd64f0"
-            )
-            data = res.json()
-
-            data_clusters = data.get("data", {}).get("searchDashClustersByAll", [])
+            if limit > -1 and limit - fetched < count:
+                count = limit - fetched
 
-            if not data_clusters:
-                return []
+            data, new_elements = self._search_page(params, count, fetched + offset)
+            if new_elements is None:
+                return
 
-            if (
-                not data_clusters.get("_type", [])
-                == "com.linkedin.restli.common.CollectionResponse"
-            ):
-                return []
-
-            new_elements = []
-            for it in data_clusters.get("elements", []):
-                if (
-                    not it.get("_type", [])
-                    == "com.linkedin.voyager.dash.search.SearchClusterViewModel"
-                ):
-                    continue
-
-                for el in it.get("items", []):
-                    if (
-                        not el.get("_type", [])
-                        == "com.linkedin.voyager.dash.search.SearchItem"
-                    ):
-                        continue
-
-                    e = el.get("item", {}).get("entityResult", [])
-                    if not e:
-                        continue
-                    if (
-                        not e.get("_type", [])
-                        == "com.linkedin.voyager.dash.search.EntityResultViewModel"
-                    ):
-                        continue
-                    new_elements.append(e)
-
-            results.extend(new_elements)
+            fetched += len(new_elements)
+            yield Page(new_elements, encode_cursor("search", target, offset + fetched))
 
             # break the loop if we're done searching
-            # NOTE: we could also check for the `total` returned in the response.
-            # This is in data["data"]["paging"]["total"]
             if (
-                (-1 < limit <= len(results))  # if our results exceed set limit
-                or len(results) / count >= Linkedin._MAX_REPEATED_REQUESTS
+                (-1 < limit <= fetched)  # if our results exceed set limit
+                or fetched / count >= Linkedin._MAX_REPEATED_REQUESTS
             ) or len(new_elements) == 0:
                 break
 
-            self.logger.debug(f"results grew to {len(results)}")
+            total = parse_search_total(data) if prefetch else None
+            if total is not None:
+                end = total if limit < 0 else min(total, offset + limit)
+                # offsets go by the page size rather than the length of the first
+                # page, which is short when LinkedIn leaves results out of it
+                step = Linkedin._SEARCH_PAGE_SIZE
+                end = min(end, offset + step * Linkedin._MAX_REPEATED_REQUESTS)
+                yield from self._prefetch_search_pages(
+                    params, target, new_elements, offset + fetched, end, step, prefetch
+                )
+                return
 
-        return results
+            self.logger.debug(f"results grew to {fetched}")
+
+    def _prefetch_search_pages(
+        self,
+        params: Dict,
+        target: str,
+        first: List,
+        start: int,
+        end: int,
+        step: int,
+        workers: int,
+    ) -> Iterator[Page]:
+        """Yield the search pages from `start` to `end`, fetching `workers` at a time
+
+        Pages are yielded in order. Results already returned by an earlier page, as
+        happens when the result set shifts between requests, are dropped.
+        """
+        seen = {element.get("entityUrn") for element in first}
+        starts = iter(range(start, end, step))
+        executor = self._worker_executor(workers)
+
+        def submit(page_start: int):
+            future = executor.submit(
+                self._search_page, params, min(step, end - page_start), page_start
+            )
+            return page_start, future
+
+        pending = deque(submit(page_start) for page_start in islice(starts, workers))
+        try:
+            while pending:
+                page_start, future = pending.popleft()
+                _, elements = future.result()
+                for next_start in islice(starts, 1):
+                    pending.append(submit(next_start))
+                if not elements:
+                    break
+
+                page = []
+                for element in elements:
+                    urn = element.get("entityUrn")
+                    if urn is None or urn not in seen:
+                        seen.add(urn)
+                        page.append(element)
+                self.logger.debug(f"prefetched page of {len(page)} results")
+                yield Page(page, encode_cursor("search", target, page_start + step))
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
 
     def search_people(
         self,
@@ -373,87 +774,69 @@ class Linkedin(object):
         :type connection_of: str, optional
         :param limit: Maximum length of the returned list, defaults to -1 (no limit)
         :type limit: int, optional
+        :param prefetch: Number of result pages to fetch concurrently, see `search`
+        :type prefetch: int, optional
 
         :return: List of profiles (minimal data only)
         :rtype: list
         """
-        filters = ["(key:resultType,value:List(PEOPLE))"]
-        if connection_of:
-            filters.append(f"(key:connectionOf,value:List({connection_of}))")
-        if network_depths:
-            stringify = " | ".join(network_depths)
-            filters.append(f"(key:network,value:List({stringify}))")
-        elif network_depth:
-            filters.append(f"(key:network,value:List({network_depth}))")
-        if regions:
-            stringify = " | ".join(regions)
-            filters.append(f"(key:geoUrn,value:List({stringify}))")
-        if industries:
-            stringify = " | ".join(industries)
-            filters.append(f"(key:industry,value:List({stringify}))")
-        if current_company:
-            stringify = " | ".join(current_company)
-            filters.append(f"(key:currentCompany,value:List({stringify}))")
-        if past_companies:
-            stringify = " | ".join(past_companies)
-            filters.append(f"(key:pastCompany,value:List({stringify}))")
-        if profile_languages:
-            stringify = " | ".join(profile_languages)
-            filters.append(f"(key:profileLanguage,value:List({stringify}))")
-        if nonprofit_interests:
-            stringify = " | ".join(nonprofit_interests)
-            filters.append(f"(key:nonprofitInterest,value:List({stringify}))")
-        if schools:
-            stringify = " | ".join(schools)
-            filters.append(f"(key:schools,value:List({stringify}))")
-        if service_categories:
-            stringify = " | ".join(service_categories)
-            filters.append(f"(key:serviceCategory,value:List({stringify}))")
-        # `Keywords` filter
-        keyword_title = keyword_title if keyword_title else title
-        if keyword_first_name:
-            filters.append(f"(key:firstName,value:List({keyword_first_name}))")
-        if keyword_last_name:
-            filters.append(f"(key:lastName,value:List({keyword_last_name}))")
-        if keyword_title:
-            filters.append(f"(key:title,value:List({keyword_title}))")
-        if keyword_company:
-            filters.append(f"(key:company,value:List({keyword_company}))")
-        if keyword_school:
-            filters.append(f"(key:school,value:List({keyword_school}))")
-
-        params = {"filters": "List({})".format(",".join(filters))}
-
-        if keywords:
-            params["keywords"] = keywords
-
-        data = self.search(params, **kwargs)
-
-        results = []
-        for item in data:
-            if (
-                not include_private_profiles
-                and (item.get("entityCustomTrackingInfo") or {}).get(
-                    "memberDistance", None
-                )
-                == "OUT_OF_NETWORK"
-            ):
-                continue
-            results.append(
-                {
-                    "urn_id": get_id_from_urn(
-                        get_urn_from_raw_update(item.get("entityUrn", None))
-                    ),
-                    "distance": (item.get("entityCustomTrackingInfo") or {}).get(
-                        "memberDistance", None
-                    ),
-                    "jobtitle": (item.get("primarySubtitle") or {}).get("text", None),
-                    "location": (item.get("secondarySubtitle") or {}).get("text", None),
-                    "name": (item.get("title") or {}).get("text", None),
-                }
-            )
+        params = build_people_search_params(
+            keywords=keywords,
+            connection_of=connection_of,
+            network_depths=network_depths,
+            current_company=current_company,
+            past_companies=past_companies,
+            nonprofit_interests=nonprofit_interests,
+            profile_languages=profile_languages,
+            regions=regions,
+            industries=industries,
+            schools=schools,
+            contact_interests=contact_interests,
+            service_categories=service_categories,
+            keyword_first_name=keyword_first_name,
+            keyword_last_name=keyword_last_name,
+            keyword_title=keyword_title,
+            keyword_company=keyword_company,
+            keyword_school=keyword_school,
+            network_depth=network_depth,
+            title=title,
+        )
 
-        return results
+        return [
+            person
+            for page in self._search_results(params, **kwargs)
+            for person in parse_people_search_results(page, include_private_profiles)
+        ]
+
+    def iter_search_people(
+        self,
+        keywords: Optional[str] = None,
+        *,
+        include_private_profiles=False,
+        **kwargs,
+    ) -> Iterator[Dict]:
+        """Perform a LinkedIn search for people, yielding profiles as their page arrives.
+
+        Takes the same arguments as `search_people`, all but `keywords` by keyword.
+
+        :return: Generator of profiles (minimal data only)
+        :rtype: generator
+        """
+        options = {
+            name: kwargs.pop(name)
+            for name in ("limit", "offset", "prefetch")
+            if name in kwargs
+        }
+        params = build_people_search_params(keywords=keywords, **kwargs)
+        return self._iter_people(params, include_private_profiles, **options)
+
+    def _iter_people(
+        self, params: Dict, include_private_profiles=False, **kwargs
+    ) -> Iterator[Dict]:
+        for page in self._iter_search_pages(params, **kwargs):
+            yield from parse_people_search_results(
+                page.elements, include_private_profiles
+            )
 
     def search_companies(self, keywords: Optional[List[str]] = None, **kwargs) -> List:
         """Perform a LinkedIn search for companies.
@@ -464,32 +847,26 @@ class Linkedin(object):
         :return: List of companies
         :rtype: list
         """
-        filters = ["(key:resultType,value:List(COMPANIES))"]
+        params = build_company_search_params(keywords)
+        return [
+            company
+            for page in self._search_results(params, **kwargs)
+            for company in parse_company_search_results(page)
+        ]
 
-        params: Dict[str, Union[str, List[str]]] = {
-            "filters": "List({})".format(",".join(filters)),
-            "queryContext": "List(spellCorrectionEnabled->true)",
-        }
+    def iter_search_companies(
+        self, keywords: Optional[List[str]] = None, **kwargs
+    ) -> Iterator[Dict]:
+        """Perform a LinkedIn search for companies, yielding them as their page arrives.
 
-        if keywords:
-            params["keywords"] = keywords
-
-        data = self.search(params, **kwargs)
-
-        results = []
-        for item in data:
-            if "company" not in item.get("trackingUrn"):
-                continue
-            results.append(
-                {
-                    "urn_id": get_id_from_urn(item.get("trackingUrn", None)),
-                    "name": (item.get("title") or {}).get("text", None),
-                    "headline": (item.get("primarySubtitle") or {}).get("text", None),
-                    "subline": (item.get("secondarySubtitle") or {}).get("text", None),
-                }
-            )
+        Takes the same arguments as `search_companies`.
 
-        return results
+        :return: Generator of companies
+        :rtype: generator
+        """
+        params = build_company_search_params(keywords)
+        for page in self._iter_search_pages(params, **kwargs):
+            yield from parse_company_search_results(page.elements)
 
     def search_jobs(
         self,
@@ -559,102 +936,98 @@ class Linkedin(object):
         :return: List of jobs
         :rtype: list
         """
+        query_string = build_job_search_query(
+            keywords=keywords,
+            companies=companies,
+            experience=experience,
+            job_type=job_type,
+            job_title=job_title,
+            industries=industries,
+            location_name=location_name,
+            remote=remote,
+            listed_at=listed_at,
+            distance=distance,
+        )
+        pages = self._checkpointed(
+            "jobs",
+            {"query": query_string, "limit": limit, "offset": offset},
+            lambda cursor: self._iter_job_pages(
+                query_string, limit=limit, offset=offset, cursor=cursor
+            ),
+        )
+        return [job for page in pages for job in page]
+
+    def iter_search_jobs(
+        self, keywords: Optional[str] = None, *, limit=-1, offset=0, **kwargs
+    ) -> Iterator[Dict]:
+        """Perform a LinkedIn search for jobs, yielding postings as their page arrives.
+
+        Takes the same arguments as `search_jobs`, all but `keywords` by keyword.
+
+        :return: Generator of jobs
+        :rtype: generator
+        """
+        query_string = build_job_search_query(keywords=keywords, **kwargs)
+        for page in self._iter_job_pages(query_string, limit=limit, offset=offset):
+            yield from page.elements
+
+    def _iter_job_pages(
+        self, query_string: str, limit=-1, offset=0, cursor=None
+    ) -> Iterator[Page]:
+        """Yield the job postings of a job search, one page at a time
+
+        Each page comes with the cursor of the next offset, from which the search
+        resumes when passed back as `cursor`.
+        """
         count = Linkedin._MAX_SEARCH_COUNT
         if limit is None:
             limit = -1
 
-        query: Dict[str, Union[str, Dict[str, str]]] = {
-            "origin": "JOB_SEARCH_PAGE_QUERY_EXPANSION"
-        }
-        if keywords:
-            query["keywords"] = "KEYWORD_PLACEHOLDER"
-        if location_name:
-            query["locationFallback"] = "LOCATION_PLACEHOLDER"
-
-        # In selectedFilters()
-        query["selectedFilters"] = {}
-        if companies:
-            query["selectedFilters"]["company"] = f"List({','.join(companies)})"
-        if experience:
-            query["selectedFilters"]["experience"] = f"List({','.join(experience)})"
-        if job_type:
-            query["selectedFilters"]["jobType"] = f"List({','.join(job_type)})"
-        if job_title:
-            query["selectedFilters"]["title"] = f"List({','.join(job_title)})"
-        if industries:
-            query["selectedFilters"]["industry"] = f"List({','.join(industries)})"
-        if distance:
-            query["selectedFilters"]["distance"] = f"List({distance})"
-        if remote:
-            query["selectedFilters"]["workplaceType"] = f"List({','.join(remote)})"
-
-        query["selectedFilters"]["timePostedRange"] = f"List(r{listed_at})"
-        query["spellCorrectionEnabled"] = "true"
-
-        # Query structure:
-        # "(
-        #    origin:JOB_SEARCH_PAGE_QUERY_EXPANSION,
-        #    keywords:marketing%20manager,
-        #    locationFallback:germany,
-        #    selectedFilters:(
-        #        distance:List(25),
-        #        company:List(163253),
-        #        salaryBucketV2:List(5),
-        #        timePostedRange:List(r2592000),
-        #        workplaceType:List(1)
-        #    ),
-        #    spellCorrectionEnabled:true
-        #  )"
-
-        query_string = (
-            str(query)
-            .replace(" ", "")
-            .replace("'", "")
-            .replace("KEYWORD_PLACEHOLDER", keywords or "")
-            .replace("LOCATION_PLACEHOLDER", location_name or "")
-            .replace("{", "(")
-            .replace("}", ")")
-        )
-        results = []
+        target = query_digest(query_string)
+        fetched = decode_cursor(cursor, "jobs", target).start - offset if cursor else 0
+        # Postings yielded, counted against `limit`, and their URNs: a card can refer
+        # to a posting of an earlier page, which `self.entities` resolves again
+        yielded = fetched
+        seen = set()
         while True:
             # when we're close to the limit, only fetch what we need to
-            if limit > -1 and limit - len(results) < count:
-                count = limit - len(results)
+            if limit > -1 and limit - yielded < count:
+                count = limit - yielded
             default_params = {
                 "decorationId": "com.linkedin.voyager.dash.deco.jobs.search.JobSearchCardsCollection-174",
                 "count": count,
                 "q": "jobSearch",
                 "query": query_string,
-                "start": len(results) + offset,
+                "start": fetched + offset,
             }
 
             res = self._fetch(
                 f"/voyagerJobsDashJobCards?{urlencode(default_params, safe='(),:')}",
                 headers={"accept": "application/vnd.linkedin.normalized+json+2.1"},
             )
-            data = res.json()
+            data = self._decode(res)
 
             elements = data.get("included", [])
-            new_data = [
-                i
-                for i in elements
-                if i["$type"] == "com.linkedin.voyager.dash.jobs.JobPosting"
-            ]
+            postings = self._parse(res, parse_job_postings, data, self.entities)
             # break the loop if we're done searching or no results returned
-            if not new_data:
+            if not postings:
                 break
             # NOTE: we could also check for the `total` returned in the response.
             # This is in data["data"]["paging"]["total"]
-            results.extend(new_data)
+            # the next page starts past every card of this one, repeated or not
+            fetched += max(count_job_cards(data), len(postings))
+            new_data = [p for p in postings if p.get("entityUrn") not in seen]
+            seen.update(p["entityUrn"] for p in new_data if p.get("entityUrn"))
+            yielded += len(new_data)
+            if new_data:
+                yield Page(new_data, encode_cursor("jobs", target, offset + fetched))
             if (
-                (-1 < limit <= len(results))  # if our results exceed set limit
-                or len(results) / count >= Linkedin._MAX_REPEATED_REQUESTS
+                (-1 < limit <= yielded)  # if our results exceed set limit
+                or fetched / count >= Linkedin._MAX_REPEATED_REQUESTS
             ) or len(elements) == 0:
                 break
 
-            self.logger.debug(f"results grew to {len(results)}")
-
-        return results
+            self.logger.debug(f"results grew to {fetched}")
 
     def get_profile_contact_info(
         self, public_id: Optional[str] = None, urn_id: Optional[str] = None
@@ -672,33 +1045,9 @@ class Linkedin(object):
         res = self._fetch(
             f"/identity/profiles/{public_id or urn_id}/profileContactInfo"
         )
-        data = res.json()
-
-        contact_info = {
-            "email_address": data.get("emailAddress"),
-            "websites": [],
-            "twitter": data.get("twitterHandles"),
-            "birthdate": data.get("birthDateOn"),
-            "ims": data.get("ims"),
-            "phone_numbers": data.get("phoneNumbers", []),
-        }
-
-        websites = data.get("websites", [])
-        for item in websites:
-            if "com.linkedin.voyager.identity.profile.StandardWebsite" in item["type"]:
-                item["label"] = item["type"][
-                    "com.linkedin.voyager.identity.profile.StandardWebsite"
-                ]["category"]
-            elif "" in item["type"]:
-                item["label"] = item["type"][
-                    "com.linkedin.voyager.identity.profile.CustomWebsite"
-                ]["label"]
+        data = self._decode(res)
 
-            del item["type"]
-
-        contact_info["websites"] = websites
-
-        return contact_info
+        return self._parse(res, parse_contact_info, data)
 
     def get_profile_skills(
         self, public_id: Optional[str] = None, urn_id: Optional[str] = None
@@ -718,136 +1067,223 @@ class Linkedin(object):
         res = self._fetch(
             f"/identity/profiles/{public_id or urn_id}/skills", params=params
         )
-        data = res.json()
-
-        skills = data.get("elements", [])
-        for item in skills:
-            del item["entityUrn"]
+        data = self._decode(res)
 
-        return skills
+        return self._parse(res, parse_profile_skills, data)
 
     def get_profile(
-        self, public_id: Optional[str] = None, urn_id: Optional[str] = None
-    ) -> Dict:
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        cache: bool = True,
+        typed: bool = False,
+        lazy: bool = False,
+        sections: Optional[Collection[str]] = None,
+    ) -> Union[Dict, Optional[Profile], Optional[LazyProfile]]:
         """Fetch data for a given LinkedIn profile.
 
+        With `sections`, only the requested sections are fetched and decoded. A single
+        section comes from its own endpoint (e.g. `/identity/profiles/{id}` for the top
+        card), a fraction of the profileView; several come from the profileView, since
+        one request of it costs less of the rate budget than one request per section.
+
         :param public_id: LinkedIn public ID for a profile
         :type public_id: str, optional
         :param urn_id: LinkedIn URN ID for a profile
         :type urn_id: str, optional
-
-        :return: Profile data
-        :rtype: dict
+        :param cache: Serve and store the response through the response cache
+        :type cache: bool, optional
+        :param typed: Return a compact `models.Profile` instead of the raw profile dict
+        :type typed: bool, optional
+        :param lazy: Return a `models.LazyProfile`, decoding each section when first read
+        :type lazy: bool, optional
+        :param sections: Sections to fetch among `models.PROFILE_SECTION_NAMES`, e.g.
+            {"top_card", "experience"}; the other ones are left empty
+        :type sections: collection, optional
+
+        :return: Profile data, or an empty dict (None if `typed` or `lazy`) if the request failed
+        :rtype: dict or Profile or LazyProfile
         """
+        if sections is not None:
+            if lazy:
+                raise ValueError("sections cannot be combined with lazy")
+            profile = self._get_profile_sections(
+                public_id, urn_id, _check_profile_sections(sections), cache
+            )
+            if profile is None:
+                return None if typed else {}
+            return profile if typed else profile.to_dict()
+
         # NOTE this still works for now, but will probably eventually have to be converted to
         # https://www.linkedin.com/voyager/api/identity/profiles/ACoAAAKT9JQBsH7LwKaE9Myay9WcX8OVGuDq9Uw
-        res = self._fetch(f"/identity/profiles/{public_id or urn_id}/profileView")
+        res = self._fetch(
+            f"/identity/profiles/{public_id or urn_id}/profileView", cache=cache
+        )
+
+        if lazy and res.status_code == 200:
+            return LazyProfile(res.content)
+
+        data = self._decode(res)
+        if lazy or data and "status" in data and data["status"] != 200:
+            self.logger.info("request failed: {}".format(data.get("message", data)))
+            return None if typed or lazy else {}
+
+        if typed:
+            return self._parse(res, Profile.from_profile_view, data)
+        return self._parse(res, parse_profile_view, data)
+
+    def _log_failed_request(self, res):
+        """Log a failed response by its status and the start of its body
 
-        data = res.json()
+        The body of a 999 or of a server error is HTML or empty more often than JSON,
+        so it is not decoded.
+        """
+        self.logger.info(f"request failed: {res.status_code} {res.text[:200]!r}")
+
+    def _get_profile_sections(
+        self,
+        public_id: Optional[str],
+        urn_id: Optional[str],
+        sections: FrozenSet[str],
+        cache: bool,
+    ) -> Optional[Profile]:
+        """Fetch `sections` of a profile through the smallest endpoint serving them all"""
+        uri = f"/identity/profiles/{public_id or urn_id}"
+        if len(sections) > 1:
+            res = self._fetch(f"{uri}/profileView", cache=cache)
+            if res.status_code != 200:
+                self._log_failed_request(res)
+                return None
+            return self._parse(res, LazyProfile(res.content).to_profile, sections)
+
+        (section,) = sections
+        params = None if section == TOP_CARD else {"count": 100, "start": 0}
+        res = self._fetch(
+            uri + PROFILE_SECTION_ENDPOINTS[section], params=params, cache=cache
+        )
+        if res.status_code != 200:
+            self._log_failed_request(res)
+            return None
+        data = self._decode(res)
         if data and "status" in data and data["status"] != 200:
-            self.logger.info("request failed: {}".format(data["message"]))
-            return {}
+            self.logger.info("request failed: {}".format(data.get("message", data)))
+            return None
+
+        if section == TOP_CARD:
+            return self._parse(res, Profile.from_sections, data, {})
+        return self._parse(
+            res,
+            Profile.from_sections,
+            None,
+            {section: data.get("elements", [])},
+            {"public_id": public_id, "urn_id": urn_id},
+        )
 
-        # massage [profile] data
-        profile = data["profile"]
-        if "miniProfile" in profile:
-            if "picture" in profile["miniProfile"]:
-                profile["displayPictureUrl"] = profile["miniProfile"]["picture"][
-                    "com.linkedin.common.VectorImage"
-                ]["rootUrl"]
-
-                images_data = profile["miniProfile"]["picture"][
-                    "com.linkedin.common.VectorImage"
-                ]["artifacts"]
-                for img in images_data:
-                    w, h, url_segment = itemgetter(
-                        "width", "height", "fileIdentifyingUrlPathSegment"
-                    )(img)
-                    profile[f"img_{w}_{h}"] = url_segment
-
-            profile["profile_id"] = get_id_from_urn(profile["miniProfile"]["entityUrn"])
-            profile["profile_urn"] = profile["miniProfile"]["entityUrn"]
-            profile["member_urn"] = profile["miniProfile"]["objectUrn"]
-            profile["public_id"] = profile["miniProfile"]["publicIdentifier"]
-
-            del profile["miniProfile"]
-
-        del profile["defaultLocale"]
-        del profile["supportedLocales"]
-        del profile["versionTag"]
-        del profile["showEducationOnProfileTopCard"]
-
-        # massage [experience] data
-        experience = data["positionView"]["elements"]
-        for item in experience:
-            if "company" in item and "miniCompany" in item["company"]:
-                if "logo" in item["company"]["miniCompany"]:
-                    logo = item["company"]["miniCompany"]["logo"].get(
-                        "com.linkedin.common.VectorImage"
-                    )
-                    if logo:
-                        item["companyLogoUrl"] = logo["rootUrl"]
-                del item["company"]["miniCompany"]
-
-        profile["experience"] = experience
-
-        # massage [education] data
-        education = data["educationView"]["elements"]
-        for item in education:
-            if "school" in item:
-                if "logo" in item["school"]:
-                    item["school"]["logoUrl"] = item["school"]["logo"][
-                        "com.linkedin.common.VectorImage"
-                    ]["rootUrl"]
-                    del item["school"]["logo"]
-
-        profile["education"] = education
-
-        # massage [languages] data
-        languages = data["languageView"]["elements"]
-        for item in languages:
-            del item["entityUrn"]
-        profile["languages"] = languages
-
-        # massage [publications] data
-        publications = data["publicationView"]["elements"]
-        for item in publications:
-            del item["entityUrn"]
-            for author in item.get("authors", []):
-                del author["entityUrn"]
-        profile["publications"] = publications
-
-        # massage [certifications] data
-        certifications = data["certificationView"]["elements"]
-        for item in certifications:
-            del item["entityUrn"]
-        profile["certifications"] = certifications
-
-        # massage [volunteer] data
-        volunteer = data["volunteerExperienceView"]["elements"]
-        for item in volunteer:
-            del item["entityUrn"]
-        profile["volunteer"] = volunteer
-
-        # massage [honors] data
-        honors = data["honorView"]["elements"]
-        for item in honors:
-            del item["entityUrn"]
-        profile["honors"] = honors
-
-        # massage [projects] data
-        projects = data["projectView"]["elements"]
-        for item in projects:
-            del item["entityUrn"]
-        profile["projects"] = projects
-        # massage [skills] data
-        skills = data["skillView"]["elements"]
-        for item in skills:
-            del item["entityUrn"]
-        profile["skills"] = skills
-
-        profile["urn_id"] = profile["entityUrn"].replace("urn:li:fs_profile:", "")
+    def get_profiles(
+        self,
+        public_ids_or_urns: List[str],
+        concurrency: int = 4,
+        sections: Optional[Collection[str]] = None,
+        extras: Optional[List[str]] = None,
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Fetch data for many LinkedIn profiles, `concurrency` at a time.
+
+        IDs may be public IDs, URN IDs, URNs or profile URLs; repeated ones are fetched
+        once. Requests still go through the pacer and the response cache, so the rate
+        policy bounds throughput and profiles fetched before are not fetched again.
+
+        :param public_ids_or_urns: Profiles to fetch
+        :type public_ids_or_urns: list
+        :param concurrency: Maximum number of profiles fetched at the same time
+        :type concurrency: int, optional
+        :param sections: Sections to fetch, see Linkedin.get_profile()
+        :type sections: collection, optional
+        :param extras: Extra lookups to add to every profile, among PROFILE_EXTRAS
+            ("contact_info", "skills", "experiences"), stored under their own key
+        :type extras: list, optional
+
+        :raises ChallengeException, UnauthorizedException, ThrottledException, CircuitOpenException:
+            if the account fails, since every remaining lookup would fail the same way
+
+        :return: Profiles in the order of `public_ids_or_urns` (None for the ones that failed),
+            and the error of every ID that failed
+        :rtype: tuple
+        """
+        if sections is not None:
+            sections = _check_profile_sections(sections)
+        extras = _check_profile_extras(extras)
+        return self._fetch_many(
+            "profile",
+            public_ids_or_urns,
+            get_profile_id,
+            lambda profile_id: self._get_profile_with_extras(
+                profile_id, sections, extras
+            ),
+            concurrency,
+        )
 
+    def _fetch_many(
+        self,
+        kind: str,
+        keys: List[str],
+        normalize: Callable[[str], str],
+        fetch: Callable[[str], Dict],
+        concurrency: int,
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Call `fetch` once per distinct normalized key, `concurrency` calls at a time
+
+        An empty result counts as a failure. Returns the results in the order of
+        `keys`, None for failures, and the error of every key that failed; account
+        errors cancel the calls left and are raised.
+        """
+        ids = {key: normalize(key) for key in keys}
+        results: Dict[str, Dict] = {}
+        failures: Dict[str, Exception] = {}
+
+        def fetch_one(entity_id: str) -> Dict:
+            result = fetch(entity_id)
+            if not result:
+                raise LookupError(
+                    f"{kind.capitalize()} {entity_id} could not be fetched"
+                )
+            return result
+
+        with self._worker_executor(max(1, concurrency)) as executor:
+            futures = {}
+            for entity_id in dict.fromkeys(ids.values()):
+                futures[executor.submit(fetch_one, entity_id)] = entity_id
+            try:
+                for future in as_completed(futures):
+                    entity_id = futures[future]
+                    try:
+                        results[entity_id] = future.result()
+                    except ACCOUNT_ERRORS:
+                        raise
+                    except Exception as e:
+                        self.logger.info(f"could not fetch {kind} {entity_id}: {e!r}")
+                        failures[entity_id] = e
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        errors = {key: failures[ids[key]] for key in ids if ids[key] in failures}
+        return [results.get(ids[key]) for key in keys], errors
+
+    def _get_profile_with_extras(
+        self, profile_id: str, sections: Optional[FrozenSet[str]], extras: List[str]
+    ) -> Dict:
+        profile = self.get_profile(profile_id, sections=sections)
+        if not profile:
+            return profile
+
+        urn_id = profile.get("urn_id") or profile_id
+        for extra in extras:
+            if extra == "contact_info":
+                profile[extra] = self.get_profile_contact_info(urn_id=urn_id)
+            elif extra == "skills":
+                profile[extra] = self.get_profile_skills(urn_id=urn_id)
+            elif extra == "experiences":
+                profile[extra] = self.get_profile_experiences(urn_id)
         return profile
 
     def get_profile_connections(self, urn_id: str, **kwargs) -> List:
@@ -874,141 +1310,119 @@ class Linkedin(object):
         :return: List of experiences
         :rtype: list
         """
-        profile_urn = f"urn:li:fsd_profile:{urn_id}"
-        variables = ",".join(
-            [f"profileUrn:{quote(profile_urn)}", "sectionType:experience"]
-        )
-        query_id = (
-            "voyagerIdentityDashProfileComponents.7af5d6f176f11583b382e37e5639e69e"
-        )
-
         res = self._fetch(
-            f"/graphql?variables=({variables})&queryId={query_id}&includeWebMetadata=true",
+            build_profile_experiences_uri(urn_id),
             headers={"accept": "application/vnd.linkedin.normalized+json+2.1"},
         )
 
-        def parse_item(item, is_group_item=False):
-            """
-            Parse a single experience item.
+        data = self._decode(res)
 
-            Items as part of an 'experience group' (e.g. a company with multiple positions) have different data structures.
-            Therefore, some exceptions need to be made when parsing these items.
-            """
-            component = item["components"]["entityComponent"]
-            title = component["titleV2"]["text"]["text"]
-            subtitle = component["subtitle"]
-            company = subtitle["text"].split(" · ")[0] if subtitle else None
-            employment_type_parts = subtitle["text"].split(" · ") if subtitle else None
-            employment_type = (
-                employment_type_parts[1]
-                if employment_type_parts and len(employment_type_parts) > 1
-                else None
-            )
-            metadata = component.get("metadata", {}) or {}
-            location = metadata.get("text")
+        return self._parse(res, parse_profile_experiences, data, self.entities)
 
-            duration_text = component["caption"]["text"]
-            duration_parts = duration_text.split(" · ")
-            date_parts = duration_parts[0].split(" - ")
-
-            duration = (
-                duration_parts[1]
-                if duration_parts and len(duration_parts) > 1
-                else None
-            )
-            start_date = date_parts[0] if date_parts else None
-            end_date = date_parts[1] if date_parts and len(date_parts) > 1 else None
-
-            sub_components = component["subComponents"]
-            fixed_list_component = (
-                sub_components["components"][0]["components"]["fixedListComponent"]
-                if sub_components
-                else None
-            )
-
-            fixed_list_text_component = (
-                fixed_list_component["components"][0]["components"]["textComponent"]
-                if fixed_list_component
-                else None
-            )
-
-            # Extract additional description
-            description = (
-                fixed_list_text_component["text"]["text"]
-                if fixed_list_text_component
-                else None
-            )
-
-            # Create a dictionary with the extracted information
-            parsed_data = {
-                "title": title,
-                "companyName": company if not is_group_item else None,
-                "employmentType": company if is_group_item else employment_type,
-                "locationName": location,
-                "duration": duration,
-                "startDate": start_date,
-                "endDate": end_date,
-                "description": description,
-            }
-
-            return parsed_data
-
-        def get_grouped_item_id(item):
-            sub_components = item["components"]["entityComponent"]["subComponents"]
-            sub_components_components = (
-                sub_components["components"][0]["components"]
-                if sub_components
-                else None
-            )
-            paged_list_component_id = (
-                sub_components_components.get("*pagedListComponent", "")
-                if sub_components_components
-                else None
+    def _checkpointed(
+        self,
+        method: str,
+        query: Dict,
+        pages: Callable[[Optional[str]], Iterator[Page]],
+    ) -> Iterator[List]:
+        """Yield the elements of every page of a crawl, checkpointed to `self.checkpoints`
+
+        `pages(cursor)` iterates the crawl from `cursor` (None for the start). Pages
+        committed by an earlier, interrupted run of the same method and query are
+        replayed first, and the crawl resumes at their cursor. Each new page is
+        committed before it is handed out; the checkpoint is dropped once the crawl
+        completes.
+        """
+        if self.checkpoints is None:
+            for page in pages(None):
+                yield page.elements
+            return
+
+        fingerprint = self.checkpoints.fingerprint(method, query)
+        owner = self.checkpoints.acquire(fingerprint)
+        if owner is None:
+            self.logger.warning(
+                f"{method} is already being crawled with this query, not checkpointing"
             )
-            if (
-                paged_list_component_id
-                and "fsd_profilePositionGroup" in paged_list_component_id
-            ):
-                pattern = r"urn:li:fsd_profilePositionGroup:\([A-z0-9]+,[A-z0-9]+\)"
-                match = re.search(pattern, paged_list_component_id)
-                return match.group(0) if match else None
-
-        data = res.json()
-
-        items = []
-        for item in data["included"][0]["components"]["elements"]:
-            grouped_item_id = get_grouped_item_id(item)
-            # if the item is part of a group (e.g. a company with multiple positions),
-            # find the group items and parse them.
-            if grouped_item_id:
-                component = item["components"]["entityComponent"]
-                # use the company and location from the main item
-                company = component["titleV2"]["text"]["text"]
-
-                location = (
-                    component["caption"]["text"] if component["caption"] else None
+            for page in pages(None):
+                yield page.elements
+            return
+
+        try:
+            checkpoint = self.checkpoints.load(fingerprint)
+            cursor = None
+            if checkpoint is not None:
+                self.logger.info(
+                    f"Resuming {method} after {len(checkpoint.pages)} committed pages"
                 )
+                yield from checkpoint.pages
+                cursor = checkpoint.cursor
 
-                # find the group
-                group = [
-                    i
-                    for i in data["included"]
-                    if grouped_item_id in i.get("entityUrn", "")
-                ]
-                if not group:
-                    continue
-                for group_item in group[0]["components"]["elements"]:
-                    parsed_data = parse_item(group_item, is_group_item=True)
-                    parsed_data["companyName"] = company
-                    parsed_data["locationName"] = location
-                    items.append(parsed_data)
-                continue
+            if checkpoint is None or not checkpoint.complete:
+                for page in pages(cursor):
+                    self.checkpoints.commit(
+                        fingerprint, method, page.cursor, page.elements, owner
+                    )
+                    yield page.elements
+            self.checkpoints.discard(fingerprint)
+        finally:
+            self.checkpoints.release(fingerprint, owner)
 
-            # else, parse the regular item
-            parsed_data = parse_item(item)
-            items.append(parsed_data)
+    def _iter_offset_pages(
+        self,
+        kind: str,
+        target: str,
+        uri: str,
+        params: Dict,
+        max_results: Optional[int] = None,
+        cursor: Optional[str] = None,
+        incremental: bool = False,
+    ) -> Iterator[Page]:
+        """Page through a `start`/`count` paginated endpoint, resuming at `cursor`
+
+        Stops at the first empty page, or once `max_results` results were returned.
+        An `incremental` crawl of a newest-first feed also stops at the first page
+        reaching the high-water mark in `self.watermarks`, leaving out the updates
+        already seen. The mark moves to its newest update once the crawl reaches it or
+        the end of the feed, not when `max_results` cut it short, which would skip the
+        updates between the two.
+        """
+        start = decode_cursor(cursor, kind, target).start if cursor else 0
+        watermarks = self.watermarks if incremental else None
+        mark = watermarks.get(kind, target) if watermarks else None
+        # The newest update is only known to a crawl starting from the top
+        from_top = start == 0
+        newest = None
+        # Whether the crawl saw every update down to the mark
+        complete = False
+        while max_results is None or start < max_results:
+            res = self._fetch(uri, params={**params, "start": start})
+
+            data = self._decode(res)
+            elements = data["elements"]
+
+            if len(elements) == 0:
+                complete = True
+                break
 
-        return items
+            if from_top:
+                newest = newest_update(elements, newest)
+            start += len(elements)
+            self.logger.debug(f"results grew: {start}")
+
+            if mark:
+                # Pinned updates already crawled come back on every run
+                fresh = [u for u in elements if not mark.covers(u)]
+                if mark.reached(elements):
+                    self.logger.debug(f"reached the high-water mark of {kind} {target}")
+                    complete = True
+                    yield Page(fresh, "")
+                    break
+                elements = fresh
+            yield Page(elements, encode_cursor(kind, target, start))
+
+        if watermarks and newest is not None and complete:
+            watermarks.advance(kind, target, newest)
 
     def get_company_updates(
         self,
@@ -1027,40 +1441,67 @@ class Linkedin(object):
         :return: List of company update objects
         :rtype: list
         """
-
         if results is None:
             results = []
 
+        start = encode_cursor("company_updates", public_id or urn_id, len(results))
+        for elements in self._checkpointed(
+            "company_updates",
+            {
+                "target": public_id or urn_id,
+                "max_results": max_results,
+                "start": len(results),
+            },
+            lambda cursor: self.iter_company_updates(
+                public_id=public_id,
+                urn_id=urn_id,
+                max_results=max_results,
+                cursor=cursor or start,
+            ),
+        ):
+            results.extend(elements)
+
+        return results
+
+    def iter_company_updates(
+        self,
+        public_id: Optional[str] = None,
+        urn_id: Optional[str] = None,
+        max_results: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Iterator[Page]:
+        """Fetch company updates (news activity) for a given LinkedIn company, page by page.
+
+        With `watermarks` set on the client, only the updates newer than the ones seen
+        by the last complete crawl of this feed are returned.
+
+        :param public_id: LinkedIn public ID for a company
+        :type public_id: str, optional
+        :param urn_id: LinkedIn URN ID for a company
+        :type urn_id: str, optional
+        :param max_results: Stop once this many updates were returned
+        :type max_results: int, optional
+        :param cursor: Cursor of the last page handled by an earlier crawl, to resume after it
+        :type cursor: str, optional
+
+        :return: Generator of pages of company update objects, each with the cursor of the next page
+        :rtype: generator
+        """
         params = {
             "companyUniversalName": {public_id or urn_id},
             "q": "companyFeedByUniversalName",
             "moduleKey": "member-share",
             "count": Linkedin._MAX_UPDATE_COUNT,
-            "start": len(results),
         }
 
-        res = self._fetch(f"/feed/updates", params=params)
-
-        data = res.json()
-
-        if (
-            len(data["elements"]) == 0
-            or (max_results is not None and len(results) >= max_results)
-            or (
-                max_results is not None
-                and len(results) / max_results >= Linkedin._MAX_REPEATED_REQUESTS
-            )
-        ):
-            return results
-
-        results.extend(data["elements"])
-        self.logger.debug(f"results grew: {len(results)}")
-
-        return self.get_company_updates(
-            public_id=public_id,
-            urn_id=urn_id,
-            results=results,
+        return self._iter_offset_pages(
+            "company_updates",
+            public_id or urn_id,
+            "/feed/updates",
+            params,
             max_results=max_results,
+            cursor=cursor,
+            incremental=True,
         )
 
     def get_profile_updates(
@@ -1076,40 +1517,63 @@ class Linkedin(object):
         :return: List of profile update objects
         :rtype: list
         """
-
         if results is None:
             results = []
 
+        start = encode_cursor("profile_updates", public_id or urn_id, len(results))
+        for elements in self._checkpointed(
+            "profile_updates",
+            {
+                "target": public_id or urn_id,
+                "max_results": max_results,
+                "start": len(results),
+            },
+            lambda cursor: self.iter_profile_updates(
+                public_id=public_id,
+                urn_id=urn_id,
+                max_results=max_results,
+                cursor=cursor or start,
+            ),
+        ):
+            results.extend(elements)
+
+        return results
+
+    def iter_profile_updates(
+        self, public_id=None, urn_id=None, max_results=None, cursor=None
+    ) -> Iterator[Page]:
+        """Fetch profile updates (newsfeed activity) for a given LinkedIn profile, page by page.
+
+        With `watermarks` set on the client, only the updates newer than the ones seen
+        by the last complete crawl of this feed are returned.
+
+        :param public_id: LinkedIn public ID for a profile
+        :type public_id: str, optional
+        :param urn_id: LinkedIn URN ID for a profile
+        :type urn_id: str, optional
+        :param max_results: Stop once this many updates were returned
+        :type max_results: int, optional
+        :param cursor: Cursor of the last page handled by an earlier crawl, to resume after it
+        :type cursor: str, optional
+
+        :return: Generator of pages of profile update objects, each with the cursor of the next page
+        :rtype: generator
+        """
         params = {
             "profileId": {public_id or urn_id},
             "q": "memberShareFeed",
             "moduleKey": "member-share",
             "count": Linkedin._MAX_UPDATE_COUNT,
-            "start": len(results),
         }
 
-        res = self._fetch(f"/feed/updates", params=params)
-
-        data = res.json()
-
-        if (
-            len(data["elements"]) == 0
-            or (max_results is not None and len(results) >= max_results)
-            or (
-                max_results is not None
-                and len(results) / max_results >= Linkedin._MAX_REPEATED_REQUESTS
-            )
-        ):
-            return results
-
-        results.extend(data["elements"])
-        self.logger.debug(f"results grew: {len(results)}")
-
-        return self.get_profile_updates(
-            public_id=public_id,
-            urn_id=urn_id,
-            results=results,
+        return self._iter_offset_pages(
+            "profile_updates",
+            public_id or urn_id,
+            "/feed/updates",
+            params,
             max_results=max_results,
+            cursor=cursor,
+            incremental=True,
         )
 
     def get_current_profile_views(self):
@@ -1120,7 +1584,7 @@ class Linkedin(object):
         """
         res = self._fetch(f"/identity/wvmpCards")
 
-        data = res.json()
+        data = self._decode(res)
 
         return data["elements"][0]["value"][
             "com.linkedin.voyager.identity.me.wvmpOverview.WvmpViewersCard"
@@ -1130,11 +1594,13 @@ class Linkedin(object):
             "numViews"
         ]
 
-    def get_school(self, public_id):
+    def get_school(self, public_id, cache: bool = True):
         """Fetch data about a given LinkedIn school.
 
         :param public_id: LinkedIn public ID for a school
         :type public_id: str
+        :param cache: Serve and store the response through the response cache
+        :type cache: bool, optional
 
         :return: School data
         :rtype: dict
@@ -1145,9 +1611,9 @@ class Linkedin(object):
             "universalName": public_id,
         }
 
-        res = self._fetch(f"/organization/companies?{urlencode(params)}")
+        res = self._fetch(f"/organization/companies?{urlencode(params)}", cache=cache)
 
-        data = res.json()
+        data = self._decode(res)
 
         if data and "status" in data and data["status"] != 200:
             self.logger.info("request failed: {}".format(data))
@@ -1157,11 +1623,13 @@ class Linkedin(object):
 
         return school
 
-    def get_company(self, public_id):
+    def get_company(self, public_id, cache: bool = True):
         """Fetch data about a given LinkedIn company.
 
         :param public_id: LinkedIn public ID for a company
         :type public_id: str
+        :param cache: Serve and store the response through the response cache
+        :type cache: bool, optional
 
         :return: Company data
         :rtype: dict
@@ -1172,9 +1640,9 @@ class Linkedin(object):
             "universalName": public_id,
         }
 
-        res = self._fetch(f"/organization/companies", params=params)
+        res = self._fetch(f"/organization/companies", params=params, cache=cache)
 
-        data = res.json()
+        data = self._decode(res)
 
         if data and "status" in data and data["status"] != 200:
             self.logger.info("request failed: {}".format(data["message"]))
@@ -1184,6 +1652,52 @@ class Linkedin(object):
 
         return company
 
+    def get_schools(
+        self, public_ids: List[str], concurrency: int = 4
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Fetch data about many LinkedIn schools, `concurrency` at a time.
+
+        See Linkedin.get_companies(), which this works like.
+
+        :param public_ids: LinkedIn public IDs or URLs of the schools
+        :type public_ids: list
+        :param concurrency: Maximum number of schools fetched at the same time
+        :type concurrency: int, optional
+
+        :return: Schools in the order of `public_ids` (None for the ones that failed),
+            and the error of every ID that failed
+        :rtype: tuple
+        """
+        return self._fetch_many(
+            "school", public_ids, get_universal_name, self.get_school, concurrency
+        )
+
+    def get_companies(
+        self, public_ids: List[str], concurrency: int = 4
+    ) -> Tuple[List[Optional[Dict]], Dict[str, Exception]]:
+        """Fetch data about many LinkedIn companies, `concurrency` at a time.
+
+        IDs may be universal names or company URLs (e.g. the `linkedin_url` of an
+        Apollo organization); repeated ones are fetched once. The universalName finder
+        takes a single name, so every company is one request, paced and cached as
+        Linkedin.get_company() is.
+
+        :param public_ids: LinkedIn public IDs or URLs of the companies
+        :type public_ids: list
+        :param concurrency: Maximum number of companies fetched at the same time
+        :type concurrency: int, optional
+
+        :raises ChallengeException, UnauthorizedException, ThrottledException, CircuitOpenException:
+            if the account fails, since every remaining lookup would fail the same way
+
+        :return: Companies in the order of `public_ids` (None for the ones that failed),
+            and the error of every ID that failed
+        :rtype: tuple
+        """
+        return self._fetch_many(
+            "company", public_ids, get_universal_name, self.get_company, concurrency
+        )
+
     def follow_company(self, following_state_urn, following=True):
         """Follow a company from its ID.
 
@@ -1219,7 +1733,7 @@ class Linkedin(object):
             keyVersion=LEGACY_INBOX&q=participants&recipients=List({profile_urn_id})"
         )
 
-        data = res.json()
+        data = self._decode(res)
 
         if data["elements"] == []:
             return {}
@@ -1239,7 +1753,7 @@ class Linkedin(object):
 
         res = self._fetch(f"/messaging/conversations", params=params)
 
-        return res.json()
+        return self._decode(res)
 
     def get_conversation(self, conversation_urn_id: str):
         """Fetch data about a given conversation.
@@ -1252,7 +1766,7 @@ class Linkedin(object):
         """
         res = self._fetch(f"/messaging/conversations/{conversation_urn_id}/events")
 
-        return res.json()
+        return self._decode(res)
 
     def send_message(
         self,
@@ -1342,7 +1856,7 @@ class Linkedin(object):
         me_profile = self.client.metadata.get("me", {})
         if not self.client.metadata.get("me") or not use_cache:
             res = self._fetch(f"/me")
-            me_profile = res.json()
+            me_profile = self._decode(res)
             # cache profile
             self.client.metadata["me"] = me_profile
 
@@ -1374,7 +1888,7 @@ class Linkedin(object):
         if res.status_code != 200:
             return []
 
-        response_payload = res.json()
+        response_payload = self._decode(res)
         return [element["invitation"] for element in response_payload["elements"]]
 
     def reply_invitation(
@@ -1503,7 +2017,7 @@ class Linkedin(object):
         if res.status_code != 200:
             return {}
 
-        data = res.json()
+        data = self._decode(res)
         return data.get("data", {})
 
     def get_profile_member_badges(self, public_profile_id: str):
@@ -1522,7 +2036,7 @@ class Linkedin(object):
         if res.status_code != 200:
             return {}
 
-        data = res.json()
+        data = self._decode(res)
         return data.get("data", {})
 
     def get_profile_network_info(self, public_profile_id: str):
@@ -1548,7 +2062,7 @@ class Linkedin(object):
         if res.status_code != 200:
             return {}
 
-        data = res.json()
+        data = self._decode(res)
         return data.get("data", {})
 
     def unfollow_entity(self, urn_id: str):
@@ -1627,11 +2141,13 @@ class Linkedin(object):
             - ['included']. List with all the posts attributes, but not sorted as
             'Recent' and including promoted posts
             """
-            l_raw_posts = res.json().get("included", {})
-            l_raw_urns = res.json().get("data", {}).get("*elements", [])
+            payload = NormalizedPayload(self._decode(res), self.entities)
+            # Updates of this page sent with an earlier one come from self.entities
+            l_raw_posts = payload.with_references("elements")
+            l_raw_urns = payload.data.get("*elements", [])
 
-            l_new_posts = parse_list_raw_posts(
-                l_raw_posts, self.client.LINKEDIN_BASE_URL
+            l_new_posts = self._parse(
+                res, parse_list_raw_posts, l_raw_posts, self.client.LINKEDIN_BASE_URL
             )
             l_posts.extend(l_new_posts)
 
@@ -1682,7 +2198,7 @@ class Linkedin(object):
 
         res = self._fetch(f"/jobs/jobPostings/{job_id}", params=params)
 
-        data = res.json()
+        data = self._decode(res)
 
         if data and "status" in data and data["status"] != 200:
             self.logger.info("request failed: {}".format(data["message"]))
@@ -1703,39 +2219,50 @@ class Linkedin(object):
 
         # Note: This may need to be updated to GraphQL in the future, see https://github.com/tomquirk/linkedin-api/pull/309
         """
-
         if results is None:
             results = []
 
+        start = encode_cursor("post_reactions", urn_id, len(results))
+        for elements in self._checkpointed(
+            "post_reactions",
+            {"target": urn_id, "max_results": max_results, "start": len(results)},
+            lambda cursor: self.iter_post_reactions(
+                urn_id, max_results=max_results, cursor=cursor or start
+            ),
+        ):
+            results.extend(elements)
+
+        return results
+
+    def iter_post_reactions(
+        self, urn_id, max_results=None, cursor=None
+    ) -> Iterator[Page]:
+        """Fetch social reactions for a given LinkedIn post, page by page.
+
+        :param urn_id: LinkedIn URN ID for a post
+        :type urn_id: str
+        :param max_results: Stop once this many reactions were returned
+        :type max_results: int, optional
+        :param cursor: Cursor of the last page handled by an earlier crawl, to resume after it
+        :type cursor: str, optional
+
+        :return: Generator of pages of social reactions, each with the cursor of the next page
+        :rtype: generator
+        """
         params = {
             "decorationId": "com.linkedin.voyager.dash.deco.social.ReactionsByTypeWithProfileActions-13",
             "count": 10,
             "q": "reactionType",
-            "start": len(results),
             "threadUrn": urn_id,
         }
 
-        res = self._fetch("/voyagerSocialDashReactions", params=params)
-
-        data = res.json()
-
-        if (
-            len(data["elements"]) == 0
-            or (max_results is not None and len(results) >= max_results)
-            or (
-                max_results is not None
-                and len(results) / max_results >= Linkedin._MAX_REPEATED_REQUESTS
-            )
-        ):
-            return results
-
-        results.extend(data["elements"])
-        self.logger.debug(f"results grew: {len(results)}")
-
-        return self.get_post_reactions(
-            urn_id=urn_id,
-            results=results,
+        return self._iter_offset_pages(
+            "post_reactions",
+            urn_id,
+            "/voyagerSocialDashReactions",
+            params,
             max_results=max_results,
+            cursor=cursor,
         )
 
     def react_to_post(self, post_urn_id, reaction_type="LIKE"):
@@ -1775,7 +2302,7 @@ class Linkedin(object):
             f"/voyagerAssessmentsDashJobSkillMatchInsight/urn%3Ali%3Afsd_jobSkillMatchInsight%3A{job_id}",
             params=params,
         )
-        data = res.json()
+        data = self._decode(res)
 
         if data and "status" in data and data["status"] != 200:
             self.logger.info("request failed: {}".format(data.get("message")))
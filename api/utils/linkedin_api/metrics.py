@@ -0,0 +1,235 @@
+"""
+In-process instrumentation of the LinkedIn clients.
+
+Every request records, against its logical endpoint (the URI with IDs replaced by
+`{id}`), how long it waited for the pacer, its wall latency, response size and status
+code; decoding the body and parsing it into the returned structure are timed too.
+Observations go into fixed-bucket histograms that `/metrics` exports, and to any hook
+registered with `add_hook()`. Each worker process keeps its own numbers.
+"""
+
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+EVADE_SECONDS = "evade_seconds"
+LATENCY_SECONDS = "latency_seconds"
+RESPONSE_BYTES = "response_bytes"
+DECODE_SECONDS = "decode_seconds"
+PARSE_SECONDS = "parse_seconds"
+
+SECONDS_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+)
+BYTES_BUCKETS = tuple(1024 * 4**i for i in range(8))  # 1 KiB .. 16 MiB
+
+_BUCKETS = {
+    EVADE_SECONDS: SECONDS_BUCKETS,
+    LATENCY_SECONDS: SECONDS_BUCKETS,
+    RESPONSE_BYTES: BYTES_BUCKETS,
+    DECODE_SECONDS: SECONDS_BUCKETS,
+    PARSE_SECONDS: SECONDS_BUCKETS,
+}
+
+_API_PREFIX = "/voyager/api"
+# Path segments following these are identifiers even when they look like words
+_ID_PARENTS = ("profiles", "conversations", "jobPostings", "invitations")
+_ID_SEGMENT = re.compile(r"\d|:|%3A|\(")
+
+
+def endpoint_name(uri: str) -> str:
+    """
+    Logical endpoint of a URI or URL, e.g. `/identity/profiles/{id}/profileView`.
+
+    GraphQL calls are told apart by the name of their query, e.g.
+    `/graphql:voyagerSearchDashClusters`.
+    """
+    parts = urlsplit(uri)
+    path = parts.path
+    if path.startswith(_API_PREFIX):
+        path = path[len(_API_PREFIX) :]
+
+    segments = path.split("/")
+    for i, segment in enumerate(segments):
+        if i and (segments[i - 1] in _ID_PARENTS or _ID_SEGMENT.search(segment)):
+            segments[i] = "{id}"
+    name = "/".join(segments)
+
+    query_id = parse_qs(parts.query).get("queryId")
+    if query_id:
+        name += ":" + query_id[0].split(".")[0]
+    return name
+
+
+class Histogram(object):
+    """Cumulative bucket histogram, in the Prometheus sense"""
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                break
+        else:
+            i = len(self.bounds)
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+
+class RequestMetrics(object):
+    """
+    Histograms of the requests of one or more clients, per logical endpoint.
+
+    Hooks are called as `hook(endpoint, metric, value)` for every observation, and
+    `hook(endpoint, "status", status_code)` for every response.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._statuses: Dict[Tuple[str, int], int] = {}
+        self._hooks: List[Callable[[str, str, float], None]] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[str, str, float], None]):
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[str, str, float], None]):
+        self._hooks.remove(hook)
+
+    def _call_hooks(self, endpoint: str, metric: str, value):
+        for hook in self._hooks:
+            hook(endpoint, metric, value)
+
+    def observe(self, endpoint: str, metric: str, value: float):
+        with self._lock:
+            histogram = self._histograms.get((endpoint, metric))
+            if histogram is None:
+                histogram = self._histograms[(endpoint, metric)] = Histogram(
+                    _BUCKETS[metric]
+                )
+            histogram.observe(value)
+        self._call_hooks(endpoint, metric, value)
+
+    def observe_response(
+        self,
+        endpoint: str,
+        status_code: int,
+        evade_seconds: float,
+        latency_seconds: float,
+        response_bytes: int,
+    ):
+        with self._lock:
+            key = (endpoint, status_code)
+            self._statuses[key] = self._statuses.get(key, 0) + 1
+        self._call_hooks(endpoint, "status", status_code)
+        self.observe(endpoint, EVADE_SECONDS, evade_seconds)
+        self.observe(endpoint, LATENCY_SECONDS, latency_seconds)
+        self.observe(endpoint, RESPONSE_BYTES, response_bytes)
+
+    @contextmanager
+    def timer(self, endpoint: str, metric: str):
+        """Time the body of the `with` block into `metric` of `endpoint`"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(endpoint, metric, time.perf_counter() - started)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._statuses.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """{endpoint: {metric: summary, "status": {code: count}}}"""
+        result: Dict[str, Dict] = {}
+        with self._lock:
+            for (endpoint, metric), histogram in self._histograms.items():
+                result.setdefault(endpoint, {})[metric] = histogram.snapshot()
+            for (endpoint, status_code), count in self._statuses.items():
+                result.setdefault(endpoint, {}).setdefault("status", {})[
+                    str(status_code)
+                ] = count
+        return result
+
+    def render_prometheus(self, prefix: str = "linkedin_api") -> str:
+        """The histograms and status counters in the Prometheus text format"""
+        lines = []
+        with self._lock:
+            metrics = sorted({metric for _, metric in self._histograms})
+            for metric in metrics:
+                name = f"{prefix}_{metric}"
+                lines.append(f"# TYPE {name} histogram")
+                for (endpoint, m), histogram in sorted(self._histograms.items()):
+                    if m != metric:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(
+                            f'{name}_bucket{{endpoint="{endpoint}",le="{bound}"}} {cumulative}'
+                        )
+                    lines.append(
+                        f'{name}_bucket{{endpoint="{endpoint}",le="+Inf"}} {histogram.count}'
+                    )
+                    lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+                    lines.append(
+                        f'{name}_count{{endpoint="{endpoint}"}} {histogram.count}'
+                    )
+
+            if self._statuses:
+                name = f"{prefix}_responses_total"
+                lines.append(f"# TYPE {name} counter")
+                for (endpoint, status_code), count in sorted(self._statuses.items()):
+                    lines.append(
+                        f'{name}{{endpoint="{endpoint}",status="{status_code}"}} {count}'
+                    )
+        return "\n".join(lines) + "\n"
+
+
+# Shared by every client of the process unless one is given its own
+METRICS = RequestMetrics()
@@ -0,0 +1,471 @@
+"""
+Compact typed records of LinkedIn profiles.
+
+`Linkedin.get_profile()` returns the profileView payload massaged into a dict that
+keeps every raw voyager field. Batch jobs holding tens of thousands of profiles only
+use a few of them, so `get_profile(typed=True)` decodes the payload straight into the
+slotted records below instead, keeping the fields callers read and dropping the rest
+with the payload. Low cardinality strings (company, school, skill, location and
+industry names) are interned, so profiles share them. `to_dict()` gives back the keys
+`get_profile()` returns for the fields a record keeps.
+
+`get_profile(lazy=True)` goes further for crawls reading a couple of fields: its
+`LazyProfile` keeps the response body and decodes a section only when it is read.
+"""
+
+import json
+import re
+import sys
+from dataclasses import dataclass, fields
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+from api.utils import json_codec
+from api.utils.linkedin_api.utils.helpers import get_id_from_urn
+
+# (year, month), month being None for year-only dates
+YearMonth = Tuple[int, Optional[int]]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def _year_month(date: Optional[Dict]) -> Optional[YearMonth]:
+    year = date.get("year") if date else None
+    return None if year is None else (year, date.get("month"))
+
+
+def _date_dict(date: Optional[YearMonth]) -> Optional[Dict]:
+    if date is None:
+        return None
+    year, month = date
+    return {"month": month, "year": year} if month else {"year": year}
+
+
+def _time_period(element: Dict) -> Tuple[Optional[YearMonth], Optional[YearMonth]]:
+    time_period = element.get("timePeriod") or {}
+    return (
+        _year_month(time_period.get("startDate")),
+        _year_month(time_period.get("endDate")),
+    )
+
+
+def _compact(d: Dict) -> Dict:
+    """Drop the None values, which voyager leaves out rather than sending"""
+    return {key: value for key, value in d.items() if value is not None}
+
+
+def _time_period_dict(
+    start_date: Optional[YearMonth], end_date: Optional[YearMonth]
+) -> Optional[Dict]:
+    time_period = _compact(
+        {"startDate": _date_dict(start_date), "endDate": _date_dict(end_date)}
+    )
+    return time_period or None
+
+
+def _vector_image_root(image: Optional[Dict]) -> Optional[str]:
+    vector_image = (image or {}).get("com.linkedin.common.VectorImage")
+    return vector_image.get("rootUrl") if vector_image else None
+
+
+def _without_urn(elements: List[Dict]) -> Tuple[Dict, ...]:
+    return tuple(
+        {key: value for key, value in element.items() if key != "entityUrn"}
+        for element in elements
+    )
+
+
+@dataclass(slots=True)
+class Position:
+    title: Optional[str] = None
+    company_name: Optional[str] = None
+    company_urn: Optional[str] = None
+    company_logo_url: Optional[str] = None
+    location_name: Optional[str] = None
+    description: Optional[str] = None
+    start_date: Optional[YearMonth] = None
+    end_date: Optional[YearMonth] = None
+
+    @classmethod
+    def from_element(cls, element: Dict) -> "Position":
+        """Decode an element of the `positionView` of a profileView response"""
+        mini_company = (element.get("company") or {}).get("miniCompany") or {}
+        return cls(
+            element.get("title"),
+            _intern(element.get("companyName")),
+            element.get("companyUrn"),
+            _vector_image_root(mini_company.get("logo")),
+            _intern(element.get("locationName")),
+            element.get("description"),
+            *_time_period(element),
+        )
+
+    @property
+    def current(self) -> bool:
+        """Whether the position has no end date"""
+        return self.end_date is None
+
+    def to_dict(self) -> Dict:
+        return _compact(
+            {
+                "title": self.title,
+                "companyName": self.company_name,
+                "companyUrn": self.company_urn,
+                "companyLogoUrl": self.company_logo_url,
+                "locationName": self.location_name,
+                "description": self.description,
+                "timePeriod": _time_period_dict(self.start_date, self.end_date),
+            }
+        )
+
+
+@dataclass(slots=True)
+class Education:
+    school_name: Optional[str] = None
+    school_urn: Optional[str] = None
+    degree_name: Optional[str] = None
+    field_of_study: Optional[str] = None
+    start_date: Optional[YearMonth] = None
+    end_date: Optional[YearMonth] = None
+
+    @classmethod
+    def from_element(cls, element: Dict) -> "Education":
+        """Decode an element of the `educationView` of a profileView response"""
+        return cls(
+            _intern(element.get("schoolName")),
+            element.get("schoolUrn"),
+            _intern(element.get("degreeName")),
+            _intern(element.get("fieldOfStudy")),
+            *_time_period(element),
+        )
+
+    def to_dict(self) -> Dict:
+        return _compact(
+            {
+                "schoolName": self.school_name,
+                "schoolUrn": self.school_urn,
+                "degreeName": self.degree_name,
+                "fieldOfStudy": self.field_of_study,
+                "timePeriod": _time_period_dict(self.start_date, self.end_date),
+            }
+        )
+
+
+@dataclass(slots=True)
+class Skill:
+    name: str
+
+    @classmethod
+    def from_element(cls, element: Dict) -> "Skill":
+        """Decode an element of the `skillView` of a profileView response"""
+        return cls(_intern(element.get("name", "")))
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name}
+
+
+@dataclass(slots=True)
+class Certification:
+    name: Optional[str] = None
+    authority: Optional[str] = None
+    license_number: Optional[str] = None
+    url: Optional[str] = None
+    start_date: Optional[YearMonth] = None
+    end_date: Optional[YearMonth] = None
+
+    @classmethod
+    def from_element(cls, element: Dict) -> "Certification":
+        """Decode an element of the `certificationView` of a profileView response"""
+        return cls(
+            element.get("name"),
+            _intern(element.get("authority")),
+            element.get("licenseNumber"),
+            element.get("url"),
+            *_time_period(element),
+        )
+
+    def to_dict(self) -> Dict:
+        return _compact(
+            {
+                "name": self.name,
+                "authority": self.authority,
+                "licenseNumber": self.license_number,
+                "url": self.url,
+                "timePeriod": _time_period_dict(self.start_date, self.end_date),
+            }
+        )
+
+
+def _top_card(profile: Dict) -> Dict:
+    """Profile fields held by the `profile` section of a profileView response"""
+    mini_profile = profile.get("miniProfile") or {}
+    return {
+        "urn_id": profile["entityUrn"].replace("urn:li:fs_profile:", ""),
+        "profile_id": (
+            get_id_from_urn(mini_profile["entityUrn"])
+            if "entityUrn" in mini_profile
+            else None
+        ),
+        "profile_urn": mini_profile.get("entityUrn"),
+        "member_urn": mini_profile.get("objectUrn"),
+        "public_id": mini_profile.get("publicIdentifier"),
+        "first_name": profile.get("firstName"),
+        "last_name": profile.get("lastName"),
+        "headline": profile.get("headline"),
+        "summary": profile.get("summary"),
+        "industry_name": _intern(profile.get("industryName")),
+        "location_name": _intern(profile.get("locationName")),
+        "geo_location_name": _intern(profile.get("geoLocationName")),
+        "geo_country_name": _intern(profile.get("geoCountryName")),
+        "display_picture_url": _vector_image_root(mini_profile.get("picture")),
+    }
+
+
+def _skills(elements: List[Dict]) -> Tuple["Skill", ...]:
+    return tuple(Skill(sys.intern(skill.get("name", ""))) for skill in elements)
+
+
+# Profile field of every section, with the profileView key it is decoded from and
+# the decoder of the elements of that key
+PROFILE_SECTIONS: Dict[str, Tuple[str, Callable[[List[Dict]], Tuple]]] = {
+    "experience": ("positionView", lambda e: tuple(map(Position.from_element, e))),
+    "education": ("educationView", lambda e: tuple(map(Education.from_element, e))),
+    "skills": ("skillView", _skills),
+    "certifications": (
+        "certificationView",
+        lambda e: tuple(map(Certification.from_element, e)),
+    ),
+    "languages": ("languageView", _without_urn),
+    "publications": ("publicationView", _without_urn),
+    "volunteer": ("volunteerExperienceView", _without_urn),
+    "honors": ("honorView", _without_urn),
+    "projects": ("projectView", _without_urn),
+}
+
+# Name of the section holding the fields of the `profile` key of a profileView
+TOP_CARD = "top_card"
+PROFILE_SECTION_NAMES = (TOP_CARD, *PROFILE_SECTIONS)
+
+
+@dataclass(slots=True)
+class Profile:
+    urn_id: Optional[str] = None
+    profile_id: Optional[str] = None
+    profile_urn: Optional[str] = None
+    member_urn: Optional[str] = None
+    public_id: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    headline: Optional[str] = None
+    summary: Optional[str] = None
+    industry_name: Optional[str] = None
+    location_name: Optional[str] = None
+    geo_location_name: Optional[str] = None
+    geo_country_name: Optional[str] = None
+    display_picture_url: Optional[str] = None
+    experience: Tuple[Position, ...] = ()
+    education: Tuple[Education, ...] = ()
+    skills: Tuple[Skill, ...] = ()
+    certifications: Tuple[Certification, ...] = ()
+    # Rarely read sections, kept as voyager sends them, less their entity URNs
+    languages: Tuple[Dict, ...] = ()
+    publications: Tuple[Dict, ...] = ()
+    volunteer: Tuple[Dict, ...] = ()
+    honors: Tuple[Dict, ...] = ()
+    projects: Tuple[Dict, ...] = ()
+
+    @classmethod
+    def from_profile_view(cls, data: Dict) -> "Profile":
+        """Decode a profileView response, without modifying it
+
+        :param data: a dict, as returned by res.json()
+        :type data: dict
+
+        :return: Profile
+        :rtype: Profile
+        """
+        profile = cls(**_top_card(data["profile"]))
+        for field, (view, decode) in PROFILE_SECTIONS.items():
+            setattr(profile, field, decode((data.get(view) or {}).get("elements", [])))
+        return profile
+
+    @classmethod
+    def from_sections(
+        cls,
+        top_card: Optional[Dict],
+        sections: Dict[str, List[Dict]],
+        ids: Optional[Dict[str, str]] = None,
+    ) -> "Profile":
+        """Assemble a Profile from sections fetched on their own
+
+        :param top_card: The profile object, as `/identity/profiles/{id}` returns it
+        :type top_card: dict, optional
+        :param sections: Elements of some of the PROFILE_SECTIONS, by name
+        :type sections: dict
+        :param ids: Profile fields (e.g. `public_id`) to set when there is no top card
+        :type ids: dict, optional
+
+        :return: Profile
+        :rtype: Profile
+        """
+        profile = cls(**_top_card(top_card)) if top_card else cls(**(ids or {}))
+        for field, elements in sections.items():
+            setattr(profile, field, PROFILE_SECTIONS[field][1](elements))
+        return profile
+
+    @property
+    def current_position(self) -> Optional[Position]:
+        """The first position without an end date, if any"""
+        return next((p for p in self.experience if p.current), None)
+
+    def to_dict(self) -> Dict:
+        """The keys of Linkedin.get_profile() for the fields the record keeps"""
+        return _compact(
+            {
+                "urn_id": self.urn_id,
+                "profile_id": self.profile_id,
+                "profile_urn": self.profile_urn,
+                "member_urn": self.member_urn,
+                "public_id": self.public_id,
+                "firstName": self.first_name,
+                "lastName": self.last_name,
+                "headline": self.headline,
+                "summary": self.summary,
+                "industryName": self.industry_name,
+                "locationName": self.location_name,
+                "geoLocationName": self.geo_location_name,
+                "geoCountryName": self.geo_country_name,
+                "displayPictureUrl": self.display_picture_url,
+                "experience": [position.to_dict() for position in self.experience],
+                "education": [education.to_dict() for education in self.education],
+                "skills": [skill.to_dict() for skill in self.skills],
+                "certifications": [c.to_dict() for c in self.certifications],
+                "languages": list(self.languages),
+                "publications": list(self.publications),
+                "volunteer": list(self.volunteer),
+                "honors": list(self.honors),
+                "projects": list(self.projects),
+            }
+        )
+
+
+_TOP_CARD_FIELDS = frozenset(field.name for field in fields(Profile)) - set(
+    PROFILE_SECTIONS
+)
+_SECTION_DECODER = json.JSONDecoder()
+# Where the value of any key LazyProfile decodes on its own starts
+_SECTION_KEYS = re.compile(
+    '"(%s)"\\s*:\\s*'
+    % "|".join(sorted({view for view, _ in PROFILE_SECTIONS.values()} | {"profile"}))
+)
+
+
+class LazyProfile(object):
+    """
+    Profile decoded from a raw profileView body one section at a time.
+
+    Reading a field decodes the section holding it the first time, and only that
+    section: the top card fields (names, headline, location...) come from `profile`,
+    `experience` from `positionView`, and so on, and decoded sections are memoized.
+    A crawl reading headlines and locations never parses positions, skills or
+    education. The body is scanned once for where every section starts, on first
+    access. It is kept until the instance is dropped, so use `to_profile()` to hold
+    on to many profiles.
+
+    :param body: Body of a profileView response
+    :type body: bytes
+    """
+
+    __slots__ = ("body", "_top_card", "_sections", "_payload", "_text", "_offsets")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._top_card: Optional[Dict] = None
+        self._sections: Dict[str, Tuple] = {}
+        self._payload: Optional[Dict] = None
+        self._text: Optional[str] = None
+        # Offsets of the values of the keys in _SECTION_KEYS, by key
+        self._offsets: Optional[Dict[str, List[int]]] = None
+
+    def _decode_key(self, key: str, is_section: Callable[[Dict], bool]) -> Dict:
+        """Decode the value of the top level `key` of the body, on its own if possible"""
+        if self._payload is None:
+            if self._offsets is None:
+                self._text = self.body.decode("utf-8")
+                self._offsets = {}
+                for match in _SECTION_KEYS.finditer(self._text):
+                    self._offsets.setdefault(match.group(1), []).append(match.end())
+            for offset in self._offsets.get(key, ()):
+                try:
+                    value, _ = _SECTION_DECODER.raw_decode(self._text, offset)
+                except ValueError:
+                    continue
+                # A nested key of the same name would not pass for the section
+                if isinstance(value, dict) and is_section(value):
+                    return value
+            self._decode_body()
+        return self._payload.get(key) or {}
+
+    def _decode_body(self):
+        self._payload = json_codec.loads(self.body)
+        # Every section now comes from the payload
+        self._text = self._offsets = None
+
+    def __getattr__(self, name: str):
+        if name in PROFILE_SECTIONS:
+            if name not in self._sections:
+                view, decode = PROFILE_SECTIONS[name]
+                elements = self._decode_key(
+                    view, lambda value: isinstance(value.get("elements"), list)
+                ).get("elements", [])
+                self._sections[name] = decode(elements)
+            return self._sections[name]
+
+        if name in _TOP_CARD_FIELDS:
+            if self._top_card is None:
+                profile = self._decode_key(
+                    "profile",
+                    lambda value: str(value.get("entityUrn")).startswith(
+                        "urn:li:fs_profile:"
+                    ),
+                )
+                # A body without a profile object leaves the top card fields unset,
+                # as Profile.from_sections() does without a top card
+                self._top_card = (
+                    _top_card(profile)
+                    if "entityUrn" in profile
+                    else dict.fromkeys(_TOP_CARD_FIELDS)
+                )
+            return self._top_card[name]
+
+        raise AttributeError(name)
+
+    @property
+    def current_position(self) -> Optional[Position]:
+        """The first position without an end date, if any"""
+        return next((p for p in self.experience if p.current), None)
+
+    def to_profile(self, sections: Optional[Collection[str]] = None) -> Profile:
+        """Decode every section, or only `sections`, into a Profile no longer holding the body
+
+        :param sections: Names among PROFILE_SECTION_NAMES, "top_card" standing for the
+            top card fields
+        :type sections: collection, optional
+        """
+        sections = PROFILE_SECTION_NAMES if sections is None else sections
+        wanted = [field for field in PROFILE_SECTIONS if field in sections]
+        if self._payload is None and len(set(wanted) - set(self._sections)) > 2:
+            # Past a couple of sections, one full decode beats locating each of them
+            self._decode_body()
+
+        top_card = TOP_CARD in sections
+        profile = Profile(
+            **{field: getattr(self, field) for field in _TOP_CARD_FIELDS if top_card}
+        )
+        for field in wanted:
+            setattr(profile, field, getattr(self, field))
+        return profile
+
+    def to_dict(self) -> Dict:
+        return self.to_profile().to_dict()
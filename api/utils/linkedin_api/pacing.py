@@ -0,0 +1,182 @@
+"""
+Request pacing for the LinkedIn clients.
+
+Replaces the fixed random sleep of `default_evade` with token buckets: requests go
+out immediately while an endpoint class has budget left, and are only delayed (plus
+some jitter) once that budget is used up.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+
+SEARCH = "search"
+PROFILE = "profile"
+FEED = "feed"
+MESSAGING = "messaging"
+DEFAULT = "default"
+
+# Checked in order, first match wins. `profileUpdatesV2` lives under /identity/
+# but is a feed, so feeds are matched before profiles.
+_ENDPOINT_CLASS_MARKERS = (
+    (MESSAGING, ("/messaging/", "/relationships/", "/growth/")),
+    (SEARCH, ("voyagerSearchDashClusters", "/voyagerJobsDashJobCards", "/search/")),
+    (
+        FEED,
+        ("/feed/", "/voyagerSocialDash", "/identity/profileUpdatesV2"),
+    ),
+    (
+        PROFILE,
+        (
+            "/identity/",
+            "voyagerIdentityDashProfileComponents",
+            "/organization/",
+            "/jobs/",
+            "/voyagerAssessmentsDash",
+            "/me",
+        ),
+    ),
+)
+
+
+def classify_endpoint(uri: str) -> str:
+    """
+    Return the endpoint class (search, profile, feed, messaging or default) of a URI.
+    """
+    for endpoint_class, markers in _ENDPOINT_CLASS_MARKERS:
+        if any(marker in uri for marker in markers):
+            return endpoint_class
+    return DEFAULT
+
+
+class Budget(NamedTuple):
+    """Sustained request rate and burst size of an endpoint class."""
+
+    per_minute: float
+    burst: int
+
+
+class TokenBucket(object):
+    """
+    Thread-safe token bucket.
+
+    `reserve()` always takes a token, letting the balance go negative, and returns
+    how long the caller has to wait before its token is actually available. This way
+    concurrent callers queue up behind each other instead of all waking at once.
+    """
+
+    def __init__(self, budget: Budget):
+        self.rate = budget.per_minute / 60.0
+        self.burst = budget.burst
+        self._tokens = float(budget.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated_at
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Take `tokens` and return the delay in seconds until they are available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative if requests are queued)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+
+class RequestPacer(object):
+    """
+    Per endpoint class token buckets with jitter.
+
+    :param budgets: Budget per endpoint class, merged over `DEFAULT_BUDGETS`
+    :type budgets: dict, optional
+    :param jitter: Bounds in seconds of the random delay added when a request has to wait
+    :type jitter: tuple, optional
+    :param ledger: Shared ledger to keep the buckets in, e.g. ledger.SharedRateLedger. In-memory if omitted
+    :type ledger: SharedRateLedger, optional
+    :param account: Account the buckets belong to in the ledger
+    :type account: str, optional
+    """
+
+    DEFAULT_BUDGETS: Dict[str, Budget] = {
+        SEARCH: Budget(per_minute=10, burst=5),
+        PROFILE: Budget(per_minute=20, burst=10),
+        FEED: Budget(per_minute=20, burst=10),
+        MESSAGING: Budget(per_minute=6, burst=3),
+        DEFAULT: Budget(per_minute=15, burst=5),
+    }
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, Budget]] = None,
+        jitter: Tuple[float, float] = (0.5, 2.0),
+        ledger=None,
+        account: str = "",
+    ):
+        self.budgets = {**RequestPacer.DEFAULT_BUDGETS, **(budgets or {})}
+        self.jitter = jitter
+        self.ledger = ledger
+        self.account = account
+        self._buckets = {
+            endpoint_class: (
+                ledger.bucket(account, endpoint_class, budget)
+                if ledger is not None
+                else TokenBucket(budget)
+            )
+            for endpoint_class, budget in self.budgets.items()
+        }
+
+    def _bucket(self, endpoint_class: str) -> TokenBucket:
+        return self._buckets.get(endpoint_class) or self._buckets[DEFAULT]
+
+    def delay(self, endpoint_class: str = DEFAULT) -> float:
+        """Reserve one request of `endpoint_class` and return how long to wait for it"""
+        wait = self._bucket(endpoint_class).reserve()
+        if wait > 0:
+            wait += random.uniform(*self.jitter)
+        return wait
+
+    def acquire(self, endpoint_class: str = DEFAULT):
+        """Block until a request of `endpoint_class` may be sent"""
+        wait = self.delay(endpoint_class)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, endpoint_class: str = DEFAULT):
+        """Asyncio counterpart of `acquire`
+
+        Reservations in a ledger are SQLite transactions that can wait on other
+        processes, so they run in a worker thread instead of blocking the event loop.
+        """
+        if self.ledger is not None:
+            wait = await asyncio.to_thread(self.delay, endpoint_class)
+        else:
+            wait = self.delay(endpoint_class)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def tokens_left(self, endpoint_class: Optional[str] = None):
+        """
+        Return the requests that can be sent right now without waiting.
+
+        :param endpoint_class: Endpoint class to report on. If omitted, a dict of all classes is returned
+        :type endpoint_class: str, optional
+        """
+        if endpoint_class is not None:
+            return max(0.0, self._bucket(endpoint_class).available)
+        return {
+            endpoint_class: max(0.0, bucket.available)
+            for endpoint_class, bucket in self._buckets.items()
+        }
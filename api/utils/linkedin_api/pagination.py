@@ -0,0 +1,77 @@
+"""
+Resumable offset pagination.
+
+Paginated methods exposed as `iter_*` yield one `Page` per response. Its `cursor` is
+an opaque token that, passed back as `cursor=` to the same method with the same
+arguments, resumes the crawl at the next page instead of the first. Feeds paginated
+by `paginationToken` keep the token of the next page in the cursor too.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, List, NamedTuple
+
+
+class Page(NamedTuple):
+    """One page of results and the cursor of the page after it"""
+
+    elements: List
+    cursor: str
+
+
+def query_digest(query: Any) -> str:
+    """Short stable digest of a JSON-able query, to tell crawls apart"""
+    raw = json.dumps(query, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class Cursor(NamedTuple):
+    """Where a crawl resumes: the offset and, if any, the pagination token"""
+
+    start: int
+    token: str = ""
+
+
+def encode_cursor(kind: str, target: str, start: int, token: str = "") -> str:
+    """
+    Return the cursor resuming the `kind` crawl of `target` at offset `start`.
+
+    :param kind: Paginated method the cursor belongs to, e.g. "company_updates"
+    :type kind: str
+    :param target: Identifier of what is being crawled (company, profile or post)
+    :type target: str
+    :param start: Offset of the next page
+    :type start: int
+    :param token: `paginationToken` of the next page, for feeds that use one
+    :type token: str, optional
+
+    :return: Opaque URL safe token
+    :rtype: str
+    """
+    state = {"k": kind, "t": target, "s": start}
+    if token:
+        state["p"] = token
+    encoded = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, target: str) -> Cursor:
+    """
+    Return the offset and pagination token a cursor resumes at.
+
+    :raises ValueError: if the cursor is malformed or belongs to another crawl
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        resumed = Cursor(int(state["s"]), str(state.get("p", "")))
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor!r}") from e
+
+    if state.get("k") != kind or state.get("t") != target:
+        raise ValueError(
+            f"Cursor belongs to the {state.get('k')} crawl of {state.get('t')}, "
+            f"not the {kind} crawl of {target}"
+        )
+    return resumed
@@ -0,0 +1,250 @@
+"""
+Pool of authenticated LinkedIn accounts.
+
+Each account keeps its own session, cookie jar and rate budget. Calls go to the
+least loaded healthy account, and accounts that get challenged or logged out are
+quarantined for a while so the remaining ones keep serving.
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from api.utils.linkedin_api.client import (
+    ChallengeException,
+    CircuitOpenException,
+    ThrottledException,
+    UnauthorizedException,
+)
+from api.utils.linkedin_api.linkedin import Linkedin
+
+logger = logging.getLogger("API." + __name__)
+
+# Reads return the same whichever account sends them, so they can move to another one
+_READ_PREFIXES = ("get_", "search", "iter_")
+# Reads of the account's own inbox, invitations, profile, views and feed
+ACCOUNT_BOUND_READS = frozenset(
+    {
+        "get_conversation",
+        "get_conversation_details",
+        "get_conversations",
+        "get_current_profile_views",
+        "get_feed_posts",
+        "get_invitations",
+        "get_user_profile",
+    }
+)
+
+
+def is_pooled_method(name: str) -> bool:
+    """Whether `Linkedin.<name>` can be sent by any account of a pool"""
+    return name.startswith(_READ_PREFIXES) and name not in ACCOUNT_BOUND_READS
+
+
+class PoolExhaustedException(Exception):
+    """Raised when no account of the pool is healthy"""
+
+    pass
+
+
+class PoolMember(object):
+    """Bookkeeping of one account in a `LinkedinPool`"""
+
+    def __init__(self, username: str, linkedin: Linkedin):
+        self.username = username
+        self.linkedin = linkedin
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.quarantined_until = 0.0
+        self.last_used_at = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.quarantined_until <= now and self.linkedin.breaker.allows_request()
+
+    def status(self) -> dict:
+        return {
+            "username": self.username,
+            "healthy": self.is_healthy(time.time()),
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "failures": self.failures,
+            "quarantined_until": self.quarantined_until,
+            "tokens_left": self.linkedin.pacer.tokens_left(),
+            "breaker": self.linkedin.breaker.status(),
+        }
+
+
+class LinkedinPool(object):
+    """
+    Dispatch `Linkedin` method calls over several accounts.
+
+    The public `Linkedin` reads can be called on the pool, e.g. `pool.get_profile(...)`.
+    Writes (`send_message`, `add_connection`...) and the reads of the account's own
+    data (ACCOUNT_BOUND_READS) act as one account: they are not dispatched, and go
+    through `pool.account(username)` instead. A read that fails with `ChallengeException` or `UnauthorizedException` (including
+    401 and 999 responses) quarantines the account and is retried on another one.
+    Accounts whose circuit breaker is open are skipped, and a call that is throttled
+    or that trips the breaker moves on to another account without quarantine.
+
+    :param accounts: Authenticated Linkedin instances, one per account
+    :type accounts: list
+    :param quarantine_seconds: How long an unhealthy account is left out of rotation
+    :type quarantine_seconds: int, optional
+    """
+
+    def __init__(self, accounts: List[Linkedin], quarantine_seconds: int = 30 * 60):
+        if not accounts:
+            raise ValueError("LinkedinPool needs at least one account")
+
+        self.quarantine_seconds = quarantine_seconds
+        self.members = []
+        for linkedin in accounts:
+            self.members.append(PoolMember(linkedin.username, linkedin))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_credentials(
+        cls,
+        credentials: List[Tuple[str, str]],
+        quarantine_seconds: int = 30 * 60,
+        **kwargs,
+    ) -> "LinkedinPool":
+        """Authenticate every (username, password) pair and pool the ones that succeed
+
+        :param credentials: List of (username, password) tuples
+        :type credentials: list
+        :param kwargs: Passed on to the Linkedin constructor of each account
+        """
+        accounts = []
+        for username, password in credentials:
+            try:
+                accounts.append(Linkedin(username, password, **kwargs))
+            except (ChallengeException, UnauthorizedException) as e:
+                logger.warning(f"Leaving {username} out of the pool: {e!r}")
+        return cls(accounts, quarantine_seconds=quarantine_seconds)
+
+    def account(self, username: str) -> Linkedin:
+        """Return the Linkedin instance of `username`, for calls bound to that account"""
+        for member in self.members:
+            if member.username == username:
+                return member.linkedin
+        raise KeyError(username)
+
+    @staticmethod
+    def _check_pooled(method: str):
+        if not is_pooled_method(method):
+            raise ValueError(
+                f"{method} acts as one account, call it on pool.account(username)"
+            )
+
+    def _acquire(self, exclude: set, cause: Optional[Exception] = None) -> PoolMember:
+        """Lease the healthy account with the fewest calls in flight
+
+        Raises PoolExhaustedException, chained to `cause` (the failure of the last
+        account tried), when none is left.
+        """
+        now = time.time()
+        with self._lock:
+            candidates = [
+                m
+                for m in self.members
+                if m.is_healthy(now) and m.username not in exclude
+            ]
+            if not candidates:
+                raise PoolExhaustedException(
+                    "No healthy LinkedIn account available in the pool"
+                ) from cause
+            member = min(candidates, key=lambda m: (m.in_flight, m.last_used_at))
+            member.in_flight += 1
+            member.calls += 1
+            member.last_used_at = now
+            return member
+
+    def _release(self, member: PoolMember):
+        with self._lock:
+            member.in_flight -= 1
+
+    def quarantine(self, member: PoolMember, reason=None):
+        """Take an account out of rotation for `quarantine_seconds`"""
+        with self._lock:
+            member.failures += 1
+            member.quarantined_until = time.time() + self.quarantine_seconds
+        logger.warning(f"Quarantined LinkedIn account {member.username}: {reason!r}")
+
+    def call(self, method: str, *args, **kwargs):
+        """Call `Linkedin.<method>`, a read, on the least loaded healthy account"""
+        self._check_pooled(method)
+        tried = set()
+        last_error = None
+        while True:
+            member = self._acquire(exclude=tried, cause=last_error)
+            tried.add(member.username)
+            try:
+                return getattr(member.linkedin, method)(*args, **kwargs)
+            except (ChallengeException, UnauthorizedException) as e:
+                last_error = e
+                self.quarantine(member, e)
+            except (ThrottledException, CircuitOpenException) as e:
+                last_error = e
+                logger.info(
+                    f"Moving call off LinkedIn account {member.username}: {e!r}"
+                )
+            finally:
+                self._release(member)
+
+    def iterate(self, method: str, *args, **kwargs):
+        """Iterate `Linkedin.<method>`, a generator, on the least loaded healthy account
+
+        The account stays leased until the generator is exhausted or closed. Failures
+        before the first item move the call to another account, as `call` does; later
+        ones are raised, since part of the results were already handed out.
+        """
+        self._check_pooled(method)
+        tried = set()
+        last_error = None
+        while True:
+            member = self._acquire(exclude=tried, cause=last_error)
+            tried.add(member.username)
+            started = False
+            try:
+                for item in getattr(member.linkedin, method)(*args, **kwargs):
+                    started = True
+                    yield item
+                return
+            except (ChallengeException, UnauthorizedException) as e:
+                last_error = e
+                self.quarantine(member, e)
+                if started:
+                    raise
+            except (ThrottledException, CircuitOpenException) as e:
+                last_error = e
+                if started:
+                    raise
+                logger.info(
+                    f"Moving call off LinkedIn account {member.username}: {e!r}"
+                )
+            finally:
+                self._release(member)
+
+    def status(self) -> List[dict]:
+        """Health, load and remaining rate budget of every account"""
+        return [m.status() for m in self.members]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or not callable(getattr(Linkedin, name, None)):
+            raise AttributeError(name)
+        if not is_pooled_method(name):
+            raise AttributeError(
+                f"{name} acts as one account, call it on pool.account(username)"
+            )
+
+        dispatch = self.iterate if name.startswith("iter_") else self.call
+
+        def method(*args, **kwargs):
+            return dispatch(name, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = getattr(Linkedin, name).__doc__
+        return method
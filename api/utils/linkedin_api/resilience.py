@@ -0,0 +1,214 @@
+"""
+Retries and circuit breaking for throttled or logged out sessions.
+
+LinkedIn answers 429 when an account goes too fast and 999 when it has flagged the
+session as a bot; both get worse when retried right away. `_fetch` and `_post` retry
+them with exponential backoff (honouring Retry-After), and every account has a
+circuit breaker that, once tripped, fails requests immediately for a while so the
+pool or the caller can move the work to another account.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import NamedTuple, Optional
+
+from api.utils.linkedin_api.client import (
+    ChallengeException,
+    CircuitOpenException,
+    ThrottledException,
+    UnauthorizedException,
+)
+
+THROTTLED = "throttled"
+CHALLENGED = "challenged"
+UNAUTHORIZED = "unauthorized"
+SERVER_ERROR = "server_error"
+
+
+def classify_status(status_code: int) -> Optional[str]:
+    """Return the failure kind of a status code, or None if the response is usable"""
+    if status_code == 429:
+        return THROTTLED
+    if status_code == 999:
+        return CHALLENGED
+    if status_code == 401:
+        return UNAUTHORIZED
+    if status_code in (500, 502, 503, 504):
+        return SERVER_ERROR
+    return None
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header (delay-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def raise_for_failure(failure: str, url: str, retry_after: Optional[float] = None):
+    """Raise the exception of a failure kind; server errors are left to the caller"""
+    if failure == UNAUTHORIZED:
+        raise UnauthorizedException(url)
+    if failure == CHALLENGED:
+        raise ChallengeException(999)
+    if failure == THROTTLED:
+        raise ThrottledException(url, retry_after)
+
+
+class RetryPolicy(NamedTuple):
+    """
+    Exponential backoff of throttled requests.
+
+    The n-th retry waits `backoff * 2 ** n` seconds, capped at `max_backoff`, or the
+    Retry-After of the response if it is longer, plus up to `jitter` of that.
+    """
+
+    max_retries: int = 3
+    backoff: float = 2.0
+    max_backoff: float = 60.0
+    jitter: float = 0.25
+
+    def delay(self, failure: str, attempt: int, method: str, retry_after=None):
+        """
+        Return how long to wait before retry number `attempt`, or None to give up.
+
+        Challenged or logged out sessions are never retried; server errors only for
+        GET, as a POST may already have taken effect.
+        """
+        if attempt >= self.max_retries or failure in (CHALLENGED, UNAUTHORIZED):
+            return None
+        if failure == SERVER_ERROR and method != "GET":
+            return None
+        wait = min(self.max_backoff, self.backoff * 2**attempt)
+        if retry_after is not None:
+            wait = max(wait, retry_after)
+        return wait * (1 + random.uniform(0, self.jitter))
+
+
+class CircuitBreaker(object):
+    """
+    Per account circuit breaker.
+
+    Opens after `failure_threshold` consecutive throttled responses, or at once on a
+    challenge or a 401. While open, `before_request()` raises `CircuitOpenException`;
+    after `reset_timeout` seconds one trial request is let through (half-open) and
+    its outcome closes the circuit or opens it again, for twice as long.
+
+    :param account: Account the breaker belongs to, used in exceptions and logs
+    :type account: str, optional
+    :param failure_threshold: Consecutive throttled responses that open the circuit
+    :type failure_threshold: int, optional
+    :param reset_timeout: Seconds the circuit stays open the first time
+    :type reset_timeout: float, optional
+    :param max_reset_timeout: Upper bound of the open period as it doubles
+    :type max_reset_timeout: float, optional
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        account: str = "",
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        max_reset_timeout: float = 30 * 60.0,
+    ):
+        self.account = account
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.open_for = reset_timeout
+        self._state = CircuitBreaker.CLOSED
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == CircuitBreaker.OPEN
+                and time.time() >= self.opened_at + self.open_for
+            ):
+                return CircuitBreaker.HALF_OPEN
+            return self._state
+
+    @property
+    def retry_at(self) -> float:
+        """When requests will be let through again (0 if they are now)"""
+        with self._lock:
+            if self._state == CircuitBreaker.CLOSED:
+                return 0.0
+            return self.opened_at + self.open_for
+
+    def allows_request(self) -> bool:
+        """Whether `before_request()` would let a request through right now"""
+        state = self.state
+        return state == CircuitBreaker.CLOSED or (
+            state == CircuitBreaker.HALF_OPEN and not self._trial_in_flight
+        )
+
+    def before_request(self):
+        """Raise CircuitOpenException unless a request may be sent"""
+        with self._lock:
+            if self._state == CircuitBreaker.CLOSED:
+                return
+            if (
+                time.time() >= self.opened_at + self.open_for
+                and not self._trial_in_flight
+            ):
+                self._trial_in_flight = True
+                return
+            retry_at = self.opened_at + self.open_for
+        raise CircuitOpenException(self.account, retry_at)
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._trial_in_flight = False
+            if self._state != CircuitBreaker.CLOSED:
+                self._state = CircuitBreaker.CLOSED
+                self.open_for = self.reset_timeout
+
+    def record_failure(self, failure: str):
+        """
+        Count a failed response. Server errors (and network errors, reported as such)
+        are not the account's fault: they only free the half-open trial slot.
+        """
+        with self._lock:
+            if failure == SERVER_ERROR:
+                self._trial_in_flight = False
+                return
+            self.failures += 1
+            trial_failed = self._trial_in_flight
+            self._trial_in_flight = False
+            if trial_failed:
+                self._open(min(self.max_reset_timeout, self.open_for * 2))
+            elif failure in (CHALLENGED, UNAUTHORIZED) or (
+                self.failures >= self.failure_threshold
+            ):
+                self._open(self.open_for)
+
+    def _open(self, open_for: float):
+        self._state = CircuitBreaker.OPEN
+        self.opened_at = time.time()
+        self.open_for = open_for
+
+    def status(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_at": self.retry_at,
+        }
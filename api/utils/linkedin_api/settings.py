@@ -5,3 +5,7 @@ HOME_DIR = str(Path.home())
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 LINKEDIN_API_USER_DIR = os.path.join(HOME_DIR, ".linkedin_api/")
 COOKIE_PATH = os.path.join(LINKEDIN_API_USER_DIR, "cookies/")
+RATE_LEDGER_PATH = os.path.join(LINKEDIN_API_USER_DIR, "rate_ledger.sqlite3")
+RESPONSE_CACHE_PATH = os.path.join(LINKEDIN_API_USER_DIR, "response_cache.sqlite3")
+CHECKPOINT_PATH = os.path.join(LINKEDIN_API_USER_DIR, "checkpoints.sqlite3")
+WATERMARK_PATH = os.path.join(LINKEDIN_API_USER_DIR, "watermarks.sqlite3")
@@ -1,6 +1,19 @@
 import random
 import base64
-from typing import Dict, List
+import re
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Union
+from urllib.parse import quote, unquote
+
+from api.utils.linkedin_api.utils.normalized import EntityStore, NormalizedPayload
+
+_FEED_UPDATE_PATH = "/feed/update/"
+_PROFILE_URL = re.compile(r"linkedin\.com/in/([^/?#]+)")
+_ACTIVITY_URN = re.compile(r"urn:li:activity:(\d+)")
+_ORGANIZATION_URL = re.compile(r"linkedin\.com/(?:company|school|showcase)/([^/?#]+)")
+_POSITION_GROUP_URN = re.compile(
+    r"urn:li:fsd_profilePositionGroup:\([A-z0-9]+,[A-z0-9]+\)"
+)
 
 
 def get_id_from_urn(urn: str):
@@ -12,6 +25,35 @@ def get_id_from_urn(urn: str):
     return urn.split(":")[3]
 
 
+def get_profile_id(public_id_or_urn: str) -> str:
+    """
+    Return the ID the profile endpoints take for a public ID, URN ID, URN or profile URL
+
+    Example: https://www.linkedin.com/in/<public_id>/ -> <public_id>
+    Example: urn:li:fsd_profile:<urn_id> -> <urn_id>
+    """
+    value = public_id_or_urn.strip()
+    match = _PROFILE_URL.search(value)
+    if match:
+        return unquote(match.group(1))
+    if value.startswith("urn:li:"):
+        return value.rsplit(":", 1)[-1]
+    return value
+
+
+def get_universal_name(public_id_or_url: str) -> str:
+    """
+    Return the universal name of a company or school from itself or its URL
+
+    Example: https://www.linkedin.com/company/<universal_name>/about/ -> <universal_name>
+    """
+    value = public_id_or_url.strip()
+    match = _ORGANIZATION_URL.search(value)
+    if match:
+        return unquote(match.group(1))
+    return value
+
+
 def get_urn_from_raw_update(raw_string: str) -> str:
     """
     Return the URN of a raw group update
@@ -131,6 +173,55 @@ def get_update_url(d_included: Dict, base_url: str) -> str:
         return f"{base_url}/feed/update/{urn}"
 
 
+def get_update_urn(d_update: Dict) -> str:
+    """Return the URN identifying a feed update, or "" if it has none
+
+    :param d_update: an element of a feed response
+    :type d_update: dict
+
+    :return: Update URN. Example: 'urn:li:activity:<id>'
+    :rtype: str
+    """
+    urn = (d_update.get("updateMetadata") or {}).get("urn")
+    urn = urn or d_update.get("urn") or d_update.get("entityUrn") or ""
+    match = _ACTIVITY_URN.search(urn)
+    return match.group(0) if match else urn
+
+
+def is_update_pinned(d_update: Dict) -> bool:
+    """Whether a feed update is pinned to the top of its feed, whatever its age
+
+    :param d_update: an element of a feed response
+    :type d_update: dict
+
+    :return: True if the update is pinned
+    :rtype: bool
+    """
+    if (d_update.get("updateMetadata") or {}).get("pinned"):
+        return True
+    header = ((d_update.get("header") or {}).get("text") or {}).get("text")
+    return header == "Pinned"
+
+
+def get_update_published_at(d_update: Dict) -> Optional[int]:
+    """Return when a feed update was published, in milliseconds since the epoch
+
+    Taken from `createdTime` when present, otherwise from the activity ID, whose
+    top 41 bits are its creation time.
+
+    :param d_update: an element of a feed response
+    :type d_update: dict
+
+    :return: Publication time, or None if it cannot be told
+    :rtype: int
+    """
+    created_time = d_update.get("createdTime")
+    if isinstance(created_time, int):
+        return created_time
+    match = _ACTIVITY_URN.search(get_update_urn(d_update))
+    return int(match.group(1)) >> 22 if match else None
+
+
 def append_update_post_field_to_posts_list(
     d_included: Dict, l_posts: List, post_key: str, post_value: str
 ) -> List[Dict]:
@@ -188,44 +279,55 @@ def parse_list_raw_posts(l_raw_posts: List[Dict], linkedin_base_url: str) -> Lis
     :return: List of dicts, each one of them is a post
     :rtype: list
     """
-    l_posts = []
+    l_posts: List[Dict] = []
+    post: Dict = {}
     for i in l_raw_posts:
-        author_name = get_update_author_name(i)
-        if author_name:
-            l_posts = append_update_post_field_to_posts_list(
-                i, l_posts, "author_name", author_name
-            )
+        for post_key, post_value in (
+            ("author_name", get_update_author_name(i)),
+            ("author_profile", get_update_author_profile(i, linkedin_base_url)),
+            ("old", get_update_old(i)),
+            ("content", get_update_content(i, linkedin_base_url)),
+            ("url", get_update_url(i, linkedin_base_url)),
+        ):
+            if not post_value:
+                continue
+            # A field the current post already has starts the next one, like
+            # append_update_post_field_to_posts_list() does
+            if not l_posts or post_key in post:
+                post = {}
+                l_posts.append(post)
+            post[post_key] = post_value
 
-        author_profile = get_update_author_profile(i, linkedin_base_url)
-        if author_profile:
-            l_posts = append_update_post_field_to_posts_list(
-                i, l_posts, "author_profile", author_profile
-            )
+    return l_posts
 
-        old = get_update_old(i)
-        if old:
-            l_posts = append_update_post_field_to_posts_list(i, l_posts, "old", old)
 
-        content = get_update_content(i, linkedin_base_url)
-        if content:
-            l_posts = append_update_post_field_to_posts_list(
-                i, l_posts, "content", content
-            )
+def index_posts_by_urn(l_posts: Iterable[Dict]) -> Dict[str, Dict]:
+    """Map the URN of every post to the first post with it, from the post 'url'
 
-        url = get_update_url(i, linkedin_base_url)
-        if url:
-            l_posts = append_update_post_field_to_posts_list(i, l_posts, "url", url)
+    :param l_posts: Posts, as returned by parse_list_raw_posts()
+    :type l_posts: iterable
 
-    return l_posts
+    :return: Dict of posts by URN
+    :rtype: dict
+    """
+    d_posts: Dict[str, Dict] = {}
+    for post in l_posts:
+        _, found, urn = post.get("url", "").partition(_FEED_UPDATE_PATH)
+        if found and urn not in d_posts:
+            d_posts[urn] = post
+    return d_posts
 
 
 def get_list_posts_sorted_without_promoted(
     l_urns: List[str], l_posts: List[Dict]
 ) -> List[Dict]:
-    """Iterates l_urns and looks for corresponding dicts in l_posts matching 'url' key.
-    If found, removes this dict from l_posts and appends it to the returned list of posts
+    """Join the ordered feed URNs with their posts, leaving promoted posts out.
+
+    Every URN takes the first post whose 'url' points to it; a URN seen again, or
+    without a post, is skipped. Posts are indexed by URN in one pass, so this is
+    linear in the size of the feed.
 
-    :param l_urns: List of posts URNs
+    :param l_urns: List of posts URNs, in feed order
     :type l_urns: list
     :param l_posts: List of dicts, which each of them is a post
     :type l_posts: list
@@ -233,14 +335,14 @@ def get_list_posts_sorted_without_promoted(
     :return: List of dicts, each one of them is a post
     :rtype: list
     """
+    d_posts = index_posts_by_urn(
+        d for d in l_posts if d and "Promoted" not in d.get("old", "")
+    )
     l_posts_sorted_without_promoted = []
-    l_posts[:] = [d for d in l_posts if d and "Promoted" not in d.get("old", "")]
     for urn in l_urns:
-        for post in l_posts:
-            if urn in post["url"]:
-                l_posts_sorted_without_promoted.append(post)
-                l_posts[:] = [d for d in l_posts if urn not in d.get("url", "")]
-                break
+        post = d_posts.pop(urn, None)
+        if post is not None:
+            l_posts_sorted_without_promoted.append(post)
     return l_posts_sorted_without_promoted
 
 
@@ -264,3 +366,700 @@ def generate_trackingId() -> str:
     random_int_array = [random.randrange(256) for _ in range(16)]
     rand_byte_array = bytearray(random_int_array)
     return str(base64.b64encode(rand_byte_array))[2:-1]
+
+
+def build_search_params(params: Dict, count: int, start: int) -> Dict:
+    """Merge caller search parameters over the default search parameters
+
+    :param params: Search parameters given by the caller
+    :type params: dict
+    :param count: Number of results to request
+    :type count: int
+    :param start: Index of the first result to request
+    :type start: int
+
+    :return: Search parameters
+    :rtype: dict
+    """
+    default_params = {
+        "count": str(count),
+        "filters": "List()",
+        "origin": "GLOBAL_SEARCH_HEADER",
+        "q": "all",
+        "start": start,
+        "queryContext": "List(spellCorrectionEnabled->true,relatedSearchesEnabled->true,kcardTypes->PROFILE|COMPANY)",
+        "includeWebMetadata": "true",
+    }
+    default_params.update(params)
+    return default_params
+
+
+def build_search_uri(search_params: Dict) -> str:
+    """Build the graphql search URI for a set of search parameters
+
+    :param search_params: Search parameters, as returned by build_search_params
+    :type search_params: dict
+
+    :return: URI relative to the voyager API base URL
+    :rtype: str
+    """
+    keywords = (
+        f"keywords:{search_params['keywords']},"
+        if "keywords" in search_params
+        else ""
+    )
+
+    return (
+        f"/graphql?variables=(start:{search_params['start']},origin:{search_params['origin']},"
+        f"query:("
+        f"{keywords}"
+        f"flagshipSearchIntent:SEARCH_SRP,"
+        f"queryParameters:{search_params['filters']},"
+        f"includeFiltersInResponse:false))&queryId=voyagerSearchDashClusters"
+        f".b0928897b71bd00a5a7291755dcd64f0"
+    )
+
+
+def parse_search_clusters(data: Dict) -> Optional[List[Dict]]:
+    """Extract the entity results of a graphql search response
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+
+    :return: List of entity results, or None if the response is not a search collection
+    :rtype: list
+    """
+    data_clusters = data.get("data", {}).get("searchDashClustersByAll", [])
+
+    if not data_clusters:
+        return None
+
+    if (
+        not data_clusters.get("_type", [])
+        == "com.linkedin.restli.common.CollectionResponse"
+    ):
+        return None
+
+    new_elements = []
+    for it in data_clusters.get("elements", []):
+        if (
+            not it.get("_type", [])
+            == "com.linkedin.voyager.dash.search.SearchClusterViewModel"
+        ):
+            continue
+
+        for el in it.get("items", []):
+            if not el.get("_type", []) == "com.linkedin.voyager.dash.search.SearchItem":
+                continue
+
+            e = el.get("item", {}).get("entityResult", [])
+            if not e:
+                continue
+            if (
+                not e.get("_type", [])
+                == "com.linkedin.voyager.dash.search.EntityResultViewModel"
+            ):
+                continue
+            new_elements.append(e)
+
+    return new_elements
+
+
+def parse_search_total(data: Dict) -> Optional[int]:
+    """Extract the total number of results of a graphql search response
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+
+    :return: `paging.total` of the response, or None if it is missing
+    :rtype: int
+    """
+    data_clusters = data.get("data", {}).get("searchDashClustersByAll") or {}
+    total = (data_clusters.get("paging") or {}).get("total")
+    return total if isinstance(total, int) else None
+
+
+def build_people_search_params(
+    keywords: Optional[str] = None,
+    connection_of: Optional[str] = None,
+    network_depths: Optional[List[str]] = None,
+    current_company: Optional[List[str]] = None,
+    past_companies: Optional[List[str]] = None,
+    nonprofit_interests: Optional[List[str]] = None,
+    profile_languages: Optional[List[str]] = None,
+    regions: Optional[List[str]] = None,
+    industries: Optional[List[str]] = None,
+    schools: Optional[List[str]] = None,
+    contact_interests: Optional[List[str]] = None,
+    service_categories: Optional[List[str]] = None,
+    keyword_first_name: Optional[str] = None,
+    keyword_last_name: Optional[str] = None,
+    keyword_title: Optional[str] = None,
+    keyword_company: Optional[str] = None,
+    keyword_school: Optional[str] = None,
+    network_depth: Optional[str] = None,
+    title: Optional[str] = None,
+) -> Dict:
+    """Build search parameters for a people search. See Linkedin.search_people()
+
+    :return: Search parameters
+    :rtype: dict
+    """
+    filters = ["(key:resultType,value:List(PEOPLE))"]
+    if connection_of:
+        filters.append(f"(key:connectionOf,value:List({connection_of}))")
+    if network_depths:
+        stringify = " | ".join(network_depths)
+        filters.append(f"(key:network,value:List({stringify}))")
+    elif network_depth:
+        filters.append(f"(key:network,value:List({network_depth}))")
+    if regions:
+        stringify = " | ".join(regions)
+        filters.append(f"(key:geoUrn,value:List({stringify}))")
+    if industries:
+        stringify = " | ".join(industries)
+        filters.append(f"(key:industry,value:List({stringify}))")
+    if current_company:
+        stringify = " | ".join(current_company)
+        filters.append(f"(key:currentCompany,value:List({stringify}))")
+    if past_companies:
+        stringify = " | ".join(past_companies)
+        filters.append(f"(key:pastCompany,value:List({stringify}))")
+    if profile_languages:
+        stringify = " | ".join(profile_languages)
+        filters.append(f"(key:profileLanguage,value:List({stringify}))")
+    if nonprofit_interests:
+        stringify = " | ".join(nonprofit_interests)
+        filters.append(f"(key:nonprofitInterest,value:List({stringify}))")
+    if schools:
+        stringify = " | ".join(schools)
+        filters.append(f"(key:schools,value:List({stringify}))")
+    if service_categories:
+        stringify = " | ".join(service_categories)
+        filters.append(f"(key:serviceCategory,value:List({stringify}))")
+    # `Keywords` filter
+    keyword_title = keyword_title if keyword_title else title
+    if keyword_first_name:
+        filters.append(f"(key:firstName,value:List({keyword_first_name}))")
+    if keyword_last_name:
+        filters.append(f"(key:lastName,value:List({keyword_last_name}))")
+    if keyword_title:
+        filters.append(f"(key:title,value:List({keyword_title}))")
+    if keyword_company:
+        filters.append(f"(key:company,value:List({keyword_company}))")
+    if keyword_school:
+        filters.append(f"(key:school,value:List({keyword_school}))")
+
+    params = {"filters": "List({})".format(",".join(filters))}
+
+    if keywords:
+        params["keywords"] = keywords
+
+    return params
+
+
+def parse_people_search_results(
+    data: List[Dict], include_private_profiles=False
+) -> List[Dict]:
+    """Parse raw search results into minimal profile dicts
+
+    :param data: List of entity results, as returned by Linkedin.search()
+    :type data: list
+    :param include_private_profiles: Include profiles without a public id
+    :type include_private_profiles: bool, optional
+
+    :return: List of profiles (minimal data only)
+    :rtype: list
+    """
+    results = []
+    for item in data:
+        if (
+            not include_private_profiles
+            and (item.get("entityCustomTrackingInfo") or {}).get(
+                "memberDistance", None
+            )
+            == "OUT_OF_NETWORK"
+        ):
+            continue
+        results.append(
+            {
+                "urn_id": get_id_from_urn(
+                    get_urn_from_raw_update(item.get("entityUrn", None))
+                ),
+                "distance": (item.get("entityCustomTrackingInfo") or {}).get(
+                    "memberDistance", None
+                ),
+                "jobtitle": (item.get("primarySubtitle") or {}).get("text", None),
+                "location": (item.get("secondarySubtitle") or {}).get("text", None),
+                "name": (item.get("title") or {}).get("text", None),
+            }
+        )
+
+    return results
+
+
+def build_company_search_params(keywords: Optional[List[str]] = None) -> Dict:
+    """Build search parameters for a company search. See Linkedin.search_companies()
+
+    :return: Search parameters
+    :rtype: dict
+    """
+    filters = ["(key:resultType,value:List(COMPANIES))"]
+
+    params: Dict[str, Union[str, List[str]]] = {
+        "filters": "List({})".format(",".join(filters)),
+        "queryContext": "List(spellCorrectionEnabled->true)",
+    }
+
+    if keywords:
+        params["keywords"] = keywords
+
+    return params
+
+
+def parse_company_search_results(data: List[Dict]) -> List[Dict]:
+    """Parse raw search results into minimal company dicts
+
+    :param data: List of entity results, as returned by Linkedin.search()
+    :type data: list
+
+    :return: List of companies
+    :rtype: list
+    """
+    results = []
+    for item in data:
+        if "company" not in item.get("trackingUrn"):
+            continue
+        results.append(
+            {
+                "urn_id": get_id_from_urn(item.get("trackingUrn", None)),
+                "name": (item.get("title") or {}).get("text", None),
+                "headline": (item.get("primarySubtitle") or {}).get("text", None),
+                "subline": (item.get("secondarySubtitle") or {}).get("text", None),
+            }
+        )
+
+    return results
+
+
+def build_job_search_query(
+    keywords: Optional[str] = None,
+    companies: Optional[List[str]] = None,
+    experience: Optional[List[str]] = None,
+    job_type: Optional[List[str]] = None,
+    job_title: Optional[List[str]] = None,
+    industries: Optional[List[str]] = None,
+    location_name: Optional[str] = None,
+    remote: Optional[List[str]] = None,
+    listed_at=24 * 60 * 60,
+    distance: Optional[int] = None,
+) -> str:
+    """Build the restli query string for a job search. See Linkedin.search_jobs()
+
+    :return: Job search query string
+    :rtype: str
+    """
+    query: Dict[str, Union[str, Dict[str, str]]] = {
+        "origin": "JOB_SEARCH_PAGE_QUERY_EXPANSION"
+    }
+    if keywords:
+        query["keywords"] = "KEYWORD_PLACEHOLDER"
+    if location_name:
+        query["locationFallback"] = "LOCATION_PLACEHOLDER"
+
+    # In selectedFilters()
+    query["selectedFilters"] = {}
+    if companies:
+        query["selectedFilters"]["company"] = f"List({','.join(companies)})"
+    if experience:
+        query["selectedFilters"]["experience"] = f"List({','.join(experience)})"
+    if job_type:
+        query["selectedFilters"]["jobType"] = f"List({','.join(job_type)})"
+    if job_title:
+        query["selectedFilters"]["title"] = f"List({','.join(job_title)})"
+    if industries:
+        query["selectedFilters"]["industry"] = f"List({','.join(industries)})"
+    if distance:
+        query["selectedFilters"]["distance"] = f"List({distance})"
+    if remote:
+        query["selectedFilters"]["workplaceType"] = f"List({','.join(remote)})"
+
+    query["selectedFilters"]["timePostedRange"] = f"List(r{listed_at})"
+    query["spellCorrectionEnabled"] = "true"
+
+    # Query structure:
+    # "(
+    #    origin:JOB_SEARCH_PAGE_QUERY_EXPANSION,
+    #    keywords:marketing%20manager,
+    #    locationFallback:germany,
+    #    selectedFilters:(
+    #        distance:List(25),
+    #        company:List(163253),
+    #        salaryBucketV2:List(5),
+    #        timePostedRange:List(r2592000),
+    #        workplaceType:List(1)
+    #    ),
+    #    spellCorrectionEnabled:true
+    #  )"
+
+    return (
+        str(query)
+        .replace(" ", "")
+        .replace("'", "")
+        .replace("KEYWORD_PLACEHOLDER", keywords or "")
+        .replace("LOCATION_PLACEHOLDER", location_name or "")
+        .replace("{", "(")
+        .replace("}", ")")
+    )
+
+
+def parse_job_postings(data: Dict, store: Optional[EntityStore] = None) -> List[Dict]:
+    """Extract the job postings of a normalized job search response
+
+    The postings are the included ones, then those the job cards refer to that only
+    `store` has, sent with an earlier page.
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+    :param store: Entities of earlier responses
+    :type store: EntityStore, optional
+
+    :return: List of job postings
+    :rtype: list
+    """
+    payload = NormalizedPayload(data, store)
+    postings = [
+        i
+        for i in payload.included
+        if i["$type"] == "com.linkedin.voyager.dash.jobs.JobPosting"
+    ]
+    for card in payload.included:
+        if card["$type"] != "com.linkedin.voyager.dash.jobs.JobPostingCard":
+            continue
+        posting = payload.resolve(card, "jobPosting")
+        if posting is not None and posting.get("entityUrn") not in payload:
+            postings.append(posting)
+    return postings
+
+
+def count_job_cards(data: Dict) -> int:
+    """Count the job cards of a normalized job search response, one per result
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+
+    :return: Number of job cards
+    :rtype: int
+    """
+    return sum(
+        1
+        for i in data.get("included", [])
+        if i.get("$type") == "com.linkedin.voyager.dash.jobs.JobPostingCard"
+    )
+
+
+def parse_contact_info(data: Dict) -> Dict:
+    """Parse a profileContactInfo response into a contact info dict
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+
+    :return: Contact data
+    :rtype: dict
+    """
+    contact_info = {
+        "email_address": data.get("emailAddress"),
+        "websites": [],
+        "twitter": data.get("twitterHandles"),
+        "birthdate": data.get("birthDateOn"),
+        "ims": data.get("ims"),
+        "phone_numbers": data.get("phoneNumbers", []),
+    }
+
+    websites = data.get("websites", [])
+    for item in websites:
+        if "com.linkedin.voyager.identity.profile.StandardWebsite" in item["type"]:
+            item["label"] = item["type"][
+                "com.linkedin.voyager.identity.profile.StandardWebsite"
+            ]["category"]
+        elif "" in item["type"]:
+            item["label"] = item["type"][
+                "com.linkedin.voyager.identity.profile.CustomWebsite"
+            ]["label"]
+
+        del item["type"]
+
+    contact_info["websites"] = websites
+
+    return contact_info
+
+
+def parse_profile_skills(data: Dict) -> List[Dict]:
+    """Parse a skills response into a list of skill objects
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+
+    :return: List of skill objects
+    :rtype: list
+    """
+    skills = data.get("elements", [])
+    for item in skills:
+        del item["entityUrn"]
+
+    return skills
+
+
+def parse_profile_view(data: Dict) -> Dict:
+    """Massage a profileView response into a single profile dict
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+
+    :return: Profile data
+    :rtype: dict
+    """
+    # massage [profile] data
+    profile = data["profile"]
+    if "miniProfile" in profile:
+        if "picture" in profile["miniProfile"]:
+            profile["displayPictureUrl"] = profile["miniProfile"]["picture"][
+                "com.linkedin.common.VectorImage"
+            ]["rootUrl"]
+
+            images_data = profile["miniProfile"]["picture"][
+                "com.linkedin.common.VectorImage"
+            ]["artifacts"]
+            for img in images_data:
+                w, h, url_segment = itemgetter(
+                    "width", "height", "fileIdentifyingUrlPathSegment"
+                )(img)
+                profile[f"img_{w}_{h}"] = url_segment
+
+        profile["profile_id"] = get_id_from_urn(profile["miniProfile"]["entityUrn"])
+        profile["profile_urn"] = profile["miniProfile"]["entityUrn"]
+        profile["member_urn"] = profile["miniProfile"]["objectUrn"]
+        profile["public_id"] = profile["miniProfile"]["publicIdentifier"]
+
+        del profile["miniProfile"]
+
+    del profile["defaultLocale"]
+    del profile["supportedLocales"]
+    del profile["versionTag"]
+    del profile["showEducationOnProfileTopCard"]
+
+    # massage [experience] data
+    experience = data["positionView"]["elements"]
+    for item in experience:
+        if "company" in item and "miniCompany" in item["company"]:
+            if "logo" in item["company"]["miniCompany"]:
+                logo = item["company"]["miniCompany"]["logo"].get(
+                    "com.linkedin.common.VectorImage"
+                )
+                if logo:
+                    item["companyLogoUrl"] = logo["rootUrl"]
+            del item["company"]["miniCompany"]
+
+    profile["experience"] = experience
+
+    # massage [education] data
+    education = data["educationView"]["elements"]
+    for item in education:
+        if "school" in item:
+            if "logo" in item["school"]:
+                item["school"]["logoUrl"] = item["school"]["logo"][
+                    "com.linkedin.common.VectorImage"
+                ]["rootUrl"]
+                del item["school"]["logo"]
+
+    profile["education"] = education
+
+    # massage [languages] data
+    languages = data["languageView"]["elements"]
+    for item in languages:
+        del item["entityUrn"]
+    profile["languages"] = languages
+
+    # massage [publications] data
+    publications = data["publicationView"]["elements"]
+    for item in publications:
+        del item["entityUrn"]
+        for author in item.get("authors", []):
+            del author["entityUrn"]
+    profile["publications"] = publications
+
+    # massage [certifications] data
+    certifications = data["certificationView"]["elements"]
+    for item in certifications:
+        del item["entityUrn"]
+    profile["certifications"] = certifications
+
+    # massage [volunteer] data
+    volunteer = data["volunteerExperienceView"]["elements"]
+    for item in volunteer:
+        del item["entityUrn"]
+    profile["volunteer"] = volunteer
+
+    # massage [honors] data
+    honors = data["honorView"]["elements"]
+    for item in honors:
+        del item["entityUrn"]
+    profile["honors"] = honors
+
+    # massage [projects] data
+    projects = data["projectView"]["elements"]
+    for item in projects:
+        del item["entityUrn"]
+    profile["projects"] = projects
+    # massage [skills] data
+    skills = data["skillView"]["elements"]
+    for item in skills:
+        del item["entityUrn"]
+    profile["skills"] = skills
+
+    profile["urn_id"] = profile["entityUrn"].replace("urn:li:fs_profile:", "")
+
+    return profile
+
+
+def build_profile_experiences_uri(urn_id: str) -> str:
+    """Build the graphql URI for the experience section of a profile
+
+    :param urn_id: LinkedIn URN ID for a profile
+    :type urn_id: str
+
+    :return: URI relative to the voyager API base URL
+    :rtype: str
+    """
+    profile_urn = f"urn:li:fsd_profile:{urn_id}"
+    variables = ",".join([f"profileUrn:{quote(profile_urn)}", "sectionType:experience"])
+    query_id = "voyagerIdentityDashProfileComponents.7af5d6f176f11583b382e37e5639e69e"
+
+    return f"/graphql?variables=({variables})&queryId={query_id}&includeWebMetadata=true"
+
+
+def _parse_experience_item(item: Dict, is_group_item=False) -> Dict:
+    """
+    Parse a single experience item.
+
+    Items as part of an 'experience group' (e.g. a company with multiple positions) have different data structures.
+    Therefore, some exceptions need to be made when parsing these items.
+    """
+    component = item["components"]["entityComponent"]
+    title = component["titleV2"]["text"]["text"]
+    subtitle = component["subtitle"]
+    company = subtitle["text"].split(" · ")[0] if subtitle else None
+    employment_type_parts = subtitle["text"].split(" · ") if subtitle else None
+    employment_type = (
+        employment_type_parts[1]
+        if employment_type_parts and len(employment_type_parts) > 1
+        else None
+    )
+    metadata = component.get("metadata", {}) or {}
+    location = metadata.get("text")
+
+    duration_text = component["caption"]["text"]
+    duration_parts = duration_text.split(" · ")
+    date_parts = duration_parts[0].split(" - ")
+
+    duration = (
+        duration_parts[1] if duration_parts and len(duration_parts) > 1 else None
+    )
+    start_date = date_parts[0] if date_parts else None
+    end_date = date_parts[1] if date_parts and len(date_parts) > 1 else None
+
+    sub_components = component["subComponents"]
+    fixed_list_component = (
+        sub_components["components"][0]["components"]["fixedListComponent"]
+        if sub_components
+        else None
+    )
+
+    fixed_list_text_component = (
+        fixed_list_component["components"][0]["components"]["textComponent"]
+        if fixed_list_component
+        else None
+    )
+
+    # Extract additional description
+    description = (
+        fixed_list_text_component["text"]["text"]
+        if fixed_list_text_component
+        else None
+    )
+
+    # Create a dictionary with the extracted information
+    parsed_data = {
+        "title": title,
+        "companyName": company if not is_group_item else None,
+        "employmentType": company if is_group_item else employment_type,
+        "locationName": location,
+        "duration": duration,
+        "startDate": start_date,
+        "endDate": end_date,
+        "description": description,
+    }
+
+    return parsed_data
+
+
+def _get_grouped_item_id(item: Dict) -> Optional[str]:
+    sub_components = item["components"]["entityComponent"]["subComponents"]
+    sub_components_components = (
+        sub_components["components"][0]["components"] if sub_components else None
+    )
+    paged_list_component_id = (
+        sub_components_components.get("*pagedListComponent", "")
+        if sub_components_components
+        else None
+    )
+    if (
+        paged_list_component_id
+        and "fsd_profilePositionGroup" in paged_list_component_id
+    ):
+        match = _POSITION_GROUP_URN.search(paged_list_component_id)
+        return match.group(0) if match else None
+
+
+def parse_profile_experiences(
+    data: Dict, store: Optional[EntityStore] = None
+) -> List[Dict]:
+    """Parse a normalized experience section response into a list of experiences
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+    :param store: Entities of earlier responses
+    :type store: EntityStore, optional
+
+    :return: List of experiences
+    :rtype: list
+    """
+    payload = NormalizedPayload(data, store)
+    items = []
+    for item in payload.included[0]["components"]["elements"]:
+        grouped_item_id = _get_grouped_item_id(item)
+        # if the item is part of a group (e.g. a company with multiple positions),
+        # find the group items and parse them.
+        if grouped_item_id:
+            component = item["components"]["entityComponent"]
+            # use the company and location from the main item
+            company = component["titleV2"]["text"]["text"]
+
+            location = component["caption"]["text"] if component["caption"] else None
+
+            # find the group: the paged list keyed by a URN embedding the group ID
+            group = payload.embedding(grouped_item_id, _POSITION_GROUP_URN)
+            if not group:
+                continue
+            for group_item in group["components"]["elements"]:
+                parsed_data = _parse_experience_item(group_item, is_group_item=True)
+                parsed_data["companyName"] = company
+                parsed_data["locationName"] = location
+                items.append(parsed_data)
+            continue
+
+        # else, parse the regular item
+        parsed_data = _parse_experience_item(item)
+        items.append(parsed_data)
+
+    return items
@@ -0,0 +1,189 @@
+"""
+Resolution of normalized voyager responses.
+
+With the `application/vnd.linkedin.normalized+json+2.1` accept header, the dash
+endpoints return every entity of a response flat in `included`, the others referring
+to it by URN under a `*`-prefixed key. `NormalizedPayload` indexes `included` by
+`entityUrn` in one pass, on first use, so that following a reference is a dict lookup
+instead of a scan of all the entities.
+
+A reference can point to an entity sent with an earlier response, e.g. the company of
+a job posting or an update of a feed page already fetched. An `EntityStore` shared by
+the calls of a session keeps the latest entity of every URN, and a `NormalizedPayload`
+built with it resolves such references through it.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Union
+
+
+def _follow(
+    get: Callable[[Optional[str]], Optional[Dict]], entity: Dict, key: str
+) -> Union[Optional[Dict], List[Dict]]:
+    ref = entity.get(f"*{key}")
+    if isinstance(ref, list):
+        return [found for found in map(get, ref) if found is not None]
+    return get(ref)
+
+
+class EntityStore(object):
+    """
+    Latest entity of every `entityUrn` seen in the normalized responses of a session.
+
+    Entities are only looked up when a reference the response holding it cannot
+    resolve is followed, and a newer entity replaces an older one without comparing
+    them. The store keeps the dicts of the responses as they are, so a resolved
+    entity may be one a parser of another response handed out: treat it as read-only.
+    Past `max_entities`, the ones added least recently are forgotten.
+
+    :param max_entities: Number of entities kept, defaults to 10,000
+    :type max_entities: int, optional
+    """
+
+    def __init__(self, max_entities: int = 10_000):
+        self.max_entities = max_entities
+        self._entities: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, urn: str) -> bool:
+        return urn in self._entities
+
+    def add(self, entities: Iterable[Dict]):
+        """Add `entities`, replacing the ones the store has for their URNs"""
+        with self._lock:
+            for entity in entities:
+                urn = entity.get("entityUrn") if isinstance(entity, dict) else None
+                if urn:
+                    self._entities[urn] = entity
+                    self._entities.move_to_end(urn)
+            while len(self._entities) > self.max_entities:
+                self._entities.popitem(last=False)
+
+    def add_included(self, data: Dict) -> Dict:
+        """Add the `included` entities of a normalized response
+
+        :param data: a dict, as returned by res.json()
+        :type data: dict
+
+        :return: `data`
+        :rtype: dict
+        """
+        if isinstance(data, dict) and data.get("included"):
+            self.add(data["included"])
+        return data
+
+    def get(self, urn: Optional[str]) -> Optional[Dict]:
+        """Return the entity of URN `urn`, or None if it is not known"""
+        with self._lock:
+            return self._entities.get(urn) if urn else None
+
+    def resolve(self, entity: Dict, key: str) -> Union[Optional[Dict], List[Dict]]:
+        """Follow the `*key` reference of `entity`. See NormalizedPayload.resolve()"""
+        return _follow(self.get, entity, key)
+
+    def clear(self):
+        with self._lock:
+            self._entities.clear()
+
+
+class NormalizedPayload(object):
+    """
+    The entities of a normalized response, indexed by `entityUrn`.
+
+    :param data: a dict, as returned by res.json()
+    :type data: dict
+    :param store: Store to add the entities to, references to entities of earlier
+        responses resolving through it
+    :type store: EntityStore, optional
+    """
+
+    __slots__ = ("data", "included", "store", "_by_urn", "_by_embedded_urn")
+
+    def __init__(self, data: Dict, store: Optional[EntityStore] = None):
+        if store is not None:
+            store.add_included(data)
+        self.data: Dict = data.get("data") or {}
+        self.included: List[Dict] = data.get("included") or []
+        self.store = store
+        self._by_urn: Optional[Dict[str, Dict]] = None
+        # Indexes built by embedding(), by the pattern of the embedded URNs
+        self._by_embedded_urn: Dict[str, Dict[str, Dict]] = {}
+
+    @property
+    def by_urn(self) -> Dict[str, Dict]:
+        """The included entities by `entityUrn`, the first one for duplicates"""
+        if self._by_urn is None:
+            self._by_urn = {}
+            for entity in self.included:
+                urn = entity.get("entityUrn")
+                if urn:
+                    self._by_urn.setdefault(urn, entity)
+        return self._by_urn
+
+    def __len__(self) -> int:
+        return len(self.included)
+
+    def __contains__(self, urn: str) -> bool:
+        return urn in self.by_urn
+
+    def get(self, urn: Optional[str]) -> Optional[Dict]:
+        """Return the entity of URN `urn`, or None if it is neither included nor stored"""
+        if not urn:
+            return None
+        entity = self.by_urn.get(urn)
+        if entity is None and self.store is not None:
+            entity = self.store.get(urn)
+        return entity
+
+    def resolve(self, entity: Dict, key: str) -> Union[Optional[Dict], List[Dict]]:
+        """Follow the `*key` reference of `entity`
+
+        :param entity: Entity holding the reference, e.g. `data`
+        :type entity: dict
+        :param key: Name of the reference, without its `*`
+        :type key: str
+
+        :return: The entity referred to, or the list of them for a list of URNs, leaving
+            out the ones not found
+        :rtype: dict or list
+        """
+        return _follow(self.get, entity, key)
+
+    def with_references(self, key: str) -> List[Dict]:
+        """The included entities, then the ones only the store has among those `data`
+        refers to under `*key`, e.g. the updates of a feed page sent with an earlier one
+        """
+        referenced = self.resolve(self.data, key)
+        if not isinstance(referenced, list):
+            referenced = [] if referenced is None else [referenced]
+        return self.included + [
+            entity
+            for entity in referenced
+            if entity.get("entityUrn") not in self.by_urn
+        ]
+
+    def embedding(self, urn: str, pattern: Pattern) -> Optional[Dict]:
+        """Return the first entity whose `entityUrn` embeds `urn`, or None
+
+        Dash components are keyed by compound URNs embedding the URN of what they
+        render, e.g. the paged list of the roles of a position group. `pattern` matches
+        the URNs of the type of `urn`; the first lookup with it indexes the entities by
+        each of its matches, later ones are dict lookups.
+        """
+        index = self._by_embedded_urn.get(pattern.pattern)
+        if index is None:
+            # Only the URNs mentioning the type can match, and `in` is much cheaper
+            # than running the pattern over all of them
+            urn_type = ":".join(urn.split(":", 3)[:3]) + ":"
+            index = {}
+            for entity in self.included:
+                entity_urn = entity.get("entityUrn") or ""
+                if urn_type in entity_urn:
+                    for match in pattern.finditer(entity_urn):
+                        index.setdefault(match.group(0), entity)
+            self._by_embedded_urn[pattern.pattern] = index
+        return index.get(urn)
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SqliteStore(object):
+    """
+    Base class for the small SQLite databases kept next to the cookie cache.
+
+    Opens the database lazily in WAL mode, reopens it after a fork (gunicorn forks
+    after the app is imported) and serialises access from threads of one process.
+    Subclasses put their `CREATE` statements in `SCHEMA`.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @contextmanager
+    def transaction(self):
+        """Yield the connection inside a write transaction (BEGIN IMMEDIATE)"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def connection(self):
+        """Yield the connection for reads, outside of an explicit transaction"""
+        with self._lock:
+            yield self._connection()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
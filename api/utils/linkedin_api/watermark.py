@@ -0,0 +1,136 @@
+"""
+High-water marks of incremental update crawls.
+
+Company and profile updates come newest first, so a watched company re-polled daily
+only has a page of news, but without a memory of the last poll every refresh pages
+back through `max_results` updates again. With a `HighWaterMarkStore`, the update
+iterators of the clients remember the newest update of each completed crawl and stop
+paginating at the first page reaching it, returning only the updates above it.
+
+Pinned updates come first in a feed whatever their age, so neither the newest update
+nor the page reaching the mark is told from the position of an update alone.
+"""
+
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import api.utils.linkedin_api.settings as settings
+from api.utils.linkedin_api.utils.helpers import (
+    get_update_published_at,
+    get_update_urn,
+    is_update_pinned,
+)
+from api.utils.linkedin_api.utils.sqlite import SqliteStore
+
+
+class HighWaterMark(NamedTuple):
+    """The newest update of a feed as of its last complete crawl"""
+
+    urn: str
+    published_at: Optional[int]
+    updated_at: float
+
+    def covers(self, update: Dict) -> bool:
+        """Whether `update` is this one or older, i.e. was already crawled"""
+        if get_update_urn(update) == self.urn:
+            return True
+        published_at = get_update_published_at(update)
+        return (
+            published_at is not None
+            and self.published_at is not None
+            and published_at <= self.published_at
+        )
+
+    def reached(self, updates: List[Dict]) -> bool:
+        """Whether a page of a newest-first feed goes down to this mark
+
+        Leaving out pinned updates, the page reaches the mark when it holds the update
+        of the mark or its oldest update is covered.
+        """
+        unpinned = [u for u in updates if not is_update_pinned(u)]
+        if not unpinned:
+            return False
+        return self.covers(unpinned[-1]) or any(
+            get_update_urn(u) == self.urn for u in unpinned
+        )
+
+
+def newest_update(
+    updates: Iterable[Dict], newest: Optional[Dict] = None
+) -> Optional[Dict]:
+    """Return the most recently published of `updates` and `newest`
+
+    Updates of unknown publication time only count while no other is known, the
+    first unpinned one then standing for the newest.
+    """
+    newest_at = get_update_published_at(newest) if newest is not None else None
+    for update in updates:
+        published_at = get_update_published_at(update)
+        if published_at is not None:
+            if newest_at is None or published_at > newest_at:
+                newest, newest_at = update, published_at
+        elif newest is None and not is_update_pinned(update):
+            newest = update
+    return newest
+
+
+class HighWaterMarkStore(SqliteStore):
+    """
+    SQLite store of the high-water mark of every crawled update feed.
+
+    :param path: Path of the SQLite database, defaults to settings.WATERMARK_PATH
+    :type path: str, optional
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS watermarks (
+            kind TEXT NOT NULL,
+            target TEXT NOT NULL,
+            urn TEXT NOT NULL,
+            published_at INTEGER,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (kind, target)
+        );
+    """
+
+    def __init__(self, path: str = settings.WATERMARK_PATH):
+        super().__init__(path or settings.WATERMARK_PATH)
+
+    def get(self, kind: str, target: str) -> Optional[HighWaterMark]:
+        """Return the mark of the `kind` feed of `target`, or None if never crawled"""
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT urn, published_at, updated_at FROM watermarks WHERE kind = ? AND target = ?",
+                (kind, target),
+            ).fetchone()
+        return HighWaterMark(*row) if row else None
+
+    def advance(self, kind: str, target: str, update: Dict):
+        """Move the mark of the `kind` feed of `target` up to `update`, its newest update
+
+        The mark never moves back: an update published before the one of the mark,
+        or of unknown publication time while the mark has one, leaves it as it is.
+        """
+        urn = get_update_urn(update)
+        if not urn:
+            return
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                INSERT INTO watermarks VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, target) DO UPDATE SET
+                    urn = excluded.urn,
+                    published_at = excluded.published_at,
+                    updated_at = excluded.updated_at
+                WHERE watermarks.published_at IS NULL
+                    OR excluded.published_at > watermarks.published_at
+                """,
+                (kind, target, urn, get_update_published_at(update), time.time()),
+            )
+
+    def reset(self, kind: str, target: str):
+        """Forget the mark, so the next crawl of the feed is a full one"""
+        with self.transaction() as conn:
+            conn.execute(
+                "DELETE FROM watermarks WHERE kind = ? AND target = ?", (kind, target)
+            )
@@ -0,0 +1,142 @@
+import json
+import re
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from api.utils.linkedin_api import Linkedin
+from api.utils.linkedin_api.benchmarks.replay import _unpaced
+from api.utils.linkedin_api.utils.helpers import parse_job_postings
+from api.utils.linkedin_api.utils.normalized import EntityStore, NormalizedPayload
+
+JOB_POSTING = "com.linkedin.voyager.dash.jobs.JobPosting"
+JOB_POSTING_CARD = "com.linkedin.voyager.dash.jobs.JobPostingCard"
+
+
+def posting(job_id):
+    return {"$type": JOB_POSTING, "entityUrn": f"urn:li:fsd_jobPosting:{job_id}"}
+
+
+def card(job_id):
+    return {
+        "$type": JOB_POSTING_CARD,
+        "entityUrn": f"urn:li:fsd_jobPostingCard:{job_id}",
+        "*jobPosting": f"urn:li:fsd_jobPosting:{job_id}",
+    }
+
+
+def test_store_keeps_the_latest_entity_of_every_urn():
+    store = EntityStore(max_entities=2)
+    store.add([{"entityUrn": "a", "v": 1}, {"entityUrn": "b"}, {"no": "urn"}])
+    store.add([{"entityUrn": "a", "v": 2}])
+    assert store.get("a") == {"entityUrn": "a", "v": 2}
+    assert len(store) == 2
+
+    store.add([{"entityUrn": "c"}])
+    assert "b" not in store
+    assert "a" in store and "c" in store
+    assert store.get(None) is None
+
+
+def test_payload_resolves_references_within_the_response():
+    payload = NormalizedPayload(
+        {
+            "data": {"*elements": ["a", "missing", "b"], "*owner": "b"},
+            "included": [{"entityUrn": "a"}, {"entityUrn": "b"}],
+        }
+    )
+    assert payload.resolve(payload.data, "elements") == [
+        {"entityUrn": "a"},
+        {"entityUrn": "b"},
+    ]
+    assert payload.resolve(payload.data, "owner") == {"entityUrn": "b"}
+    assert payload.resolve(payload.data, "absent") is None
+    assert "a" in payload and "missing" not in payload
+
+
+def test_payload_resolves_references_to_earlier_responses_through_the_store():
+    store = EntityStore()
+    NormalizedPayload({"data": {}, "included": [{"entityUrn": "a"}]}, store)
+
+    payload = NormalizedPayload(
+        {"data": {"*elements": ["a", "b"]}, "included": [{"entityUrn": "b"}]}, store
+    )
+    assert payload.resolve(payload.data, "elements") == [
+        {"entityUrn": "a"},
+        {"entityUrn": "b"},
+    ]
+    assert payload.with_references("elements") == [
+        {"entityUrn": "b"},
+        {"entityUrn": "a"},
+    ]
+    assert "b" in store
+
+    without_store = NormalizedPayload({"data": {"*elements": ["a"]}, "included": []})
+    assert without_store.with_references("elements") == []
+
+
+def test_payload_embedding_looks_up_compound_urns():
+    pattern = re.compile(r"urn:li:fsd_profilePositionGroup:\([^)]*\)")
+    group = "urn:li:fsd_profilePositionGroup:(1,ACoA)"
+    component = {"entityUrn": f"urn:li:fsd_profilePagedListComponent:({group},EN)"}
+    payload = NormalizedPayload({"data": {}, "included": [{}, component]})
+    assert payload.embedding(group, pattern) is component
+    assert payload.embedding("urn:li:fsd_profilePositionGroup:(2,x)", pattern) is None
+
+
+def test_job_cards_resolve_postings_of_earlier_pages():
+    store = EntityStore()
+    store.add([posting(1)])
+    page = {"data": {}, "included": [card(1), card(2), posting(2)]}
+    assert parse_job_postings(page, store) == [posting(2), posting(1)]
+    assert parse_job_postings(page) == [posting(2)]
+
+
+class JobsAdapter(BaseAdapter):
+    """Serve job search pages whose cards refer to `jobs`, a posting sent only once"""
+
+    def __init__(self, jobs):
+        super().__init__()
+        self.jobs = jobs
+        self.starts = []
+        self.sent = set()
+
+    def send(self, request, **kwargs):
+        query = parse_qs(urlsplit(request.url).query)
+        start, count = int(query["start"][0]), int(query["count"][0])
+        self.starts.append(start)
+        included = []
+        for job_id in self.jobs[start : start + count]:
+            included.append(card(job_id))
+            if job_id not in self.sent:
+                self.sent.add(job_id)
+                included.append(posting(job_id))
+        res = requests.Response()
+        res.url, res.request, res.status_code = request.url, request, 200
+        res._content = json.dumps({"data": {}, "included": included}).encode()
+        return res
+
+    def close(self):
+        pass
+
+
+def test_search_jobs_yields_postings_resolved_again_once():
+    linkedin = Linkedin(
+        "user",
+        "password",
+        authenticate=False,
+        pacer=_unpaced(),
+        response_cache=False,
+        entities=True,
+    )
+    # Job 3 is listed again on the second page, its posting only sent with the first
+    jobs = list(range(49)) + [3] + list(range(49, 60))
+    adapter = JobsAdapter(jobs)
+    linkedin.client.session.mount("https://", adapter)
+
+    results = linkedin.search_jobs(keywords="x", limit=60)
+    assert [r["entityUrn"] for r in results] == [
+        posting(i)["entityUrn"] for i in range(60)
+    ]
+    assert adapter.starts == [0, 49, 60]
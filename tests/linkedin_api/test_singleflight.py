@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from api.utils.linkedin_api.singleflight import AsyncSingleFlight
+
+
+def test_async_followers_share_the_leader_call():
+    async def main():
+        flight = AsyncSingleFlight()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "body"
+
+        results = await asyncio.gather(*(flight.do("k", fn) for _ in range(3)))
+        return results, calls, flight.in_flight()
+
+    assert asyncio.run(main()) == (["body"] * 3, 1, 0)
+
+
+def test_async_cancelled_leader_leaves_followers_waiting():
+    async def main():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return "body"
+
+        leader = asyncio.create_task(flight.do("k", fn))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", fn))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower, flight.in_flight()
+
+    assert asyncio.run(main()) == ("body", 0)
+
+
+def test_async_call_is_cancelled_once_nobody_waits():
+    async def main():
+        flight = AsyncSingleFlight()
+        cancelled = asyncio.Event()
+
+        async def fn():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        caller = asyncio.create_task(flight.do("k", fn))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        return flight.in_flight()
+
+    assert asyncio.run(main()) == 0
+
+
+def test_async_error_reaches_every_caller():
+    async def main():
+        flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        return await asyncio.gather(
+            flight.do("k", fn), flight.do("k", fn), return_exceptions=True
+        )
+
+    errors = asyncio.run(main())
+    assert [type(e) for e in errors] == [ValueError, ValueError]
@@ -0,0 +1,105 @@
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from api.utils.linkedin_api import Linkedin
+from api.utils.linkedin_api.benchmarks.replay import _unpaced
+from api.utils.linkedin_api.watermark import HighWaterMarkStore, newest_update
+
+
+def update(minute, pinned=False):
+    activity = (1_700_000_000_000 + minute * 60_000) << 22
+    metadata = {"urn": f"urn:li:activity:{activity}"}
+    if pinned:
+        metadata["pinned"] = True
+    return {"updateMetadata": metadata}
+
+
+class FeedAdapter(BaseAdapter):
+    """Serve `feed` as a `start`/`count` paginated updates endpoint"""
+
+    def __init__(self, feed):
+        super().__init__()
+        self.feed = feed
+        self.starts = []
+
+    def send(self, request, **kwargs):
+        query = parse_qs(urlsplit(request.url).query)
+        start, count = int(query["start"][0]), int(query["count"][0])
+        self.starts.append(start)
+        res = requests.Response()
+        res.url, res.request, res.status_code = request.url, request, 200
+        res._content = json.dumps({"elements": self.feed[start : start + count]})
+        res._content = res._content.encode()
+        return res
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def watermarks(tmp_path):
+    return HighWaterMarkStore(str(tmp_path / "watermarks.sqlite3"))
+
+
+def crawl(watermarks, feed, max_results=1000):
+    linkedin = Linkedin(
+        "user",
+        "password",
+        authenticate=False,
+        pacer=_unpaced(),
+        response_cache=False,
+        watermarks=watermarks,
+    )
+    adapter = FeedAdapter(feed)
+    linkedin.client.session.mount("https://", adapter)
+    return linkedin.get_company_updates("acme", max_results=max_results), adapter
+
+
+def test_newest_update_is_the_most_recently_published():
+    pinned = update(1, pinned=True)
+    assert newest_update([pinned, update(30), update(20)]) == update(30)
+    assert newest_update([update(10)], newest=update(30)) == update(30)
+
+
+def test_advance_never_moves_the_mark_back(watermarks):
+    watermarks.advance("company_updates", "acme", update(30))
+    watermarks.advance("company_updates", "acme", update(10))
+    mark = watermarks.get("company_updates", "acme")
+    assert mark.urn == update(30)["updateMetadata"]["urn"]
+
+    watermarks.advance("company_updates", "acme", update(40))
+    mark = watermarks.get("company_updates", "acme")
+    assert mark.urn == update(40)["updateMetadata"]["urn"]
+
+
+def test_pinned_old_update_neither_marks_nor_stops_the_crawl(watermarks):
+    pinned = update(0, pinned=True)
+    feed = [pinned] + [update(minute) for minute in range(1000, 850, -1)]
+    first, _ = crawl(watermarks, feed)
+    assert len(first) == 151
+    mark = watermarks.get("company_updates", "acme")
+    assert mark.urn == update(1000)["updateMetadata"]["urn"]
+
+    # The second page is crawled down to the mark, the pinned update left out
+    newer = [update(minute) for minute in range(1200, 1050, -1)]
+    second, adapter = crawl(watermarks, [pinned] + newer + feed[1:])
+    assert second == newer
+    assert adapter.starts == [0, 100]
+    mark = watermarks.get("company_updates", "acme")
+    assert mark.urn == update(1200)["updateMetadata"]["urn"]
+
+
+def test_crawl_cut_short_by_max_results_keeps_the_mark(watermarks):
+    feed = [update(minute) for minute in range(1000, 700, -1)]
+    crawl(watermarks, feed[200:])
+    crawl(watermarks, feed, max_results=100)
+    mark = watermarks.get("company_updates", "acme")
+    assert mark.urn == update(800)["updateMetadata"]["urn"]
+
+    # The next crawl still gets the updates the short one did not reach
+    updates, _ = crawl(watermarks, feed)
+    assert updates == feed[:200]